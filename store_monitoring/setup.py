@@ -18,6 +18,9 @@ setuptools.setup(
     ],
     python_requires='>=3.6',
     include_package_data=True,
-    install_requires=['uvicorn>=0.16.0', 'fastapi>=0.83.0', 'configparser>=6.0.0', 'requests>=2.31.0',
-                      'retrying>=1.3.4', 'pandas>=2.1.2']
+    install_requires=['uvicorn>=0.16.0', 'fastapi>=0.93.0', 'configparser>=6.0.0', 'requests>=2.31.0',
+                      'httpx>=0.24.0', 'retrying>=1.3.4', 'pandas>=2.1.2', 'numpy>=1.26.0',
+                      'pytz>=2023.3'],
+    extras_require={'duckdb': ['duckdb>=0.9.0'], 'http2': ['h2>=4.1.0'], 'arrow': ['pyarrow>=12.0.0'],
+                    'msgpack': ['msgpack>=1.0.0']}
 )
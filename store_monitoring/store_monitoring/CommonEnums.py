@@ -10,7 +10,14 @@ class StoreMonitoringDASUrl(Enum):
     Read_Store_Details = '/store/{store_id}'
     Read_Unique_Stores = '/unique/stores'
     Read_Store_Status = '/store_status/{store_id}'
+    Read_Store_Status_Batch = '/store_status/batch'
+    Export_Store_Status = '/store_status/export'
     Read_Store_Timezone = '/store/{store_id}/timezone'
+    Read_Store_Bundle = '/store/{store_id}/bundle'
+    Read_Store_Statistics = '/statistics/stores'
+    Read_Store_Status_Watermark = '/store_status/watermark'
+    Create_Store_Group = '/store_group/{store_group_name}/create'
+    Read_Store_Group = '/store_group/{store_group_name}'
     Create_Request = '/request/create'
     Read_Request = '/request/read/{request_id}'
     Update_Request = '/request/update/{request_id}'
@@ -22,3 +29,60 @@ class RequestLifeCycle(Enum):
     Processing_Request = 3
     Processing_Completed = 4
     Error_In_Processing_Request = 5
+
+
+class ReportEngine(Enum):
+    Pandas = 'pandas'
+    Vectorized = 'vectorized'
+    Fleet = 'fleet'
+    Timeline = 'timeline'
+    Index = 'index'
+    Auto = 'auto'
+    Python = 'python'
+    DuckDB = 'duckdb'
+
+
+class ReportType(Enum):
+    Uptime_And_Downtime = 'uptime_and_downtime'
+    Hourly = 'hourly'
+
+
+class StoreMonitoringShardUrl(Enum):
+    Compute_Shard = '/shard/compute'
+
+
+class ShardPartitioning(Enum):
+    Hash = 'hash'
+    Range = 'range'
+
+
+class ReportLane(Enum):
+    Fast = 'fast'
+    Bulk = 'bulk'
+
+
+class DASFetchMode(Enum):
+    Per_Table = 'per_table'
+    Bundle = 'bundle'
+
+
+class ExportFormat(Enum):
+    NDJSON = 'ndjson'
+    Arrow = 'arrow'
+
+
+class DASResponseFormat(Enum):
+    JSON = 'json'
+    MessagePack = 'msgpack'
+    Arrow = 'arrow'
+
+
+class MediaType(Enum):
+    JSON = 'application/json'
+    MessagePack = 'application/msgpack'
+    Arrow = 'application/vnd.apache.arrow.stream'
+
+
+class ReportExecutionMode(Enum):
+    Serial = 'serial'
+    Parallel = 'parallel'
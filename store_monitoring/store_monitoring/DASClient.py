@@ -0,0 +1,168 @@
+import asyncio
+import functools
+import io
+import os
+import threading
+from datetime import datetime
+
+import httpx
+
+import store_monitoring.configuration as config
+from store_monitoring.ModuleLogger import setup_logger
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+logger = setup_logger()
+
+das_client_lock = threading.Lock()
+das_clients = dict()
+async_das_clients = dict()
+shard_clients = dict()
+
+
+def is_http2_enabled() -> bool:
+    # ====================================================================
+    # HTTP/2 needs the h2 package, without it the clients keep HTTP/1.1 keep-alive connections
+    # ====================================================================
+    if config.DAS_CLIENT_HTTP2 and h2 is None:
+        logger.warning('DAS_CLIENT_HTTP2 needs the h2 package, install it with pip install store_monitoring[http2]')
+        return False
+
+    return config.DAS_CLIENT_HTTP2
+
+
+def create_das_client_options() -> dict:
+    return {'limits': httpx.Limits(max_connections=config.DAS_CLIENT_MAX_CONNECTIONS,
+                                   max_keepalive_connections=config.DAS_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                                   keepalive_expiry=config.DAS_CLIENT_KEEPALIVE_EXPIRY_IN_SECONDS),
+            'timeout': httpx.Timeout(config.DAS_CLIENT_TIMEOUT_IN_SECONDS,
+                                     connect=config.DAS_CLIENT_CONNECT_TIMEOUT_IN_SECONDS),
+            'http2': is_http2_enabled(),
+            'headers': {'Accept-Encoding': 'gzip' if config.DAS_CLIENT_GZIP else 'identity'}}
+
+
+def create_das_params(**params) -> dict:
+    """
+        Description: This function builds the query parameters of a DAS call the way requests did,
+        parameters that are None are left out and datetimes are sent as str(datetime).
+    """
+    return {name: str(value) if isinstance(value, datetime) else value
+            for name, value in params.items() if value is not None}
+
+
+def get_das_client() -> httpx.Client:
+    """
+        Description: Returns the connection pool of this process for the synchronous DAS calls.
+        A process pool worker forked from this process opens its own connections.
+    """
+    with das_client_lock:
+        das_client = das_clients.get(os.getpid())
+        if das_client is None:
+            das_client = httpx.Client(**create_das_client_options())
+            das_clients[os.getpid()] = das_client
+
+        return das_client
+
+
+def get_shard_client() -> httpx.Client:
+    """
+        Description: Returns the connection pool of this process for the calls of a coordinator to its shard workers,
+        the pool limits of the DAS client and a timeout of SHARD_TIMEOUT_IN_SECONDS.
+    """
+    with das_client_lock:
+        shard_client = shard_clients.get(os.getpid())
+        if shard_client is None:
+            shard_client = httpx.Client(limits=httpx.Limits(
+                                            max_connections=config.DAS_CLIENT_MAX_CONNECTIONS,
+                                            max_keepalive_connections=config.DAS_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                                            keepalive_expiry=config.DAS_CLIENT_KEEPALIVE_EXPIRY_IN_SECONDS),
+                                        timeout=httpx.Timeout(config.SHARD_TIMEOUT_IN_SECONDS))
+            shard_clients[os.getpid()] = shard_client
+
+        return shard_client
+
+
+def get_async_das_client() -> httpx.AsyncClient:
+    """
+        Description: Returns the connection pool of the running event loop for the DAS calls of the API handlers.
+    """
+    event_loop = asyncio.get_running_loop()
+    with das_client_lock:
+        async_das_client = async_das_clients.get(event_loop)
+        if async_das_client is None:
+            async_das_client = httpx.AsyncClient(**create_das_client_options())
+            async_das_clients[event_loop] = async_das_client
+
+        return async_das_client
+
+
+async def close_async_das_client():
+    with das_client_lock:
+        async_das_client = async_das_clients.pop(asyncio.get_running_loop(), None)
+
+    if async_das_client is not None:
+        await async_das_client.aclose()
+
+
+class ResponseStreamReader(io.RawIOBase):
+    """
+        Description: A read-only file over the body of a streamed httpx response, for readers that need a file,
+        e.g. the Arrow IPC stream reader. A read returns as many bytes as asked for unless the body ends,
+        only the chunk being read is held in memory.
+    """
+
+    def __init__(self, streamed_response: httpx.Response):
+        self.byte_chunks = streamed_response.iter_bytes()
+        self.pending_bytes = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        read_size = 0
+        while read_size < len(buffer):
+            if len(self.pending_bytes) == 0:
+                self.pending_bytes = next(self.byte_chunks, None)
+                if self.pending_bytes is None:
+                    self.pending_bytes = b''
+                    break
+
+            chunk_size = min(len(buffer) - read_size, len(self.pending_bytes))
+            buffer[read_size:read_size + chunk_size] = self.pending_bytes[:chunk_size]
+            self.pending_bytes = self.pending_bytes[chunk_size:]
+            read_size += chunk_size
+
+        return read_size
+
+
+def retry_async(stop_max_attempt_number: int,
+                wait_exponential_multiplier: int,
+                wait_exponential_max: int,
+                retry_on_exception):
+    """
+        Description: The retry of the retrying package for coroutines, the same exponential wait in milliseconds
+        between the attempts, without blocking the event loop.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        async def run(*args, **kwargs):
+            attempt_number = 1
+            while True:
+                try:
+                    return await func(*args, **kwargs)
+
+                except Exception as error:
+                    if attempt_number >= stop_max_attempt_number or not retry_on_exception(error):
+                        raise
+
+                    wait_in_milliseconds = min(wait_exponential_multiplier * (2 ** attempt_number),
+                                               wait_exponential_max)
+                    await asyncio.sleep(wait_in_milliseconds / 1000)
+                    attempt_number += 1
+
+        return run
+
+    return decorate
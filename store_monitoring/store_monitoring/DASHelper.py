@@ -3,17 +3,26 @@ Author: Lav Sharma
 Created on: 29th Oct 2023
 """
 
+import json
 from datetime import datetime
 from typing import Union
 
-import requests
-from requests.exceptions import ConnectionError as RequestsConnectionError
+from httpx import TransportError
 from retrying import retry
 
 import store_monitoring.configuration as config
-from store_monitoring.CommonEnums import StoreMonitoringDASUrl
+from store_monitoring.CommonEnums import StoreMonitoringDASUrl, ExportFormat
+from store_monitoring.DASClient import create_das_params, get_das_client, get_async_das_client, retry_async, \
+    ResponseStreamReader
 from store_monitoring.exception import ConnectionError
 from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.ResponseDecoding import create_accept_header, decode_das_response
+
+try:
+    import pyarrow
+
+except ImportError:
+    pyarrow = None
 
 logger = setup_logger()
 
@@ -28,11 +37,11 @@ def read_store_details(store_id: str,
     try:
         read_store_details_endpoint = StoreMonitoringDASUrl.Read_Store_Details.value.format(store_id=store_id)
         read_store_details_url = config.STORE_MONITORING_DAS_URL + read_store_details_endpoint
-        read_store_details_params = {'order_by': order_by}
-        store_details_response = requests.post(url=read_store_details_url, params=read_store_details_params)
+        read_store_details_params = create_das_params(order_by=order_by)
+        store_details_response = get_das_client().post(url=read_store_details_url, params=read_store_details_params)
         return store_details_response.json()
 
-    except RequestsConnectionError as request_connection_error:
+    except TransportError as request_connection_error:
         logger.error(f'Connection error at - {str(read_store_details_url)}', exc_info=True)
         raise request_connection_error
 
@@ -54,10 +63,10 @@ def read_unique_stores() -> dict:
     try:
         read_store_details_endpoint = StoreMonitoringDASUrl.Read_Unique_Stores.value
         read_unique_store_url = config.STORE_MONITORING_DAS_URL + read_store_details_endpoint
-        unique_store_response = requests.get(url=read_unique_store_url)
+        unique_store_response = get_das_client().get(url=read_unique_store_url)
         return unique_store_response.json()
 
-    except RequestsConnectionError as request_connection_error:
+    except TransportError as request_connection_error:
         logger.error(f'Connection error at - {str(read_unique_store_url)}', exc_info=True)
         raise request_connection_error
 
@@ -80,11 +89,12 @@ def read_store_status(store_id: str,
     try:
         read_store_status_endpoint = StoreMonitoringDASUrl.Read_Store_Status.value.format(store_id=store_id)
         read_store_status_url = config.STORE_MONITORING_DAS_URL + read_store_status_endpoint
-        read_store_status_params = {'order_by': order_by}
-        store_status_response = requests.post(url=read_store_status_url, params=read_store_status_params)
-        return store_status_response.json()
+        read_store_status_params = create_das_params(order_by=order_by)
+        store_status_response = get_das_client().post(url=read_store_status_url, params=read_store_status_params,
+                                                      headers=create_accept_header())
+        return decode_das_response(store_status_response)
 
-    except RequestsConnectionError as request_connection_error:
+    except TransportError as request_connection_error:
         logger.error(f'Connection error at - {str(read_store_status_url)}', exc_info=True)
         raise request_connection_error
 
@@ -97,6 +107,36 @@ def read_store_status(store_id: str,
         del read_store_status_endpoint, read_store_status_url, read_store_status_params
 
 
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+       retry_on_exception=ConnectionError.retry_if_connection_error)
+def read_store_status_batch(store_ids: list,
+                            order_by: str) -> dict:
+    read_store_status_batch_url = ''
+    try:
+        read_store_status_batch_endpoint = StoreMonitoringDASUrl.Read_Store_Status_Batch.value
+        read_store_status_batch_url = config.STORE_MONITORING_DAS_URL + read_store_status_batch_endpoint
+        read_store_status_batch_params = create_das_params(order_by=order_by)
+        store_status_batch_response = get_das_client().post(url=read_store_status_batch_url,
+                                                            params=read_store_status_batch_params,
+                                                            json={'store_ids': store_ids},
+                                                            headers=create_accept_header())
+        return decode_das_response(store_status_batch_response)
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(read_store_status_batch_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(read_store_status_batch_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del read_store_status_batch_endpoint, read_store_status_batch_url, read_store_status_batch_params
+
+
 @retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
        wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
        wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
@@ -106,10 +146,10 @@ def read_store_timezone(store_id: str) -> dict:
     try:
         read_store_timezone_endpoint = StoreMonitoringDASUrl.Read_Store_Timezone.value.format(store_id=store_id)
         read_store_timezone_url = config.STORE_MONITORING_DAS_URL + read_store_timezone_endpoint
-        store_timezone_response = requests.get(url=read_store_timezone_url)
+        store_timezone_response = get_das_client().get(url=read_store_timezone_url)
         return store_timezone_response.json()
 
-    except RequestsConnectionError as request_connection_error:
+    except TransportError as request_connection_error:
         logger.error(f'Connection error at - {str(read_store_timezone_url)}', exc_info=True)
         raise request_connection_error
 
@@ -122,6 +162,203 @@ def read_store_timezone(store_id: str) -> dict:
         del read_store_timezone_endpoint, read_store_timezone_url
 
 
+def export_store_status(export_format: str,
+                        first_store_id: int = None,
+                        last_store_id: int = None):
+    """
+        Description: This generator streams the StoreStatus rows from the DAS export, ordered by
+        (SD_StoreId, SS_TimestampUtc), and yields them as row dicts while the response is still being read.
+        A stream that ends early raises, it is not retried as the rows before the break were already handed over.
+    """
+    export_store_status_url = ''
+    try:
+        export_store_status_endpoint = StoreMonitoringDASUrl.Export_Store_Status.value
+        export_store_status_url = config.STORE_MONITORING_DAS_URL + export_store_status_endpoint
+        export_store_status_params = create_das_params(export_format=export_format,
+                                                       first_store_id=first_store_id,
+                                                       last_store_id=last_store_id)
+
+        if export_format == ExportFormat.Arrow.value and pyarrow is None:
+            raise ImportError('STORE_STATUS_EXPORT_FORMAT = arrow needs the pyarrow package, '
+                              'install it with pip install store_monitoring[arrow]')
+
+        with get_das_client().stream('GET', url=export_store_status_url,
+                                     params=export_store_status_params) as export_response:
+            if export_response.headers.get('content-type', '').startswith('application/json'):
+                # ====================================================================
+                # The DAS answers a format it can not export with a JSON response instead of a stream
+                # ====================================================================
+                export_response.read()
+                raise ValueError(f'StoreStatus export not available - {str(export_response.json())}')
+
+            if export_format == ExportFormat.Arrow.value:
+                for record_batch in pyarrow.ipc.open_stream(ResponseStreamReader(export_response)):
+                    export_columns = record_batch.to_pydict()
+                    for row_position in range(record_batch.num_rows):
+                        yield {'SS_Id': export_columns['SS_Id'][row_position],
+                               'SD_StoreId': export_columns['SD_StoreId'][row_position],
+                               'SS_StoreStatus': export_columns['SS_StoreStatus'][row_position],
+                               'SS_TimestampUtc': export_columns['SS_TimestampUtc'][row_position].isoformat()}
+
+            else:
+                is_export_complete = False
+                for export_line in export_response.iter_lines():
+                    if len(export_line) == 0:
+                        continue
+
+                    row = json.loads(export_line)
+                    if 'End_Of_Export' in row:
+                        is_export_complete = True
+                        break
+
+                    yield row
+
+                if not is_export_complete:
+                    raise ValueError('StoreStatus export ended without End_Of_Export')
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(export_store_status_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(export_store_status_url)}', exc_info=True)
+        raise error
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+       retry_on_exception=ConnectionError.retry_if_connection_error)
+def read_store_bundle(store_id: str,
+                      store_status_order_by: str,
+                      store_details_order_by: str) -> dict:
+    read_store_bundle_url = ''
+    try:
+        read_store_bundle_endpoint = StoreMonitoringDASUrl.Read_Store_Bundle.value.format(store_id=store_id)
+        read_store_bundle_url = config.STORE_MONITORING_DAS_URL + read_store_bundle_endpoint
+        read_store_bundle_params = create_das_params(store_status_order_by=store_status_order_by,
+                                                     store_details_order_by=store_details_order_by)
+        store_bundle_response = get_das_client().get(url=read_store_bundle_url, params=read_store_bundle_params,
+                                                     headers=create_accept_header())
+        return decode_das_response(store_bundle_response)
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(read_store_bundle_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(read_store_bundle_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del read_store_bundle_endpoint, read_store_bundle_url, read_store_bundle_params
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+       retry_on_exception=ConnectionError.retry_if_connection_error)
+def read_store_statistics() -> dict:
+    read_store_statistics_url = ''
+    try:
+        read_store_statistics_endpoint = StoreMonitoringDASUrl.Read_Store_Statistics.value
+        read_store_statistics_url = config.STORE_MONITORING_DAS_URL + read_store_statistics_endpoint
+        store_statistics_response = get_das_client().get(url=read_store_statistics_url)
+        return store_statistics_response.json()
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(read_store_statistics_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(read_store_statistics_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del read_store_statistics_endpoint, read_store_statistics_url
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+       retry_on_exception=ConnectionError.retry_if_connection_error)
+def read_store_status_watermark() -> dict:
+    read_store_status_watermark_url = ''
+    try:
+        read_store_status_watermark_endpoint = StoreMonitoringDASUrl.Read_Store_Status_Watermark.value
+        read_store_status_watermark_url = config.STORE_MONITORING_DAS_URL + read_store_status_watermark_endpoint
+        store_status_watermark_response = get_das_client().get(url=read_store_status_watermark_url)
+        return store_status_watermark_response.json()
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(read_store_status_watermark_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(read_store_status_watermark_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del read_store_status_watermark_endpoint, read_store_status_watermark_url
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+       retry_on_exception=ConnectionError.retry_if_connection_error)
+def create_store_group(store_group_name: str,
+                       store_ids: list) -> dict:
+    create_store_group_url = ''
+    try:
+        create_store_group_endpoint = StoreMonitoringDASUrl.Create_Store_Group.value.format(
+            store_group_name=store_group_name)
+        create_store_group_url = config.STORE_MONITORING_DAS_URL + create_store_group_endpoint
+        create_store_group_response = get_das_client().post(url=create_store_group_url, json={'store_ids': store_ids})
+        return create_store_group_response.json()
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(create_store_group_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(create_store_group_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del create_store_group_endpoint, create_store_group_url
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+       retry_on_exception=ConnectionError.retry_if_connection_error)
+def read_store_group(store_group_name: str) -> dict:
+    read_store_group_url = ''
+    try:
+        read_store_group_endpoint = StoreMonitoringDASUrl.Read_Store_Group.value.format(
+            store_group_name=store_group_name)
+        read_store_group_url = config.STORE_MONITORING_DAS_URL + read_store_group_endpoint
+        store_group_response = get_das_client().get(url=read_store_group_url)
+        return store_group_response.json()
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(read_store_group_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(read_store_group_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del read_store_group_endpoint, read_store_group_url
+
+
 @retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
        wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
        wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
@@ -131,10 +368,10 @@ def create_request() -> dict:
     try:
         create_request_endpoint = StoreMonitoringDASUrl.Create_Request.value
         create_request_url = config.STORE_MONITORING_DAS_URL + create_request_endpoint
-        create_request_response = requests.post(url=create_request_url)
+        create_request_response = get_das_client().post(url=create_request_url)
         return create_request_response.json()
 
-    except RequestsConnectionError as request_connection_error:
+    except TransportError as request_connection_error:
         logger.error(f'Connection error at - {str(create_request_url)}', exc_info=True)
         raise request_connection_error
 
@@ -156,10 +393,10 @@ def read_request(request_id: int) -> dict:
     try:
         read_request_endpoint = StoreMonitoringDASUrl.Read_Request.value.format(request_id=request_id)
         read_request_url = config.STORE_MONITORING_DAS_URL + read_request_endpoint
-        read_request_response = requests.get(url=read_request_url)
+        read_request_response = get_das_client().get(url=read_request_url)
         return read_request_response.json()
 
-    except RequestsConnectionError as request_connection_error:
+    except TransportError as request_connection_error:
         logger.error(f'Connection error at - {str(read_request_url)}', exc_info=True)
         raise request_connection_error
 
@@ -183,12 +420,171 @@ def update_request(request_id: int,
     try:
         update_request_endpoint = StoreMonitoringDASUrl.Update_Request.value.format(request_id=request_id)
         update_request_url = config.STORE_MONITORING_DAS_URL + update_request_endpoint
-        update_request_params = {'update_row_column_name': update_row_column_name,
-                                 'update_row_column_value': update_row_column_value}
-        update_request_response = requests.post(url=update_request_url, params=update_request_params)
+        update_request_params = create_das_params(update_row_column_name=update_row_column_name,
+                                                  update_row_column_value=update_row_column_value)
+        update_request_response = get_das_client().post(url=update_request_url, params=update_request_params)
+        return update_request_response.json()
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(update_request_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(update_request_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del update_request_endpoint, update_request_url
+
+
+@retry_async(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+             wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+             wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+             retry_on_exception=ConnectionError.retry_if_connection_error)
+async def read_store_status_watermark_async() -> dict:
+    read_store_status_watermark_url = ''
+    try:
+        read_store_status_watermark_endpoint = StoreMonitoringDASUrl.Read_Store_Status_Watermark.value
+        read_store_status_watermark_url = config.STORE_MONITORING_DAS_URL + read_store_status_watermark_endpoint
+        store_status_watermark_response = await get_async_das_client().get(url=read_store_status_watermark_url)
+        return store_status_watermark_response.json()
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(read_store_status_watermark_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(read_store_status_watermark_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del read_store_status_watermark_endpoint, read_store_status_watermark_url
+
+
+@retry_async(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+             wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+             wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+             retry_on_exception=ConnectionError.retry_if_connection_error)
+async def create_store_group_async(store_group_name: str,
+                                   store_ids: list) -> dict:
+    create_store_group_url = ''
+    try:
+        create_store_group_endpoint = StoreMonitoringDASUrl.Create_Store_Group.value.format(
+            store_group_name=store_group_name)
+        create_store_group_url = config.STORE_MONITORING_DAS_URL + create_store_group_endpoint
+        create_store_group_response = await get_async_das_client().post(url=create_store_group_url,
+                                                                        json={'store_ids': store_ids})
+        return create_store_group_response.json()
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(create_store_group_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(create_store_group_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del create_store_group_endpoint, create_store_group_url
+
+
+@retry_async(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+             wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+             wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+             retry_on_exception=ConnectionError.retry_if_connection_error)
+async def read_store_group_async(store_group_name: str) -> dict:
+    read_store_group_url = ''
+    try:
+        read_store_group_endpoint = StoreMonitoringDASUrl.Read_Store_Group.value.format(
+            store_group_name=store_group_name)
+        read_store_group_url = config.STORE_MONITORING_DAS_URL + read_store_group_endpoint
+        store_group_response = await get_async_das_client().get(url=read_store_group_url)
+        return store_group_response.json()
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(read_store_group_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(read_store_group_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del read_store_group_endpoint, read_store_group_url
+
+
+@retry_async(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+             wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+             wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+             retry_on_exception=ConnectionError.retry_if_connection_error)
+async def create_request_async() -> dict:
+    create_request_url = ''
+    try:
+        create_request_endpoint = StoreMonitoringDASUrl.Create_Request.value
+        create_request_url = config.STORE_MONITORING_DAS_URL + create_request_endpoint
+        create_request_response = await get_async_das_client().post(url=create_request_url)
+        return create_request_response.json()
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(create_request_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(create_request_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del create_request_endpoint, create_request_url
+
+
+@retry_async(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+             wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+             wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+             retry_on_exception=ConnectionError.retry_if_connection_error)
+async def read_request_async(request_id: int) -> dict:
+    read_request_url = ''
+    try:
+        read_request_endpoint = StoreMonitoringDASUrl.Read_Request.value.format(request_id=request_id)
+        read_request_url = config.STORE_MONITORING_DAS_URL + read_request_endpoint
+        read_request_response = await get_async_das_client().get(url=read_request_url)
+        return read_request_response.json()
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(read_request_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(read_request_url)}', exc_info=True)
+        raise error
+
+    finally:
+        del read_request_endpoint, read_request_url
+
+
+@retry_async(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+             wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+             wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+             retry_on_exception=ConnectionError.retry_if_connection_error)
+async def update_request_async(request_id: int,
+                               update_row_column_name: str,
+                               update_row_column_value: Union[int, str, datetime]) -> dict:
+    update_request_url = ''
+    try:
+        update_request_endpoint = StoreMonitoringDASUrl.Update_Request.value.format(request_id=request_id)
+        update_request_url = config.STORE_MONITORING_DAS_URL + update_request_endpoint
+        update_request_params = create_das_params(update_row_column_name=update_row_column_name,
+                                                  update_row_column_value=update_row_column_value)
+        update_request_response = await get_async_das_client().post(url=update_request_url,
+                                                                    params=update_request_params)
         return update_request_response.json()
 
-    except RequestsConnectionError as request_connection_error:
+    except TransportError as request_connection_error:
         logger.error(f'Connection error at - {str(update_request_url)}', exc_info=True)
         raise request_connection_error
 
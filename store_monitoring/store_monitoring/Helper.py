@@ -1,19 +1,25 @@
 import csv
+import functools
 from datetime import timedelta
 from timeit import default_timer as timer
 
+import numpy
 import pandas
-import pytz
 
 import store_monitoring.configuration as config
-from store_monitoring.DASHelper import read_unique_stores, read_store_timezone, read_store_status, read_store_details
+from store_monitoring.DASHelper import read_unique_stores, read_store_timezone, read_store_status, read_store_details, \
+    read_store_status_batch, read_store_bundle, export_store_status, \
+    read_store_statistics, read_store_status_watermark, read_store_group, read_store_status_watermark_async, \
+    read_store_group_async
 from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.TimezoneHelper import convert_utc_to_local_microseconds
 
 logger = setup_logger()
 
 
 # Decorator function for time consumption of methods
 def time_it(func):
+    @functools.wraps(func)
     def run(*args, **kwargs):
         # start timer
         start_time = timer()
@@ -77,15 +83,13 @@ def convert_timestamp_utc_to_local_timezone(store_status_df: pandas.DataFrame,
         store_status_df['SS_TimestampUtc'] = pandas.to_datetime(store_status_df['SS_TimestampUtc'], utc=True)
 
         # ====================================================================
-        # Convert the time in store_status_df from UTC to store_timezone
+        # Convert the time in store_status_df from UTC to store_timezone using the cached transitions,
+        # tz_localize(None) for removing +00:00 from the dataframe
         # ====================================================================
-        target_timezone = pytz.timezone(store_timezone)
-
-        # ====================================================================
-        # tz_localize(None) for removing -05:00 from the dataframe
-        # ====================================================================
-        store_status_df['SS_LocalTimestamp'] = store_status_df['SS_TimestampUtc']. \
-            dt.tz_convert(target_timezone).dt.tz_localize(None)
+        utc_microseconds = store_status_df['SS_TimestampUtc'].dt.tz_localize(None). \
+            to_numpy(dtype='datetime64[us]').view(numpy.int64)
+        store_status_df['SS_LocalTimestamp'] = convert_utc_to_local_microseconds(
+            utc_microseconds, store_timezone).view('datetime64[us]')
 
         return store_status_df
 
@@ -98,7 +102,7 @@ def identify_day_for_timezone(store_status_df: pandas.DataFrame) -> pandas.DataF
         # ====================================================================
         # Identify the Day for every row using the SS_LocalTimestamp
         # ====================================================================
-        store_status_df['SS_Day'] = store_status_df['SS_LocalTimestamp'].apply(get_day_of_week)
+        store_status_df['SS_Day'] = store_status_df['SS_LocalTimestamp'].dt.weekday
         return store_status_df
 
     except Exception:
@@ -128,6 +132,49 @@ def read_unique_stores_wrapper() -> list:
         del unique_stores
 
 
+def read_store_group_wrapper(store_group_name: str) -> list:
+    try:
+        store_group = []
+
+        # ====================================================================
+        # Retrieve the StoreId's of the store group from StoreGroup table
+        # ====================================================================
+        store_group_response = read_store_group(store_group_name)
+
+        if 'HttpResponseCode' in store_group_response and store_group_response['HttpResponseCode'] == 200:
+            if 'ResponseCode' in store_group_response and store_group_response['ResponseCode'] == 2001:
+                if 'StoreId' in store_group_response:
+                    store_group = store_group_response['StoreId']
+
+        return store_group
+
+    except Exception:
+        raise
+
+    finally:
+        del store_group_response
+
+
+async def read_store_group_wrapper_async(store_group_name: str) -> list:
+    try:
+        store_group = []
+
+        # ====================================================================
+        # Retrieve the StoreId's of the store group from StoreGroup table, without blocking the event loop
+        # ====================================================================
+        store_group_response = await read_store_group_async(store_group_name)
+
+        if 'HttpResponseCode' in store_group_response and store_group_response['HttpResponseCode'] == 200:
+            if 'ResponseCode' in store_group_response and store_group_response['ResponseCode'] == 2001:
+                if 'StoreId' in store_group_response:
+                    store_group = store_group_response['StoreId']
+
+        return store_group
+
+    except Exception:
+        raise
+
+
 def read_store_timezone_wrapper(store_id: str) -> str:
     try:
         # ====================================================================
@@ -166,7 +213,13 @@ def read_store_timezone_wrapper(store_id: str) -> str:
         del store_timezone
 
 
-def read_store_status_wrapper(store_id: str) -> list:
+def read_store_status_wrapper(store_id: str):
+    """
+        Description: Returns the StoreStatus rows of the store_id, as the list of row dicts of a JSON response or as
+        the numpy columns of a msgpack or Arrow response (see decode_store_status_columns).
+        [] for a store without polls. The array engines read the columns as they are, the row engines convert them with
+        convert_store_status_columns_to_rows.
+    """
     try:
         store_status_rows = []
 
@@ -190,6 +243,89 @@ def read_store_status_wrapper(store_id: str) -> list:
         del store_status
 
 
+def read_store_status_batch_wrapper(store_ids: list) -> dict:
+    """
+        Description: The batch counterpart of read_store_status_wrapper, the rows of the store_ids are read
+        STORE_STATUS_BATCH_SIZE stores per call. Returns the rows (or columns) keyed by str(store_id),
+        [] for a store without polls.
+    """
+    try:
+        store_status_rows = {str(store_id): [] for store_id in store_ids}
+
+        for batch_start in range(0, len(store_ids), max(config.STORE_STATUS_BATCH_SIZE, 1)):
+            # ====================================================================
+            # Retrieve the rows of a chunk of StoreIds from StoreStatus table with one query
+            # ====================================================================
+            store_status_batch = read_store_status_batch(
+                list(store_ids[batch_start:batch_start + max(config.STORE_STATUS_BATCH_SIZE, 1)]),
+                order_by=config.ORDER_FOR_READING_STORE_STATUS)
+
+            if 'HttpResponseCode' in store_status_batch and store_status_batch['HttpResponseCode'] == 200:
+                if 'ResponseCode' in store_status_batch:
+                    response_code = store_status_batch['ResponseCode']
+                    if response_code == 3003 or response_code == 2001:
+                        for store_status in store_status_batch['Stores']:
+                            store_status_rows[str(store_status['StoreId'])] = store_status['Rows']
+
+        return store_status_rows
+
+    except Exception:
+        raise
+
+
+def export_store_status_wrapper(first_store_id: int = None,
+                                last_store_id: int = None):
+    """
+        Description: This generator yields (store_id, rows) for every store of the StoreStatus export in
+        STORE_STATUS_EXPORT_FORMAT, in the order of the store_id. Only the rows of one store are held at a time.
+    """
+    try:
+        store_id = None
+        store_status_rows = []
+
+        for row in export_store_status(config.STORE_STATUS_EXPORT_FORMAT, first_store_id, last_store_id):
+            if row['SD_StoreId'] != store_id:
+                # ====================================================================
+                # The export is ordered by store_id, the first row of the next store closes the current one
+                # ====================================================================
+                if store_id is not None:
+                    yield store_id, store_status_rows
+                store_id = row['SD_StoreId']
+                store_status_rows = []
+
+            store_status_rows.append(row)
+
+        if store_id is not None:
+            yield store_id, store_status_rows
+
+    except Exception:
+        raise
+
+
+def read_store_bundle_wrapper(store_id) -> dict:
+    """
+        Description: Reads the Timezone (the default one applied by the DAS), the StoreStatus rows and the StoreDetails
+        rows of the store_id with one call. Returns None if the DAS could not answer it, e.g. a DAS without the endpoint.
+    """
+    try:
+        store_bundle = read_store_bundle(store_id,
+                                         store_status_order_by=config.ORDER_FOR_READING_STORE_STATUS,
+                                         store_details_order_by=config.ORDER_FOR_READING_STORE_DETAILS)
+
+        if 'HttpResponseCode' in store_bundle and store_bundle['HttpResponseCode'] == 200:
+            if 'ResponseCode' in store_bundle:
+                response_code = store_bundle['ResponseCode']
+                if response_code == 3003 or response_code == 2001:
+                    return {'Store_Timezone': store_bundle['Store_Timezone'],
+                            'Store_Status': store_bundle['Store_Status'],
+                            'Store_Details': store_bundle['Store_Details']}
+
+        return None
+
+    except Exception:
+        raise
+
+
 def read_store_details_wrapper(store_id) -> list:
     try:
         store_details_rows = []
@@ -211,6 +347,76 @@ def read_store_details_wrapper(store_id) -> list:
         raise
 
 
+def read_store_statistics_wrapper() -> dict:
+    try:
+        store_statistics = dict()
+
+        # ====================================================================
+        # Retrieve the Poll_Count and Window_Count of every StoreId
+        # ====================================================================
+        store_statistics_response = read_store_statistics()
+
+        if 'HttpResponseCode' in store_statistics_response and store_statistics_response['HttpResponseCode'] == 200:
+            if 'ResponseCode' in store_statistics_response and store_statistics_response['ResponseCode'] == 2001:
+                if 'Rows' in store_statistics_response:
+                    store_statistics = {row['SD_StoreId']: row for row in store_statistics_response['Rows']}
+
+        return store_statistics
+
+    except Exception:
+        raise
+
+    finally:
+        del store_statistics_response
+
+
+def read_store_status_watermark_wrapper() -> dict:
+    try:
+        store_status_watermark = dict()
+
+        # ====================================================================
+        # Retrieve the largest SS_Id and SS_TimestampUtc of the StoreStatus table
+        # ====================================================================
+        store_status_watermark_response = read_store_status_watermark()
+
+        if 'HttpResponseCode' in store_status_watermark_response and \
+                store_status_watermark_response['HttpResponseCode'] == 200:
+            if 'ResponseCode' in store_status_watermark_response and \
+                    store_status_watermark_response['ResponseCode'] == 2001:
+                if 'Row' in store_status_watermark_response:
+                    store_status_watermark = store_status_watermark_response['Row']
+
+        return store_status_watermark
+
+    except Exception:
+        raise
+
+    finally:
+        del store_status_watermark_response
+
+
+async def read_store_status_watermark_wrapper_async() -> dict:
+    try:
+        store_status_watermark = dict()
+
+        # ====================================================================
+        # Retrieve the watermark of the StoreStatus table, without blocking the event loop
+        # ====================================================================
+        store_status_watermark_response = await read_store_status_watermark_async()
+
+        if 'HttpResponseCode' in store_status_watermark_response and \
+                store_status_watermark_response['HttpResponseCode'] == 200:
+            if 'ResponseCode' in store_status_watermark_response and \
+                    store_status_watermark_response['ResponseCode'] == 2001:
+                if 'Row' in store_status_watermark_response:
+                    store_status_watermark = store_status_watermark_response['Row']
+
+        return store_status_watermark
+
+    except Exception:
+        raise
+
+
 def calculate_uptime_last_hour_in_minutes(input_df: pandas.DataFrame):
     try:
         return float(input_df.tail(1)['Uptime_Last_Hour_In_Seconds'].iloc[0]) / 60
@@ -0,0 +1,123 @@
+import threading
+from datetime import datetime
+
+import store_monitoring.configuration as config
+from store_monitoring.Helper import read_store_status_watermark_wrapper
+from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.processing.GenerateReport import complete_request, fail_request
+from store_monitoring.processing.ReportCheckpoint import add_attached_request, remove_checkpoint
+
+logger = setup_logger()
+
+
+def create_coalescing_key(report_type: str,
+                          windows: list = None,
+                          as_of: datetime = None,
+                          store_ids: list = None,
+                          store_status_watermark: dict = None) -> tuple:
+    """
+        Description: This function builds the key of a report, two reports with the same key give the same output.
+        The key is the report type, windows, as_of and StoreIds plus the watermark of the StoreStatus table, so a report
+        triggered after new polls arrived is never attached to an older one.
+        The watermark is read from the DAS unless it is given, e.g. by a handler that read it asynchronously.
+        Returns None (no coalescing) if REPORT_COALESCING is off or the watermark is not available.
+    """
+    try:
+        if not config.REPORT_COALESCING:
+            return None
+
+        if store_status_watermark is None:
+            store_status_watermark = read_store_status_watermark_wrapper()
+        if len(store_status_watermark) == 0:
+            return None
+
+        return (report_type,
+                tuple(windows) if windows else None,
+                as_of.isoformat() if as_of is not None else None,
+                tuple(store_ids) if store_ids is not None else None,
+                store_status_watermark['SS_Id'])
+
+    except Exception:
+        raise
+
+
+class ReportCoalescer:
+    """
+        Description: Keeps the report that is queued or running for every coalescing key.
+        A request with the same key attaches to that report instead of being computed again, when the report
+        finishes every attached request gets its status and output file.
+        The attached requests are also recorded in the checkpoint of the report, a restart re-attaches them.
+    """
+
+    def __init__(self):
+        try:
+            self.running_reports = dict()
+            self.attached_request_ids = dict()
+            self.coalescing_lock = threading.Lock()
+
+        except Exception:
+            raise
+
+    def get_running_request_id(self, coalescing_key: tuple) -> int:
+        with self.coalescing_lock:
+            return self.running_reports.get(coalescing_key)
+
+    def attach(self, coalescing_key: tuple, request_id: int) -> int:
+        """
+            Description: Attaches request_id to the running report of coalescing_key and returns its request id.
+            If no report of the key is running, request_id becomes the running report and None is returned.
+        """
+        with self.coalescing_lock:
+            running_request_id = self.running_reports.get(coalescing_key)
+            if running_request_id is None:
+                self.running_reports[coalescing_key] = request_id
+                self.attached_request_ids[request_id] = []
+                return None
+
+            # ====================================================================
+            # Under the lock, the report cannot detach its requests and remove its checkpoint in between
+            # ====================================================================
+            add_attached_request(running_request_id, request_id)
+            self.attached_request_ids[running_request_id].append(request_id)
+            logger.info(f'Attached request_id - {str(request_id)} to request_id - {str(running_request_id)}')
+            return running_request_id
+
+    def reattach(self, coalescing_key: tuple, request_id: int, attached_request_ids: list):
+        """
+            Description: Registers a report resumed from its checkpoint with the requests that were attached to it
+            before the restart.
+        """
+        with self.coalescing_lock:
+            self.running_reports[coalescing_key] = request_id
+            self.attached_request_ids[request_id] = list(attached_request_ids)
+
+    def detach_all(self, coalescing_key: tuple, request_id: int) -> list:
+        with self.coalescing_lock:
+            # ====================================================================
+            # After this no request can attach to the report any more
+            # ====================================================================
+            if self.running_reports.get(coalescing_key) == request_id:
+                self.running_reports.pop(coalescing_key)
+
+            return self.attached_request_ids.pop(request_id, [])
+
+    def run_report(self, coalescing_key: tuple, request_id: int, target, args: tuple = ()):
+        """
+            Description: Runs the report of request_id, then completes (or fails) the attached requests
+            with the same output file.
+        """
+        try:
+            output_path = target(*args)
+
+        except Exception:
+            self.fail_report(coalescing_key, request_id)
+            raise
+
+        for attached_request_id in self.detach_all(coalescing_key, request_id):
+            complete_request(attached_request_id, output_path)
+        remove_checkpoint(request_id)
+
+    def fail_report(self, coalescing_key: tuple, request_id: int):
+        for attached_request_id in self.detach_all(coalescing_key, request_id):
+            fail_request(attached_request_id)
+        remove_checkpoint(request_id)
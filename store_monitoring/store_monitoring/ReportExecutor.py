@@ -0,0 +1,159 @@
+import heapq
+import itertools
+import threading
+import time
+
+import store_monitoring.configuration as config
+from store_monitoring.CommonEnums import ReportLane
+from store_monitoring.ModuleLogger import setup_logger
+
+logger = setup_logger()
+
+# ====================================================================
+# Statistics of finished reports kept in memory for /get_report
+# ====================================================================
+MAXIMUM_FINISHED_REQUEST_STATISTICS = 1000
+
+
+def classify_report_lane(number_of_stores: int = None) -> str:
+    try:
+        # ====================================================================
+        # Reports of a few stores are interactive, full-fleet reports (no scope) are bulk
+        # ====================================================================
+        if number_of_stores is not None and number_of_stores <= config.FAST_LANE_MAXIMUM_STORES:
+            return ReportLane.Fast.value
+
+        return ReportLane.Bulk.value
+
+    except Exception:
+        raise
+
+
+class ReportExecutor:
+    """
+        Description: Report workers reading from a bounded priority queue per lane.
+        The fast lane workers only run fast lane reports, the shared workers run the fast lane first, then the bulk
+        lane, so a small report never waits behind more than the running full-fleet reports.
+        Within a lane higher priority runs first, equal priorities in the order they were submitted.
+        submit() never blocks, a full lane rejects the report so the caller can answer with backpressure.
+    """
+
+    def __init__(self, number_of_workers: int, queue_size: int,
+                 fast_lane_workers: int = 0, fast_lane_queue_size: int = 0,
+                 on_report_started=None):
+        try:
+            self.lane_queues = {ReportLane.Fast.value: [], ReportLane.Bulk.value: []}
+            self.lane_queue_sizes = {ReportLane.Fast.value: fast_lane_queue_size, ReportLane.Bulk.value: queue_size}
+            self.submission_sequence = itertools.count()
+            self.lane_condition = threading.Condition()
+            self.on_report_started = on_report_started
+
+            self.request_statistics = dict()
+            self.statistics_lock = threading.Lock()
+
+            self.workers = []
+            for worker_number in range(1, fast_lane_workers + 1):
+                self.workers.append(threading.Thread(target=self.run_worker, args=([ReportLane.Fast.value],),
+                                                     name=f'FastLaneReportWorker-{str(worker_number)}', daemon=True))
+            for worker_number in range(1, number_of_workers + 1):
+                self.workers.append(threading.Thread(target=self.run_worker,
+                                                     args=([ReportLane.Fast.value, ReportLane.Bulk.value],),
+                                                     name=f'ReportWorker-{str(worker_number)}', daemon=True))
+            for worker in self.workers:
+                worker.start()
+
+        except Exception:
+            raise
+
+    def submit(self, request_id: int, target, args: tuple = (),
+               lane: str = ReportLane.Bulk.value, priority: int = 0) -> bool:
+        try:
+            with self.lane_condition:
+                if len(self.lane_queues[lane]) >= self.lane_queue_sizes[lane]:
+                    logger.warning(f'Report queue of the {str(lane)} lane is full, '
+                                   f'rejected request_id - {str(request_id)}')
+                    return False
+
+                # ====================================================================
+                # Record the statistics first, a worker can pick the report up right after notify
+                # ====================================================================
+                queue_depth = len(self.lane_queues[lane])
+                with self.statistics_lock:
+                    self.request_statistics[request_id] = {'Status': 'Queued',
+                                                           'Lane': lane,
+                                                           'Priority': priority,
+                                                           'Queue_Depth': queue_depth,
+                                                           'Submitted_Timestamp': time.time(),
+                                                           'Queue_Wait_In_Seconds': None,
+                                                           'Run_Time_In_Seconds': None}
+
+                heapq.heappush(self.lane_queues[lane],
+                               (-priority, next(self.submission_sequence), request_id, target, args))
+                self.lane_condition.notify_all()
+
+            self.remove_finished_request_statistics()
+            logger.info(f'Queued request_id - {str(request_id)} in the {str(lane)} lane, '
+                        f'priority - {str(priority)}, queue depth - {str(queue_depth)}')
+            return True
+
+        except Exception:
+            raise
+
+    def remove_finished_request_statistics(self):
+        with self.statistics_lock:
+            finished_request_ids = [request_id for request_id, request_statistics in self.request_statistics.items()
+                                    if request_statistics['Status'] in ('Completed', 'Failed')]
+            for request_id in finished_request_ids[:-MAXIMUM_FINISHED_REQUEST_STATISTICS]:
+                self.request_statistics.pop(request_id)
+
+    def is_full(self, lane: str = ReportLane.Bulk.value) -> bool:
+        with self.lane_condition:
+            return len(self.lane_queues[lane]) >= self.lane_queue_sizes[lane]
+
+    def get_request_statistics(self, request_id: int) -> dict:
+        with self.statistics_lock:
+            request_statistics = self.request_statistics.get(request_id)
+            if request_statistics is not None:
+                return {key: value for key, value in request_statistics.items() if key != 'Submitted_Timestamp'}
+
+    def take_next_report(self, lanes: list) -> tuple:
+        with self.lane_condition:
+            while True:
+                # ====================================================================
+                # The first lane with a pending report, in the order of lanes
+                # ====================================================================
+                for lane in lanes:
+                    if len(self.lane_queues[lane]) > 0:
+                        _, _, request_id, target, args = heapq.heappop(self.lane_queues[lane])
+                        return lane, request_id, target, args
+
+                self.lane_condition.wait()
+
+    def run_worker(self, lanes: list):
+        while True:
+            lane, request_id, target, args = self.take_next_report(lanes)
+
+            started_timestamp = time.time()
+            with self.statistics_lock:
+                self.request_statistics[request_id]['Status'] = 'Running'
+                queue_wait_in_seconds = started_timestamp - self.request_statistics[request_id]['Submitted_Timestamp']
+                self.request_statistics[request_id]['Queue_Wait_In_Seconds'] = round(queue_wait_in_seconds, 3)
+
+            try:
+                if self.on_report_started is not None:
+                    self.on_report_started(request_id, lane, queue_wait_in_seconds)
+
+                target(*args)
+                status = 'Completed'
+
+            except Exception as error:
+                # ====================================================================
+                # The report records its own failure, keep the worker alive for the next one
+                # ====================================================================
+                logger.error(f'Exception in request_id - {str(request_id)} - {str(error)}', exc_info=True)
+                status = 'Failed'
+
+            with self.statistics_lock:
+                self.request_statistics[request_id]['Status'] = status
+                self.request_statistics[request_id]['Run_Time_In_Seconds'] = round(
+                    time.time() - started_timestamp, 3)
@@ -0,0 +1,189 @@
+import threading
+import time
+from datetime import datetime
+
+import store_monitoring.configuration as config
+from store_monitoring.CommonEnums import RequestLifeCycle, ReportLane, ReportType
+from store_monitoring.DASHelper import create_request, update_request
+from store_monitoring.Helper import read_store_status_watermark_wrapper
+from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.processing.GenerateReport import generate_report
+from store_monitoring.processing.ReportCheckpoint import create_report_arguments, save_submitted_report, \
+    remove_checkpoint
+from store_monitoring.ReportCoalescer import ReportCoalescer, create_coalescing_key
+from store_monitoring.ReportExecutor import ReportExecutor
+
+logger = setup_logger()
+
+# ====================================================================
+# Scheduled reports give way to every report that was triggered by a user
+# ====================================================================
+SCHEDULED_REPORT_PRIORITY = -1
+
+
+class ReportScheduler:
+    """
+        Description: Regenerates the default fleet report in the background, every REPORT_SCHEDULER_INTERVAL_IN_SECONDS
+        and whenever the StoreStatus watermark moves, checked every REPORT_SCHEDULER_CHECK_IN_SECONDS.
+        A run on new polls waits until REPORT_SCHEDULER_MINIMUM_GAP_IN_SECONDS have passed since the previous run
+        finished, the start of the process counts as a finished run.
+        The last completed report is the snapshot /trigger_report answers with, without computing anything.
+        A scheduled report is registered with the ReportCoalescer, an identical triggered report attaches to it.
+        REPORT_SCHEDULER_CHECK_IN_SECONDS = 0 turns the scheduler off.
+    """
+
+    def __init__(self, report_executor: ReportExecutor, report_coalescer: ReportCoalescer):
+        try:
+            self.report_executor = report_executor
+            self.report_coalescer = report_coalescer
+            self.latest_snapshot = None
+            self.running_request_id = None
+            self.last_scheduled_timestamp = time.time()
+            self.last_completed_timestamp = time.time()
+            self.last_scheduled_watermark = None
+            self.scheduler_lock = threading.Lock()
+
+            if config.REPORT_SCHEDULER_CHECK_IN_SECONDS > 0:
+                self.scheduler_thread = threading.Thread(target=self.run_scheduler, name='ReportScheduler',
+                                                         daemon=True)
+                self.scheduler_thread.start()
+
+        except Exception:
+            raise
+
+    def get_latest_snapshot(self) -> dict:
+        with self.scheduler_lock:
+            return self.latest_snapshot
+
+    def run_scheduler(self):
+        while True:
+            try:
+                self.schedule_report_if_due()
+
+            except Exception as error:
+                logger.error(f'Exception in the report scheduler - {str(error)}', exc_info=True)
+
+            time.sleep(config.REPORT_SCHEDULER_CHECK_IN_SECONDS)
+
+    def schedule_report_if_due(self):
+        try:
+            with self.scheduler_lock:
+                if self.running_request_id is not None:
+                    return
+
+            # ====================================================================
+            # Polls land all the time, a run on new data waits for the minimum gap after the previous run
+            # ====================================================================
+            is_cadence_due = config.REPORT_SCHEDULER_INTERVAL_IN_SECONDS > 0 and \
+                time.time() - self.last_scheduled_timestamp >= config.REPORT_SCHEDULER_INTERVAL_IN_SECONDS
+            is_gap_elapsed = time.time() - self.last_completed_timestamp >= \
+                config.REPORT_SCHEDULER_MINIMUM_GAP_IN_SECONDS
+            if not is_cadence_due and not is_gap_elapsed:
+                return
+
+            # ====================================================================
+            # Due on new polls (the watermark moved) or when the cadence has elapsed
+            # ====================================================================
+            store_status_watermark = read_store_status_watermark_wrapper()
+            is_new_data = len(store_status_watermark) > 0 and store_status_watermark != self.last_scheduled_watermark
+            if not is_cadence_due and not is_new_data:
+                return
+
+            if self.report_executor.is_full(ReportLane.Bulk.value):
+                logger.warning('Report queue is full, the scheduled report is skipped')
+                return
+
+            # ====================================================================
+            # An identical report triggered by a user is already on its way, check again on the next run
+            # ====================================================================
+            coalescing_key = create_coalescing_key(ReportType.Uptime_And_Downtime.value)
+            if coalescing_key is not None and self.report_coalescer.get_running_request_id(coalescing_key) is not None:
+                return
+
+            # ====================================================================
+            # Create entry in the Request table
+            # ====================================================================
+            create_request_response = create_request()
+            if create_request_response.get('HttpResponseCode') != 200 or \
+                    create_request_response.get('ResponseCode') != 2000:
+                logger.error('Error in creating the Request of the scheduled report')
+                return
+
+            request_id = create_request_response['R_Id']
+            update_request(request_id=request_id,
+                           update_row_column_name='RS_Id',
+                           update_row_column_value=RequestLifeCycle.Request_Sent_For_Processing.value)
+            update_request(request_id=request_id,
+                           update_row_column_name='R_Lane',
+                           update_row_column_value=ReportLane.Bulk.value)
+
+            with self.scheduler_lock:
+                self.running_request_id = request_id
+            self.last_scheduled_timestamp = time.time()
+            self.last_scheduled_watermark = store_status_watermark
+
+            if coalescing_key is not None:
+                self.report_coalescer.attach(coalescing_key, request_id)
+            save_submitted_report(request_id, create_report_arguments(report_type=ReportType.Uptime_And_Downtime.value))
+
+            is_submitted = self.report_executor.submit(request_id, self.run_scheduled_report,
+                                                       (request_id, store_status_watermark, coalescing_key),
+                                                       ReportLane.Bulk.value, SCHEDULED_REPORT_PRIORITY)
+            if not is_submitted:
+                update_request(request_id=request_id,
+                               update_row_column_name='RS_Id',
+                               update_row_column_value=RequestLifeCycle.Error_In_Processing_Request.value)
+                if coalescing_key is not None:
+                    self.report_coalescer.fail_report(coalescing_key, request_id)
+                remove_checkpoint(request_id)
+                with self.scheduler_lock:
+                    self.running_request_id = None
+                    self.last_completed_timestamp = time.time()
+                return
+
+            logger.info(f'Scheduled report request_id - {str(request_id)}, watermark - {str(store_status_watermark)}')
+
+        except Exception:
+            raise
+
+    def run_scheduled_report(self, request_id: int, store_status_watermark: dict, coalescing_key: tuple = None):
+        try:
+            if coalescing_key is not None:
+                self.report_coalescer.run_report(coalescing_key, request_id, generate_report, (request_id,))
+
+            else:
+                generate_report(request_id)
+
+            # ====================================================================
+            # The report becomes the snapshot only once it is complete
+            # ====================================================================
+            with self.scheduler_lock:
+                self.latest_snapshot = {'Request_Id': request_id,
+                                        'Watermark': store_status_watermark,
+                                        'Completed_Timestamp': datetime.utcnow()}
+
+        finally:
+            with self.scheduler_lock:
+                self.running_request_id = None
+                self.last_completed_timestamp = time.time()
+
+    def get_snapshot_staleness(self, latest_snapshot: dict, store_status_watermark: dict) -> dict:
+        """
+            Description: Compares the watermark of the snapshot with the current StoreStatus watermark,
+            the polls that arrived after the snapshot was scheduled are not in it.
+        """
+        try:
+            snapshot_staleness = {'Snapshot_Watermark': latest_snapshot['Watermark'],
+                                  'Current_Watermark': store_status_watermark}
+            if len(store_status_watermark) == 0 or len(latest_snapshot['Watermark']) == 0:
+                return snapshot_staleness
+
+            snapshot_staleness['Is_Snapshot_Current'] = \
+                store_status_watermark['SS_Id'] == latest_snapshot['Watermark']['SS_Id']
+            snapshot_staleness['Snapshot_Lag_In_Seconds'] = max(
+                (datetime.fromisoformat(str(store_status_watermark['SS_TimestampUtc'])) -
+                 datetime.fromisoformat(str(latest_snapshot['Watermark']['SS_TimestampUtc']))).total_seconds(), 0)
+            return snapshot_staleness
+
+        except Exception:
+            raise
@@ -0,0 +1,162 @@
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import numpy
+
+import store_monitoring.configuration as config
+from store_monitoring.CommonEnums import DASResponseFormat, MediaType
+from store_monitoring.ModuleLogger import setup_logger
+
+try:
+    import msgpack
+
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow
+
+except ImportError:
+    pyarrow = None
+
+logger = setup_logger()
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def get_das_response_media_type() -> str:
+    # ====================================================================
+    # msgpack and Arrow need their packages, without them the DAS is asked for JSON
+    # ====================================================================
+    if config.DAS_RESPONSE_FORMAT == DASResponseFormat.MessagePack.value:
+        if msgpack is not None:
+            return MediaType.MessagePack.value
+        logger.warning('DAS_RESPONSE_FORMAT = msgpack needs the msgpack package, '
+                       'install it with pip install store_monitoring[msgpack]')
+
+    elif config.DAS_RESPONSE_FORMAT == DASResponseFormat.Arrow.value:
+        if pyarrow is not None:
+            return MediaType.Arrow.value
+        logger.warning('DAS_RESPONSE_FORMAT = arrow needs the pyarrow package, '
+                       'install it with pip install store_monitoring[arrow]')
+
+    return MediaType.JSON.value
+
+
+def create_accept_header() -> dict:
+    """
+        Description: The Accept header of the DAS reads of StoreStatus rows, a DAS without the format answers with JSON.
+    """
+    media_type = get_das_response_media_type()
+    if media_type == MediaType.JSON.value:
+        return {'Accept': MediaType.JSON.value}
+
+    return {'Accept': f'{media_type}, {MediaType.JSON.value};q=0.5'}
+
+
+def decode_store_status_columns(store_status_columns: dict) -> dict:
+    """
+        Description: This function turns the StoreStatus columns of a msgpack or Arrow response into numpy arrays,
+        SS_TimestampUtc in integer microseconds since the epoch and SS_StoreStatus decoded back to its values.
+    """
+    try:
+        store_status_values = numpy.array(store_status_columns['SS_StoreStatus_Values'], dtype=object)
+        return {'SS_Id': numpy.asarray(store_status_columns['SS_Id'], dtype=numpy.int64),
+                'SD_StoreId': numpy.asarray(store_status_columns['SD_StoreId'], dtype=numpy.int64),
+                'SS_StoreStatus': store_status_values[numpy.asarray(store_status_columns['SS_StoreStatus'],
+                                                                    dtype=numpy.int64)],
+                'SS_TimestampUtc': numpy.asarray(store_status_columns['SS_TimestampUtc'], dtype=numpy.int64)}
+
+    except Exception:
+        raise
+
+
+def count_store_status_rows(store_status_rows) -> int:
+    """
+        Description: The number of StoreStatus rows, given as the list of row dicts of a JSON response or as the
+        columns of a msgpack or Arrow response.
+    """
+    if isinstance(store_status_rows, dict):
+        return len(store_status_rows['SS_Id'])
+
+    return len(store_status_rows)
+
+
+def convert_store_status_columns_to_rows(store_status_rows) -> list:
+    """
+        Description: Returns the StoreStatus rows as the list of row dicts of a JSON response,
+        rows that came as columns get SS_TimestampUtc back as an ISO timestamp.
+    """
+    try:
+        if not isinstance(store_status_rows, dict):
+            return store_status_rows
+
+        return [{'SS_Id': int(ss_id),
+                 'SD_StoreId': int(store_id),
+                 'SS_StoreStatus': store_status,
+                 'SS_TimestampUtc': (EPOCH + timedelta(microseconds=int(timestamp_utc))).isoformat()}
+                for ss_id, store_id, store_status, timestamp_utc in zip(store_status_rows['SS_Id'],
+                                                                        store_status_rows['SD_StoreId'],
+                                                                        store_status_rows['SS_StoreStatus'],
+                                                                        store_status_rows['SS_TimestampUtc'])]
+
+    except Exception:
+        raise
+
+
+def decode_arrow_payload(payload: bytes) -> dict:
+    try:
+        store_status_table = pyarrow.ipc.open_stream(payload).read_all()
+        output_response = json.loads(store_status_table.schema.metadata[b'response'])
+
+        store_status_columns = {
+            'SS_Id': store_status_table.column('SS_Id').to_numpy(),
+            'SD_StoreId': store_status_table.column('SD_StoreId').to_numpy(),
+            'SS_StoreStatus': numpy.asarray(store_status_table.column('SS_StoreStatus').to_pylist(), dtype=object),
+            'SS_TimestampUtc': store_status_table.column('SS_TimestampUtc').to_numpy()}
+
+        if output_response['Columns_Key'] == 'Stores':
+            # ====================================================================
+            # One table for all the stores, split it by SD_StoreId, the rows of a store are contiguous
+            # ====================================================================
+            for store in output_response['Stores']:
+                store_rows = store_status_columns['SD_StoreId'] == int(store['StoreId'])
+                store['Rows'] = {column: values[store_rows] for column, values in store_status_columns.items()}
+
+        else:
+            output_response[output_response['Columns_Key']] = store_status_columns
+
+        return output_response
+
+    except Exception:
+        raise
+
+
+def decode_das_response(das_response: httpx.Response) -> dict:
+    """
+        Description: This function decodes a DAS response by its content type. The StoreStatus rows of a msgpack or
+        Arrow response are numpy arrays, see decode_store_status_columns, the rest of the response is as in JSON.
+    """
+    try:
+        content_type = das_response.headers.get('content-type', '')
+
+        if content_type.startswith(MediaType.MessagePack.value):
+            output_response = msgpack.unpackb(das_response.content)
+            if output_response.get('Columns_Key') == 'Stores':
+                for store in output_response.get('Stores', []):
+                    store['Rows'] = decode_store_status_columns(store['Rows'])
+
+            elif output_response.get('Columns_Key') in output_response:
+                output_response[output_response['Columns_Key']] = decode_store_status_columns(
+                    output_response[output_response['Columns_Key']])
+
+            return output_response
+
+        if content_type.startswith(MediaType.Arrow.value):
+            return decode_arrow_payload(das_response.content)
+
+        return das_response.json()
+
+    except Exception:
+        raise
@@ -3,21 +3,35 @@ Author: Lav Sharma
 Created on: 29th Oct 2023
 """
 
+import json
 import logging
-import threading
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Optional
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 import store_monitoring.configuration as config
 from store_monitoring import __appname__, __version__, __description__
-from store_monitoring.CommonEnums import RequestLifeCycle
-from store_monitoring.DASHelper import create_request, read_request, update_request
-from store_monitoring.Helper import read_csv_file
-from store_monitoring.entity.Models import HeartbeatResult
+from store_monitoring.CommonEnums import RequestLifeCycle, ReportType
+from store_monitoring.DASClient import close_async_das_client
+from store_monitoring.DASHelper import read_request, update_request, create_request_async, read_request_async, \
+    update_request_async, create_store_group_async
+from store_monitoring.Helper import read_csv_file, read_store_group_wrapper_async, \
+    read_store_status_watermark_wrapper_async
+from store_monitoring.entity.Models import HeartbeatResult, ShardRequest, StoreGroupRequest
 from store_monitoring.ModuleLogger import setup_logger
-from store_monitoring.processing.GenerateReport import generate_report
+from store_monitoring.processing.GenerateReport import generate_report, explain_report, compute_shard_report, \
+    complete_request, fail_request
+from store_monitoring.processing.ReportCheckpoint import list_checkpoints, remove_checkpoint, create_report_arguments, \
+    save_submitted_report
+from store_monitoring.processing.UptimeIndex import parse_report_windows
+from store_monitoring.ReportCoalescer import ReportCoalescer, create_coalescing_key
+from store_monitoring.ReportExecutor import ReportExecutor, classify_report_lane
+from store_monitoring.ReportScheduler import ReportScheduler
 
 logger = setup_logger()
 
@@ -25,7 +39,13 @@ logger = setup_logger()
 class StoreMonitoring:
     def __init__(self, appname, version, description):
         try:
-            self.app = FastAPI(title=appname, version=version, description=description)
+            self.app = FastAPI(title=appname, version=version, description=description, lifespan=self.lifespan)
+            self.report_executor = ReportExecutor(config.REPORT_EXECUTOR_WORKERS,
+                                                  config.REPORT_EXECUTOR_QUEUE_SIZE,
+                                                  config.REPORT_EXECUTOR_FAST_LANE_WORKERS,
+                                                  config.REPORT_EXECUTOR_FAST_LANE_QUEUE_SIZE,
+                                                  self.record_report_started)
+            self.report_coalescer = ReportCoalescer()
             self.app.add_middleware(
                 CORSMiddleware,
                 allow_origins=config.ORIGINS,
@@ -34,10 +54,91 @@ class StoreMonitoring:
                 allow_headers=config.ALLOW_HEADERS,
             )
             self.add_routes()
+            self.resume_interrupted_reports()
+            self.report_scheduler = ReportScheduler(self.report_executor, self.report_coalescer)
 
         except Exception as error:
             logging.error(f'Exception - {str(error)}', exc_info=True)
 
+    @asynccontextmanager
+    async def lifespan(self, app: FastAPI):
+        yield
+
+        # ===================================================================
+        # Close the pooled DAS connections of the API handlers
+        # ===================================================================
+        await close_async_das_client()
+
+    def resume_interrupted_reports(self):
+        try:
+            # ===================================================================
+            # A checkpoint left on disk belongs to a report that was queued or running when the process stopped,
+            # or to a completed report whose attached requests were not completed yet
+            # ===================================================================
+            for request_id, checkpoint in list_checkpoints().items():
+                read_request_response = read_request(request_id)
+                request_row = read_request_response.get('Row', dict())
+                request_status = request_row.get('RS_Id')
+                attached_request_ids = checkpoint.get('Attached_Request_Ids', [])
+                report_arguments = checkpoint.get('Arguments')
+
+                if request_status == RequestLifeCycle.Processing_Completed.value and \
+                        request_row.get('R_OutputFilePath') is not None:
+                    for attached_request_id in attached_request_ids:
+                        complete_request(attached_request_id, request_row['R_OutputFilePath'])
+                    logger.info(f'Removed the checkpoint of completed request_id - {str(request_id)}, '
+                                f'{str(len(attached_request_ids))} attached requests completed')
+                    remove_checkpoint(request_id)
+                    continue
+
+                if request_status not in (RequestLifeCycle.Request_Sent_For_Processing.value,
+                                          RequestLifeCycle.Processing_Request.value) or report_arguments is None:
+                    self.fail_interrupted_report(request_id, request_status, attached_request_ids)
+                    continue
+
+                # ===================================================================
+                # Resume through the ReportCoalescer, the attached requests get the output file of the report
+                # ===================================================================
+                as_of = datetime.fromisoformat(report_arguments['As_Of']) if report_arguments['As_Of'] else None
+                store_ids = report_arguments.get('Store_Ids')
+                coalescing_key = ('Resumed', request_id)
+                self.report_coalescer.reattach(coalescing_key, request_id, attached_request_ids)
+                is_submitted = self.report_executor.submit(
+                    request_id, self.report_coalescer.run_report,
+                    (coalescing_key, request_id, generate_report,
+                     (request_id, as_of, report_arguments['Windows'], report_arguments['Report_Type'], store_ids)),
+                    classify_report_lane(len(store_ids) if store_ids is not None else None))
+
+                if is_submitted:
+                    logger.info(f'Resuming request_id - {str(request_id)} from its checkpoint, '
+                                f'{str(len(attached_request_ids))} attached requests')
+
+                else:
+                    self.report_coalescer.detach_all(coalescing_key, request_id)
+                    logger.warning(f'Report queue is full, request_id - {str(request_id)} is not resumed')
+                    self.fail_interrupted_report(request_id, request_status, attached_request_ids)
+
+        except Exception as error:
+            logging.error(f'Exception - {str(error)}', exc_info=True)
+
+    def fail_interrupted_report(self, request_id: int, request_status: int, attached_request_ids: list):
+        try:
+            # ===================================================================
+            # A request that cannot be resumed is closed with its attached requests, none is left in processing
+            # ===================================================================
+            if request_status in (RequestLifeCycle.Request_Sent_For_Processing.value,
+                                  RequestLifeCycle.Processing_Request.value):
+                fail_request(request_id)
+            for attached_request_id in attached_request_ids:
+                fail_request(attached_request_id)
+
+            logger.info(f'Removed the checkpoint of request_id - {str(request_id)}, RS_Id - {str(request_status)}, '
+                        f'{str(len(attached_request_ids))} attached requests failed')
+            remove_checkpoint(request_id)
+
+        except Exception:
+            raise
+
     def add_routes(self):
         @self.app.get('/healthcheck', tags=["Heartbeat"])
         async def get_heartbeat():
@@ -59,35 +160,161 @@ class StoreMonitoring:
                 logging.error(f'Exception - {str(error)}', exc_info=True)
 
         @self.app.get('/trigger_report', tags=['Store Monitoring'])
-        async def trigger_report() -> dict:
+        async def trigger_report(response: Response,
+                                 as_of: Optional[datetime] = None,
+                                 windows: Optional[List[str]] = Query(None),
+                                 dry_run: bool = False,
+                                 report_type: ReportType = ReportType.Uptime_And_Downtime,
+                                 priority: int = 0,
+                                 force_refresh: bool = False,
+                                 store_ids: Optional[List[int]] = Query(None),
+                                 store_group: Optional[str] = None) -> dict:
             """
             This API is used to trigger the report generation.
             It is used to generate the report for the restaurants up-time and down-time.
+            as_of (UTC if no offset is given) and windows (e.g. 1h, 1d, 7d, 30d, mtd) are optional,
+            by default the windows end at the last poll of every store.
+            With dry_run the plan of the report and its estimated cost are returned, no report is generated.
+            report_type hourly gives the uptime and downtime minutes per store and local hour of the last 7 days.
+            Reports run in the fast lane (a few stores) or the bulk lane (full fleet), higher priority first.
+            If the queue of the lane is full the request is rejected with HTTP 429.
+            A request identical to a queued or running report (same type, windows, as_of and data watermark)
+            attaches to it and shares its output file.
+            The default report is answered right away with the last report completed by the scheduler,
+            force_refresh computes a new one.
+            store_ids or a store_group saved with /store_group/{store_group_name} scope the report to those stores,
+            only they are read and computed.
             """
             try:
+                # ===================================================================
+                # Resolve the scope of the report, None is the whole fleet
+                # ===================================================================
+                if store_ids is not None and store_group is not None:
+                    return {'Message': 'Give either store_ids or store_group, not both'}
+
+                if store_group is not None:
+                    store_ids = await read_store_group_wrapper_async(store_group)
+                    if len(store_ids) == 0:
+                        return {'Message': f'Store group {str(store_group)} not found'}
+
+                if store_ids is not None:
+                    store_ids = list(dict.fromkeys(store_ids))
+
+                # ===================================================================
+                # Validate the windows before creating the request
+                # ===================================================================
+                if windows is not None:
+                    try:
+                        parse_report_windows(windows)
+
+                    except ValueError as window_error:
+                        return {'Message': str(window_error)}
+
+                if dry_run:
+                    # ===================================================================
+                    # Explain the plan of the engine the report would run on, without creating a request
+                    # ===================================================================
+                    return {'Plan': await run_in_threadpool(explain_report, store_ids, as_of, windows,
+                                                            report_type.value)}
+
+                # ===================================================================
+                # The default report was precomputed by the scheduler, answer with the latest snapshot
+                # ===================================================================
+                if not force_refresh and as_of is None and windows is None and store_ids is None and \
+                        report_type == ReportType.Uptime_And_Downtime:
+                    latest_snapshot = self.report_scheduler.get_latest_snapshot()
+                    if latest_snapshot is not None:
+                        store_status_watermark = await read_store_status_watermark_wrapper_async()
+                        return {'report_id': latest_snapshot['Request_Id'],
+                                'Snapshot_Completed_Timestamp': latest_snapshot['Completed_Timestamp'],
+                                **self.report_scheduler.get_snapshot_staleness(latest_snapshot,
+                                                                               store_status_watermark)}
+
+                # ===================================================================
+                # An identical report that is already queued or running does not need room in the queue
+                # ===================================================================
+                store_status_watermark = await read_store_status_watermark_wrapper_async() \
+                    if config.REPORT_COALESCING else dict()
+                coalescing_key = create_coalescing_key(report_type.value, windows, as_of, store_ids,
+                                                       store_status_watermark)
+                is_coalescable = coalescing_key is not None and \
+                    self.report_coalescer.get_running_request_id(coalescing_key) is not None
+
+                report_lane = classify_report_lane(len(store_ids) if store_ids is not None else None)
+                if not is_coalescable and self.report_executor.is_full(report_lane):
+                    response.status_code = 429
+                    return {'Message': 'Report queue is full, try again later'}
+
                 # ===================================================================
                 # Create entry in the Request table
                 # ===================================================================
-                create_request_response = create_request()
+                create_request_response = await create_request_async()
                 if 'ResponseCode' in create_request_response and create_request_response['HttpResponseCode'] == 200:
                     if 'HttpResponseCode' in create_request_response and create_request_response[
                         'ResponseCode'] == 2000:
 
                         # ===================================================================
-                        # Process the request on a different thread
+                        # Update RequestStatus in the DB, before a worker can pick the request up
                         # ===================================================================
-                        generate_report_obj = threading.Thread(
-                            target=generate_report, args=(create_request_response['R_Id'],))
-                        generate_report_obj.start()
+                        await update_request_async(
+                            request_id=create_request_response['R_Id'],
+                            update_row_column_name='RS_Id',
+                            update_row_column_value=RequestLifeCycle.Request_Sent_For_Processing.value)
+                        logger.info(f'Updated RS_Id as {str(RequestLifeCycle.Request_Sent_For_Processing.value)} '
+                                    f'for request_id - {str(create_request_response["R_Id"])}')
+
+                        await update_request_async(request_id=create_request_response['R_Id'],
+                                                   update_row_column_name='R_Lane',
+                                                   update_row_column_value=report_lane)
+
+                        report_args = (create_request_response['R_Id'], as_of, windows, report_type.value, store_ids)
+                        if coalescing_key is not None:
+                            # ===================================================================
+                            # Attach to the identical report, or become the report others attach to
+                            # ===================================================================
+                            running_request_id = self.report_coalescer.attach(coalescing_key,
+                                                                              create_request_response['R_Id'])
+                            if running_request_id is not None:
+                                await update_request_async(request_id=create_request_response['R_Id'],
+                                                           update_row_column_name='R_CoalescedWithRequestId',
+                                                           update_row_column_value=running_request_id)
+                                return {'report_id': create_request_response['R_Id']}
+
+                            report_target = self.report_coalescer.run_report
+                            report_args = (coalescing_key, create_request_response['R_Id'], generate_report,
+                                           report_args)
+
+                        else:
+                            report_target = generate_report
 
                         # ===================================================================
-                        # Update RequestStatus in the DB
+                        # Checkpoint the queued request, a restart resumes it even before a worker picked it up
                         # ===================================================================
-                        update_request(request_id=create_request_response['R_Id'],
-                                       update_row_column_name='RS_Id',
-                                       update_row_column_value=RequestLifeCycle.Processing_Request.value)
-                        logger.info(f'Updated RS_Id as {str(RequestLifeCycle.Processing_Request.value)} '
-                                    f'for request_id - {str(create_request_response["R_Id"])}')
+                        await run_in_threadpool(save_submitted_report, create_request_response['R_Id'],
+                                                create_report_arguments(as_of, windows, report_type.value, store_ids))
+
+                        # ===================================================================
+                        # Queue the request for the report workers
+                        # ===================================================================
+                        is_submitted = self.report_executor.submit(create_request_response['R_Id'], report_target,
+                                                                   report_args, report_lane, priority)
+
+                        if not is_submitted:
+                            # ===================================================================
+                            # The queue filled up after the check, close the request and the attached ones
+                            # ===================================================================
+                            await update_request_async(
+                                request_id=create_request_response['R_Id'],
+                                update_row_column_name='RS_Id',
+                                update_row_column_value=RequestLifeCycle.Error_In_Processing_Request.value)
+                            if coalescing_key is not None:
+                                await run_in_threadpool(self.report_coalescer.fail_report, coalescing_key,
+                                                        create_request_response['R_Id'])
+                            remove_checkpoint(create_request_response['R_Id'])
+
+                            response.status_code = 429
+                            return {'Message': 'Report queue is full, try again later'}
+
                         return {'report_id': create_request_response['R_Id']}
 
                     else:
@@ -99,6 +326,30 @@ class StoreMonitoring:
             except Exception as error:
                 logging.error(f'Exception - {str(error)}', exc_info=True)
 
+        @self.app.post('/store_group/{store_group_name}', tags=['Store Monitoring'])
+        async def save_store_group(store_group_name: str,
+                                   store_group_request: StoreGroupRequest) -> dict:
+            """
+            This API is used to save a named group of store_ids in the DAS, an existing group is replaced.
+            /trigger_report?store_group={store_group_name} generates the report of only these stores.
+            """
+            try:
+                if len(store_group_request.store_ids) == 0:
+                    return {'Message': 'A store group needs at least one store_id'}
+
+                create_store_group_response = await create_store_group_async(
+                    store_group_name, list(dict.fromkeys(store_group_request.store_ids)))
+                if create_store_group_response.get('HttpResponseCode') == 200 and \
+                        create_store_group_response.get('ResponseCode') == 2000:
+                    return {'Message': 'Store group saved',
+                            'Store_Group': store_group_name,
+                            'Stores': len(set(store_group_request.store_ids))}
+
+                return {'Message': 'Error in saving store group'}
+
+            except Exception as error:
+                logging.error(f'Exception - {str(error)}', exc_info=True)
+
         @self.app.post('/get_report/{report_id}', tags=['Store Monitoring'])
         async def get_report(report_id: int):
             """
@@ -108,7 +359,14 @@ class StoreMonitoring:
                 # ===================================================================
                 # Read the status of the report from the Request table
                 # ===================================================================
-                read_request_response = read_request(report_id)
+                read_request_response = await read_request_async(report_id)
+
+                # ===================================================================
+                # Queue depth, queue wait and run time of the request, if it was queued by this process
+                # ===================================================================
+                request_statistics = self.report_executor.get_request_statistics(report_id)
+                if request_statistics is None:
+                    request_statistics = dict()
 
                 # ===================================================================
                 # Check the status
@@ -117,30 +375,70 @@ class StoreMonitoring:
 
                     if 'RS_Id' in read_request_response['Row'] and read_request_response['Row'][
                         'RS_Id'] == RequestLifeCycle.Request_Received.value:
-                        return {'Message': 'Request received'}
+                        return {'Message': 'Request received', **request_statistics}
 
                     elif 'RS_Id' in read_request_response['Row'] and read_request_response['Row'][
                         'RS_Id'] == RequestLifeCycle.Request_Sent_For_Processing.value:
-                        return {'Message': 'Request sent for processing'}
+                        return {'Message': 'Request sent for processing', **request_statistics}
 
                     elif 'RS_Id' in read_request_response['Row'] and read_request_response['Row'][
                         'RS_Id'] == RequestLifeCycle.Processing_Request.value:
-                        return {'Message': 'Processing'}
+                        if read_request_response['Row'].get('R_ShardProgress') is not None:
+                            # ===================================================================
+                            # A sharded report also gives the status of every shard
+                            # ===================================================================
+                            return {'Message': 'Processing',
+                                    'Shard_Progress': json.loads(read_request_response['Row']['R_ShardProgress']),
+                                    **request_statistics}
+
+                        return {'Message': 'Processing', **request_statistics}
 
                     elif 'RS_Id' in read_request_response['Row'] and read_request_response['Row'][
                         'RS_Id'] == RequestLifeCycle.Error_In_Processing_Request.value:
-                        return {'Message': 'Error in processing request'}
+                        return {'Message': 'Error in processing request', **request_statistics}
 
                     elif 'RS_Id' in read_request_response['Row'] and read_request_response['Row'][
                         'RS_Id'] == RequestLifeCycle.Processing_Completed.value:
                         if 'R_OutputFilePath' in read_request_response['Row']:
                             output_file_path = read_request_response['Row']['R_OutputFilePath']
-                            csv_data = read_csv_file(output_file_path)
+                            csv_data = await run_in_threadpool(read_csv_file, output_file_path)
                             return {'Message': 'Completed',
-                                    'CSV_Output': csv_data}
+                                    'CSV_Output': csv_data,
+                                    **request_statistics}
+
+            except Exception as error:
+                logging.error(f'Exception - {str(error)}', exc_info=True)
+
+        @self.app.post('/shard/compute', tags=['Shard'])
+        def compute_shard(shard_request: ShardRequest) -> dict:
+            """
+            This API is called by the coordinator of a sharded report (SHARD_WORKER_URLS).
+            It computes the partial report of the given store_ids and returns its columns and rows.
+            """
+            try:
+                logger.info(f'Computing shard {str(shard_request.shard_index)} of request_id - '
+                            f'{str(shard_request.request_id)}, StoreIds - {str(len(shard_request.store_ids))}')
+                shard_report = compute_shard_report(shard_request.store_ids, shard_request.as_of,
+                                                    shard_request.windows, shard_request.report_type)
+                return {'Shard_Index': shard_request.shard_index, **shard_report}
 
             except Exception as error:
                 logging.error(f'Exception - {str(error)}', exc_info=True)
+                raise error
+
+    def record_report_started(self, request_id: int, report_lane: str, queue_wait_in_seconds: float):
+        try:
+            # ===================================================================
+            # Update the queue wait of the request in the DB, when a worker picks it up
+            # ===================================================================
+            update_request(request_id=request_id,
+                           update_row_column_name='R_QueueWaitInMilliseconds',
+                           update_row_column_value=int(queue_wait_in_seconds * 1000))
+            logger.info(f'Updated R_QueueWaitInMilliseconds as {str(int(queue_wait_in_seconds * 1000))} '
+                        f'for request_id - {str(request_id)}, lane - {str(report_lane)}')
+
+        except Exception as error:
+            logging.error(f'Exception - {str(error)}', exc_info=True)
 
     def run(self, host, port):
         try:
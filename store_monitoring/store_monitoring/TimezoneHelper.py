@@ -0,0 +1,73 @@
+import functools
+from datetime import datetime
+
+import numpy
+import pytz
+
+MICROSECONDS_IN_SECOND = 1000000
+EPOCH = datetime(1970, 1, 1)
+
+
+@functools.lru_cache(maxsize=None)
+def get_timezone_transitions(store_timezone: str) -> tuple:
+    """
+        Description: This function returns the UTC transition times (epoch seconds) of a timezone and the
+        UTC offset (seconds) in effect from each transition, DST included.
+        The tables are computed once per timezone and cached for the lifetime of the process.
+    """
+    try:
+        timezone = pytz.timezone(store_timezone)
+        utc_transition_times = getattr(timezone, '_utc_transition_times', None)
+
+        if not utc_transition_times:
+            # ====================================================================
+            # Timezone without transitions, the offset never changes
+            # ====================================================================
+            utc_offset = timezone.utcoffset(EPOCH)
+            return (numpy.array([numpy.iinfo(numpy.int64).min], dtype=numpy.int64),
+                    numpy.array([int(utc_offset.total_seconds())], dtype=numpy.int64))
+
+        transition_times = numpy.array([int((transition_time - EPOCH).total_seconds())
+                                        for transition_time in utc_transition_times], dtype=numpy.int64)
+        utc_offsets = numpy.array([int(transition_info[0].total_seconds())
+                                   for transition_info in timezone._transition_info], dtype=numpy.int64)
+        return transition_times, utc_offsets
+
+    except Exception:
+        raise
+
+
+def get_utc_offsets(utc_seconds: numpy.ndarray,
+                    store_timezone: str) -> numpy.ndarray:
+    try:
+        # ====================================================================
+        # Find the last transition at or before every timestamp
+        # ====================================================================
+        transition_times, utc_offsets = get_timezone_transitions(store_timezone)
+        transition_index = numpy.searchsorted(transition_times, utc_seconds, side='right') - 1
+        return utc_offsets[numpy.maximum(transition_index, 0)]
+
+    except Exception:
+        raise
+
+
+def convert_utc_to_local_seconds(utc_seconds: numpy.ndarray,
+                                 store_timezone: str) -> numpy.ndarray:
+    try:
+        return utc_seconds + get_utc_offsets(utc_seconds, store_timezone)
+
+    except Exception:
+        raise
+
+
+def convert_utc_to_local_microseconds(utc_microseconds: numpy.ndarray,
+                                      store_timezone: str) -> numpy.ndarray:
+    try:
+        # ====================================================================
+        # Transitions fall on whole seconds, the floored second gives the offset
+        # ====================================================================
+        utc_offsets = get_utc_offsets(utc_microseconds // MICROSECONDS_IN_SECOND, store_timezone)
+        return utc_microseconds + utc_offsets * MICROSECONDS_IN_SECOND
+
+    except Exception:
+        raise
@@ -49,6 +49,10 @@ if 'GENERAL' in config_sections:
     ORDER_FOR_READING_STORE_DETAILS = str(lobj_config['GENERAL']['ORDER_FOR_READING_STORE_DETAILS'])
     ORDER_FOR_READING_STORE_STATUS = str(lobj_config['GENERAL']['ORDER_FOR_READING_STORE_STATUS'])
 
+    REPORT_ENGINE = str(lobj_config['GENERAL']['REPORT_ENGINE'])
+    REPORT_EXECUTION_MODE = str(lobj_config['GENERAL']['REPORT_EXECUTION_MODE'])
+    DEFAULT_REPORT_WINDOWS = eval(lobj_config['GENERAL']['DEFAULT_REPORT_WINDOWS'])
+
 # ===================================================================
 # Check if the ENVIRONMENT section is present in the config.ini
 # ===================================================================
@@ -71,6 +75,52 @@ if 'ENVIRONMENT' in config_sections:
                                                                  'WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS'])
     MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS = int(lobj_config['ENVIRONMENT'][
                                                                      'MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS'])
+    DAS_CLIENT_MAX_CONNECTIONS = int(lobj_config['ENVIRONMENT']['DAS_CLIENT_MAX_CONNECTIONS'])
+    DAS_CLIENT_MAX_KEEPALIVE_CONNECTIONS = int(lobj_config['ENVIRONMENT']['DAS_CLIENT_MAX_KEEPALIVE_CONNECTIONS'])
+    DAS_CLIENT_KEEPALIVE_EXPIRY_IN_SECONDS = int(lobj_config['ENVIRONMENT']['DAS_CLIENT_KEEPALIVE_EXPIRY_IN_SECONDS'])
+    DAS_CLIENT_TIMEOUT_IN_SECONDS = int(lobj_config['ENVIRONMENT']['DAS_CLIENT_TIMEOUT_IN_SECONDS'])
+    DAS_CLIENT_CONNECT_TIMEOUT_IN_SECONDS = int(lobj_config['ENVIRONMENT']['DAS_CLIENT_CONNECT_TIMEOUT_IN_SECONDS'])
+    DAS_CLIENT_HTTP2 = eval(lobj_config['ENVIRONMENT']['DAS_CLIENT_HTTP2'])
+    DAS_CLIENT_GZIP = eval(lobj_config['ENVIRONMENT']['DAS_CLIENT_GZIP'])
+
+    REPORT_PROCESS_POOL_WORKERS = int(lobj_config['ENVIRONMENT']['REPORT_PROCESS_POOL_WORKERS'])
+    REPORT_STORE_CHUNK_SIZE = int(lobj_config['ENVIRONMENT']['REPORT_STORE_CHUNK_SIZE'])
+    FLEET_REPORT_BATCH_SIZE = int(lobj_config['ENVIRONMENT']['FLEET_REPORT_BATCH_SIZE'])
+    DUCKDB_THREADS = int(lobj_config['ENVIRONMENT']['DUCKDB_THREADS'])
+    PREFETCH_DEPTH = int(lobj_config['ENVIRONMENT']['PREFETCH_DEPTH'])
+    STORE_STATUS_BATCH_SIZE = int(lobj_config['ENVIRONMENT']['STORE_STATUS_BATCH_SIZE'])
+    DAS_FETCH_MODE = str(lobj_config['ENVIRONMENT']['DAS_FETCH_MODE'])
+    STORE_STATUS_EXPORT_FORMAT = str(lobj_config['ENVIRONMENT']['STORE_STATUS_EXPORT_FORMAT'])
+    DAS_RESPONSE_FORMAT = str(lobj_config['ENVIRONMENT']['DAS_RESPONSE_FORMAT'])
+    STORE_RESULT_CACHE_SIZE = int(lobj_config['ENVIRONMENT']['STORE_RESULT_CACHE_SIZE'])
+    STORE_RESULT_CACHE_PATH = str(lobj_config['ENVIRONMENT']['STORE_RESULT_CACHE_PATH'])
+    STORE_RESULT_CACHE_DISK_SIZE = int(lobj_config['ENVIRONMENT']['STORE_RESULT_CACHE_DISK_SIZE'])
+
+    REPORT_EXECUTOR_WORKERS = int(lobj_config['ENVIRONMENT']['REPORT_EXECUTOR_WORKERS'])
+    REPORT_EXECUTOR_QUEUE_SIZE = int(lobj_config['ENVIRONMENT']['REPORT_EXECUTOR_QUEUE_SIZE'])
+    REPORT_EXECUTOR_FAST_LANE_WORKERS = int(lobj_config['ENVIRONMENT']['REPORT_EXECUTOR_FAST_LANE_WORKERS'])
+    REPORT_EXECUTOR_FAST_LANE_QUEUE_SIZE = int(lobj_config['ENVIRONMENT']['REPORT_EXECUTOR_FAST_LANE_QUEUE_SIZE'])
+    FAST_LANE_MAXIMUM_STORES = int(lobj_config['ENVIRONMENT']['FAST_LANE_MAXIMUM_STORES'])
+    REPORT_COALESCING = eval(lobj_config['ENVIRONMENT']['REPORT_COALESCING'])
+    REPORT_SCHEDULER_CHECK_IN_SECONDS = int(lobj_config['ENVIRONMENT']['REPORT_SCHEDULER_CHECK_IN_SECONDS'])
+    REPORT_SCHEDULER_INTERVAL_IN_SECONDS = int(lobj_config['ENVIRONMENT']['REPORT_SCHEDULER_INTERVAL_IN_SECONDS'])
+    REPORT_SCHEDULER_MINIMUM_GAP_IN_SECONDS = int(lobj_config['ENVIRONMENT']['REPORT_SCHEDULER_MINIMUM_GAP_IN_SECONDS'])
+
+    SHARD_WORKER_URLS = eval(lobj_config['ENVIRONMENT']['SHARD_WORKER_URLS'])
+    SHARD_PARTITIONING = str(lobj_config['ENVIRONMENT']['SHARD_PARTITIONING'])
+    SHARD_TIMEOUT_IN_SECONDS = int(lobj_config['ENVIRONMENT']['SHARD_TIMEOUT_IN_SECONDS'])
+
+    PLANNER_COST_PER_WINDOW = float(lobj_config['ENVIRONMENT']['PLANNER_COST_PER_WINDOW'])
+    PLANNER_PYTHON_COST_PER_STORE = float(lobj_config['ENVIRONMENT']['PLANNER_PYTHON_COST_PER_STORE'])
+    PLANNER_PYTHON_COST_PER_POLL = float(lobj_config['ENVIRONMENT']['PLANNER_PYTHON_COST_PER_POLL'])
+    PLANNER_VECTORIZED_COST_PER_STORE = float(lobj_config['ENVIRONMENT']['PLANNER_VECTORIZED_COST_PER_STORE'])
+    PLANNER_VECTORIZED_COST_PER_POLL = float(lobj_config['ENVIRONMENT']['PLANNER_VECTORIZED_COST_PER_POLL'])
+    PLANNER_FLEET_COST_PER_BATCH = float(lobj_config['ENVIRONMENT']['PLANNER_FLEET_COST_PER_BATCH'])
+    PLANNER_FLEET_COST_PER_STORE = float(lobj_config['ENVIRONMENT']['PLANNER_FLEET_COST_PER_STORE'])
+    PLANNER_FLEET_COST_PER_POLL = float(lobj_config['ENVIRONMENT']['PLANNER_FLEET_COST_PER_POLL'])
 
     OUTPUT_CSV_PATH = str(lobj_config['ENVIRONMENT']['OUTPUT_CSV_PATH'])
+    CHECKPOINT_PATH = str(lobj_config['ENVIRONMENT']['CHECKPOINT_PATH'])
+    CHECKPOINT_INTERVAL_IN_SECONDS = int(lobj_config['ENVIRONMENT']['CHECKPOINT_INTERVAL_IN_SECONDS'])
+    STREAMING_WRITER_BUFFER_ROWS = int(lobj_config['ENVIRONMENT']['STREAMING_WRITER_BUFFER_ROWS'])
     LOGGING_LEVEL = str(lobj_config['ENVIRONMENT']['LOGGING_LEVEL'])
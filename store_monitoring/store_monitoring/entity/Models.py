@@ -3,8 +3,24 @@ Author: Lav Sharma
 Created on: 29th Oct 2023
 """
 
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
 class HeartbeatResult(BaseModel):
     is_alive: bool
+
+
+class StoreGroupRequest(BaseModel):
+    store_ids: List[int]
+
+
+class ShardRequest(BaseModel):
+    request_id: int
+    shard_index: int
+    store_ids: list
+    as_of: Optional[datetime] = None
+    windows: Optional[List[str]] = None
+    report_type: str = 'uptime_and_downtime'
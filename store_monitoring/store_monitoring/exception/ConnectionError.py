@@ -3,6 +3,7 @@ Author: Lav Sharma
 Created on: 29th Oct 2023
 """
 
+import httpx
 import requests
 
 
@@ -10,7 +11,7 @@ def retry_if_connection_error(exception: Exception):
     """
         Return True when there is a ConnectionError i.e. the URL is not accessible
     """
-    is_connection_error = isinstance(exception, requests.exceptions.RequestException)
+    is_connection_error = isinstance(exception, (requests.exceptions.RequestException, httpx.TransportError))
 
     if is_connection_error:
         return True
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import numpy
+
+SECONDS_IN_DAY = 86400
+SECONDS_IN_WEEK = 7 * SECONDS_IN_DAY
+
+
+def convert_time_to_seconds(time_value: str) -> int:
+    try:
+        parsed_time = datetime.strptime(time_value, '%H:%M:%S').time()
+        return parsed_time.hour * 3600 + parsed_time.minute * 60 + parsed_time.second
+
+    except Exception:
+        raise
+
+
+def compile_business_hours(store_details: list) -> tuple:
+    """
+        Description: This function compiles the StoreDetails rows of a store into sorted, non-overlapping
+        second-of-week intervals [start, end] (0 = Monday 00:00:00).
+        Every row of a Day is a window, an EndTime before the StartTime means the window crosses midnight.
+        If no rows are given the store is open 24*7 and the whole week is one window.
+    """
+    try:
+        if len(store_details) == 0:
+            return numpy.array([0], dtype=numpy.int64), numpy.array([SECONDS_IN_WEEK - 1], dtype=numpy.int64)
+
+        windows = []
+        for store_day_details in store_details:
+            day_start = int(store_day_details['SD_Day']) * SECONDS_IN_DAY
+            window_start = day_start + convert_time_to_seconds(store_day_details['SD_StartTimeLocal'])
+            window_end = day_start + convert_time_to_seconds(store_day_details['SD_EndTimeLocal'])
+
+            if window_end < window_start:
+                # ====================================================================
+                # The window crosses midnight, it ends on the next Day
+                # ====================================================================
+                window_end += SECONDS_IN_DAY
+
+            if window_end >= SECONDS_IN_WEEK:
+                # ====================================================================
+                # Sunday night window, split it at the end of the week
+                # ====================================================================
+                windows.append((window_start, SECONDS_IN_WEEK - 1))
+                windows.append((0, window_end - SECONDS_IN_WEEK))
+
+            else:
+                windows.append((window_start, window_end))
+
+        # ====================================================================
+        # Merge overlapping and adjacent windows
+        # ====================================================================
+        merged_windows = []
+        for window_start, window_end in sorted(windows):
+            if len(merged_windows) > 0 and window_start <= merged_windows[-1][1] + 1:
+                merged_windows[-1][1] = max(merged_windows[-1][1], window_end)
+
+            else:
+                merged_windows.append([window_start, window_end])
+
+        merged_windows = numpy.array(merged_windows, dtype=numpy.int64)
+        return merged_windows[:, 0], merged_windows[:, 1]
+
+    except Exception:
+        raise
+
+
+def combine_business_hours(store_business_hours: list) -> tuple:
+    """
+        Description: This function combines the compiled business hours of several stores into one index.
+        The windows of the store at position i are shifted by i weeks, look them up with
+        store_index * SECONDS_IN_WEEK + seconds_of_week.
+    """
+    try:
+        week_offsets = numpy.arange(len(store_business_hours), dtype=numpy.int64) * SECONDS_IN_WEEK
+        window_starts = numpy.concatenate([window_start + week_offset for (window_start, _), week_offset
+                                           in zip(store_business_hours, week_offsets)])
+        window_ends = numpy.concatenate([window_end + week_offset for (_, window_end), week_offset
+                                         in zip(store_business_hours, week_offsets)])
+        return window_starts, window_ends
+
+    except Exception:
+        raise
+
+
+def locate_business_hours(business_hours: tuple,
+                          seconds_of_week: numpy.ndarray) -> tuple:
+    """
+        Description: This function looks up every second_of_week in the compiled business hours.
+        Returns whether it is within business hours, the index and the start of its window.
+    """
+    try:
+        window_starts, window_ends = business_hours
+
+        window_index = numpy.searchsorted(window_starts, seconds_of_week, side='right') - 1
+        clipped_window_index = numpy.maximum(window_index, 0)
+        within_business_hours = (window_index >= 0) & (seconds_of_week <= window_ends[clipped_window_index])
+
+        return within_business_hours, window_index, window_starts[clipped_window_index]
+
+    except Exception:
+        raise
@@ -0,0 +1,134 @@
+import numpy
+import pandas
+
+import store_monitoring.configuration as config
+from store_monitoring.Helper import time_it
+from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.processing.BusinessHours import SECONDS_IN_DAY, SECONDS_IN_WEEK
+from store_monitoring.processing.FleetReport import load_store_batch
+from store_monitoring.processing.Vectorized import MICROSECONDS_IN_SECOND, MICROSECONDS_IN_DAY, REPORT_COLUMNS
+
+try:
+    import duckdb
+
+except ImportError:
+    duckdb = None
+
+logger = setup_logger()
+
+# ====================================================================
+# The whole report as one query, mirrors calculate_uptime_and_downtime_for_stores of the vectorized engine
+# ====================================================================
+REPORT_QUERY = f"""
+WITH local_polls AS (
+    SELECT Row_Position, Store_Index, Store_Status,
+           Local_Microseconds // {MICROSECONDS_IN_DAY} AS Local_Date,
+           (Local_Microseconds - (Local_Microseconds // {MICROSECONDS_IN_DAY}) * {MICROSECONDS_IN_DAY})
+               // {MICROSECONDS_IN_SECOND} AS Time_Of_Day,
+           Store_Index * {SECONDS_IN_WEEK} + ((Local_Microseconds // {MICROSECONDS_IN_DAY} + 3) % 7) * {SECONDS_IN_DAY}
+               AS Start_Of_Day
+    FROM polls
+),
+business_hours_polls AS (
+    SELECT p.Row_Position, p.Store_Index, p.Store_Status, p.Local_Date, p.Time_Of_Day, b.Window_Index,
+           GREATEST(b.Window_Start - p.Start_Of_Day, 0) AS Window_Start_Time,
+           s.Is_Open_24_7
+    FROM local_polls p
+    ASOF JOIN business_hours b ON p.Start_Of_Day + p.Time_Of_Day >= b.Window_Start
+    JOIN stores s ON s.Store_Index = p.Store_Index
+    WHERE p.Start_Of_Day + p.Time_Of_Day <= b.Window_End
+),
+poll_intervals AS (
+    SELECT Row_Position, Store_Index, Local_Date,
+           ABS(Time_Of_Day - CASE
+               WHEN LAG(Window_Index) OVER date_rows IS DISTINCT FROM Window_Index THEN Window_Start_Time
+               ELSE LAG(Time_Of_Day) OVER date_rows END) AS Difference_In_Time,
+           Store_Status = 'active' AS Is_Uptime,
+           CASE WHEN Is_Open_24_7 THEN Store_Status = 'inactive' ELSE Store_Status <> 'active' END AS Is_Downtime
+    FROM business_hours_polls
+    WINDOW date_rows AS (PARTITION BY Store_Index, Local_Date ORDER BY Row_Position)
+),
+daily_uptime_and_downtime AS (
+    SELECT Store_Index, Local_Date,
+           SUM(CASE WHEN Is_Uptime THEN Difference_In_Time ELSE 0 END) AS Uptime,
+           SUM(CASE WHEN Is_Downtime THEN Difference_In_Time ELSE 0 END) AS Downtime,
+           ARG_MAX(CASE WHEN Is_Uptime THEN Difference_In_Time ELSE 0 END, Row_Position) AS Last_Uptime,
+           ARG_MAX(CASE WHEN Is_Downtime THEN Difference_In_Time ELSE 0 END, Row_Position) AS Last_Downtime,
+           MAX(Local_Date) OVER (PARTITION BY Store_Index) AS Last_Date
+    FROM poll_intervals
+    GROUP BY Store_Index, Local_Date
+)
+SELECT Store_Index,
+       SUM(CASE WHEN Local_Date = Last_Date THEN Last_Uptime ELSE 0 END) / 60 AS Uptime_Last_Hour,
+       SUM(CASE WHEN Local_Date = Last_Date THEN Uptime ELSE 0 END) / 3600 AS Uptime_Last_Day,
+       SUM(CASE WHEN Local_Date >= Last_Date - 7 THEN Uptime ELSE 0 END) / 3600 AS Uptime_Last_Week,
+       SUM(CASE WHEN Local_Date = Last_Date THEN Last_Downtime ELSE 0 END) / 60 AS Downtime_Last_Hour,
+       SUM(CASE WHEN Local_Date = Last_Date THEN Downtime ELSE 0 END) / 3600 AS Downtime_Last_Day,
+       SUM(CASE WHEN Local_Date >= Last_Date - 7 THEN Downtime ELSE 0 END) / 3600 AS Downtime_Last_Week
+FROM daily_uptime_and_downtime
+GROUP BY Store_Index
+ORDER BY Store_Index
+"""
+
+
+def create_duckdb_connection():
+    try:
+        if duckdb is None:
+            raise ImportError('REPORT_ENGINE = duckdb needs the duckdb package, '
+                              'install it with pip install store_monitoring[duckdb]')
+
+        # ====================================================================
+        # DUCKDB_THREADS = 0 lets DuckDB use all the cores
+        # ====================================================================
+        connection = duckdb.connect(database=':memory:')
+        if config.DUCKDB_THREADS > 0:
+            connection.execute(f'SET threads TO {config.DUCKDB_THREADS}')
+
+        return connection
+
+    except Exception:
+        raise
+
+
+@time_it
+def process_store_batch_with_duckdb(store_ids: list,
+                                    store_status_rows: dict = None) -> pandas.DataFrame:
+    """
+        Description: This function loads the polls, local timestamps and business hours of a batch of stores
+        into DuckDB and computes the report of the batch with a single query using window functions.
+    """
+    try:
+        logger.info(f'Processing batch of {str(len(store_ids))} StoreIds with DuckDB')
+        store_batch = load_store_batch(store_ids, store_status_rows)
+
+        if 'store_index' not in store_batch:
+            return pandas.DataFrame(columns=REPORT_COLUMNS)
+
+        window_starts, window_ends = store_batch['business_hours']
+        polls_df = pandas.DataFrame({'Row_Position': numpy.arange(len(store_batch['store_index'])),
+                                     'Store_Index': store_batch['store_index'],
+                                     'Local_Microseconds': store_batch['local_microseconds'],
+                                     'Store_Status': store_batch['store_status_values'].astype(str)})
+        business_hours_df = pandas.DataFrame({'Window_Index': numpy.arange(len(window_starts)),
+                                              'Window_Start': window_starts,
+                                              'Window_End': window_ends})
+        stores_df = pandas.DataFrame({'Store_Index': numpy.arange(len(store_ids)),
+                                      'Is_Open_24_7': store_batch['is_open_24_7']})
+
+        connection = create_duckdb_connection()
+        try:
+            connection.register('polls', polls_df)
+            connection.register('business_hours', business_hours_df)
+            connection.register('stores', stores_df)
+            report_df = connection.execute(REPORT_QUERY).df()
+
+        finally:
+            connection.close()
+
+        report_df.insert(0, 'store_id', [store_ids[store_index] for store_index in report_df['Store_Index']])
+        report_df = report_df.drop(columns='Store_Index')
+        report_df.columns = REPORT_COLUMNS
+        return report_df.astype({column: float for column in REPORT_COLUMNS[1:]})
+
+    except Exception:
+        raise
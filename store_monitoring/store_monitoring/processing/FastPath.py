@@ -0,0 +1,101 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+
+from store_monitoring.TimezoneHelper import EPOCH, get_timezone_transitions
+from store_monitoring.processing.BusinessHours import SECONDS_IN_DAY, compile_business_hours
+
+
+def convert_timestamp_utc_to_seconds(timestamp_utc: str) -> int:
+    try:
+        # ====================================================================
+        # Parse the TimestampUTC into epoch seconds, a timestamp without timezone is UTC
+        # ====================================================================
+        timestamp_utc = datetime.fromisoformat(timestamp_utc.replace(' UTC', ''))
+        if timestamp_utc.tzinfo is not None:
+            timestamp_utc = timestamp_utc.astimezone(timezone.utc).replace(tzinfo=None)
+
+        return (timestamp_utc - EPOCH) // timedelta(seconds=1)
+
+    except Exception:
+        raise
+
+
+def process_store_fast_path(store_details: list,
+                            store_status: list,
+                            store_timezone: str,
+                            store_id: str) -> dict:
+    """
+        Description: This function calculates the report row of a store with a handful of polls in plain Python.
+        It follows the vectorized engine row by row, the arrays only pay off for bigger stores.
+    """
+    try:
+        transition_times, utc_offsets = (transition_table.tolist() for transition_table in
+                                         get_timezone_transitions(store_timezone))
+        window_starts, window_ends = (window_table.tolist() for window_table in compile_business_hours(store_details))
+        is_open_24_7 = len(store_details) == 0
+
+        # ====================================================================
+        # Local date, time of the day and business hours window of every poll, in the order they were read
+        # ====================================================================
+        polls_by_date = dict()
+        for store_status_row in store_status:
+            utc_seconds = convert_timestamp_utc_to_seconds(store_status_row['SS_TimestampUtc'])
+            local_seconds = utc_seconds + utc_offsets[max(bisect_right(transition_times, utc_seconds) - 1, 0)]
+            local_date, time_of_day_seconds = divmod(local_seconds, SECONDS_IN_DAY)
+            start_of_day = ((local_date + 3) % 7) * SECONDS_IN_DAY
+
+            window_index = bisect_right(window_starts, start_of_day + time_of_day_seconds) - 1
+            if window_index >= 0 and start_of_day + time_of_day_seconds <= window_ends[window_index]:
+                polls_by_date.setdefault(local_date, []).append(
+                    (time_of_day_seconds, window_index, max(window_starts[window_index] - start_of_day, 0),
+                     store_status_row['SS_StoreStatus']))
+
+        if len(polls_by_date) == 0:
+            return None
+
+        # ====================================================================
+        # Sum the uptime and downtime per date, the first poll of a window is measured from its start
+        # ====================================================================
+        daily_uptime_and_downtime = dict()
+        for local_date in sorted(polls_by_date):
+            uptime_in_seconds, downtime_in_seconds = 0, 0
+            poll_uptime, poll_downtime = 0, 0
+            previous_time_seconds, previous_window_index = None, None
+
+            for time_of_day_seconds, window_index, window_start_seconds, store_status_value in \
+                    polls_by_date[local_date]:
+                if window_index != previous_window_index:
+                    previous_time_seconds = window_start_seconds
+
+                difference_in_time = abs(time_of_day_seconds - previous_time_seconds)
+                is_uptime = store_status_value == 'active'
+                is_downtime = store_status_value == 'inactive' if is_open_24_7 else not is_uptime
+
+                poll_uptime = difference_in_time if is_uptime else 0
+                poll_downtime = difference_in_time if is_downtime else 0
+                uptime_in_seconds += poll_uptime
+                downtime_in_seconds += poll_downtime
+                previous_time_seconds, previous_window_index = time_of_day_seconds, window_index
+
+            daily_uptime_and_downtime[local_date] = (uptime_in_seconds, downtime_in_seconds, poll_uptime, poll_downtime)
+
+        # ====================================================================
+        # The last date gives the last hour and the last day, the last 7 days before it the last week
+        # ====================================================================
+        last_date = max(daily_uptime_and_downtime)
+        recent_dates = [local_date for local_date in daily_uptime_and_downtime if local_date >= last_date - 7]
+
+        final_output = dict()
+        final_output['store_id'] = store_id
+        final_output['uptime_last_hour(in minutes)'] = daily_uptime_and_downtime[last_date][2] / 60
+        final_output['uptime_last_day(in hours)'] = daily_uptime_and_downtime[last_date][0] / 3600
+        final_output['uptime_last_week(in hours)'] = \
+            sum(daily_uptime_and_downtime[local_date][0] for local_date in recent_dates) / 3600
+        final_output['downtime_last_hour(in minutes)'] = daily_uptime_and_downtime[last_date][3] / 60
+        final_output['downtime_last_day(in hours)'] = daily_uptime_and_downtime[last_date][1] / 3600
+        final_output['downtime_last_week(in hours)'] = \
+            sum(daily_uptime_and_downtime[local_date][1] for local_date in recent_dates) / 3600
+        return final_output
+
+    except Exception:
+        raise
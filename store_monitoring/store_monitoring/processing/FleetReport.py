@@ -0,0 +1,162 @@
+import numpy
+import pandas
+
+import store_monitoring.configuration as config
+from store_monitoring.Helper import time_it, export_store_status_wrapper
+from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.ResponseDecoding import count_store_status_rows
+from store_monitoring.processing.BusinessHours import compile_business_hours, combine_business_hours
+from store_monitoring.processing.StorePrefetcher import prefetch_store_data
+from store_monitoring.TimezoneHelper import convert_utc_to_local_microseconds
+from store_monitoring.processing.Vectorized import REPORT_COLUMNS, convert_store_status_to_arrays, \
+    calculate_uptime_and_downtime_for_stores
+
+logger = setup_logger()
+
+
+def split_store_ids_into_batches(store_ids: list) -> list:
+    try:
+        return [store_ids[batch_start:batch_start + config.FLEET_REPORT_BATCH_SIZE]
+                for batch_start in range(0, len(store_ids), config.FLEET_REPORT_BATCH_SIZE)]
+
+    except Exception:
+        raise
+
+
+def create_store_batches_from_export(store_ids: list):
+    """
+        Description: This generator reads the StoreStatus rows of the store_ids with one streamed export from the DAS
+        and yields (store_batch, store_status_rows) of FLEET_REPORT_BATCH_SIZE stores in the order of the export,
+        the store_ids without polls come last. Only the rows of one batch are held in memory.
+    """
+    try:
+        pending_store_ids = {int(store_id): store_id for store_id in store_ids}
+        if len(pending_store_ids) == 0:
+            return
+
+        store_batch = []
+        store_status_rows = dict()
+
+        # ====================================================================
+        # The export covers the range of the store_ids, the stores in between that are not asked for are skipped
+        # ====================================================================
+        for store_id, store_rows in export_store_status_wrapper(min(pending_store_ids), max(pending_store_ids)):
+            if store_id not in pending_store_ids:
+                continue
+
+            store_id = pending_store_ids.pop(store_id)
+            store_batch.append(store_id)
+            store_status_rows[str(store_id)] = store_rows
+
+            if len(store_batch) >= config.FLEET_REPORT_BATCH_SIZE:
+                yield store_batch, store_status_rows
+                store_batch = []
+                store_status_rows = dict()
+
+        for store_id in pending_store_ids.values():
+            store_batch.append(store_id)
+            store_status_rows[str(store_id)] = []
+
+            if len(store_batch) >= config.FLEET_REPORT_BATCH_SIZE:
+                yield store_batch, store_status_rows
+                store_batch = []
+                store_status_rows = dict()
+
+        if len(store_batch) > 0:
+            yield store_batch, store_status_rows
+
+    except Exception:
+        raise
+
+
+@time_it
+def load_store_batch(store_ids: list,
+                     store_status_rows: dict = None) -> dict:
+    """
+        Description: This function loads the StoreStatus rows of all the store_ids into one set of arrays,
+        the columns of a msgpack or Arrow response are used without building rows or frames.
+        The business hours of the stores are compiled into one combined index.
+        StoreStatus rows that were already read, keyed by str(store_id), are passed as store_status_rows.
+    """
+    try:
+        store_utc_microseconds = []
+        store_status_values = []
+        store_row_indexes = []
+        store_business_hours = []
+        store_timezones = []
+        is_open_24_7 = numpy.zeros(len(store_ids), dtype=bool)
+
+        # ====================================================================
+        # The DAS reads of the next PREFETCH_DEPTH stores overlap with building the frame of the current one
+        # ====================================================================
+        for store_index, (store_id, store_data) in enumerate(prefetch_store_data(store_ids, store_status_rows=store_status_rows)):
+            store_timezone = store_data['Store_Timezone']
+            store_timezones.append(store_timezone)
+            store_status = store_data['Store_Status']
+            store_details = store_data['Store_Details']
+            if count_store_status_rows(store_status) > 0:
+                utc_microseconds, status_values = convert_store_status_to_arrays(store_status)
+                store_utc_microseconds.append(utc_microseconds)
+                store_status_values.append(status_values)
+                store_row_indexes.append(numpy.full(len(utc_microseconds), store_index, dtype=numpy.int64))
+
+                # ====================================================================
+                # If no StoreDetails found consider that the store was open 24*7
+                # ====================================================================
+                is_open_24_7[store_index] = len(store_details) == 0
+
+            store_business_hours.append(compile_business_hours(store_details))
+
+        store_batch = dict()
+        store_batch['is_open_24_7'] = is_open_24_7
+        store_batch['store_timezones'] = store_timezones
+        store_batch['business_hours'] = combine_business_hours(store_business_hours)
+
+        if len(store_row_indexes) > 0:
+            store_index = numpy.concatenate(store_row_indexes)
+            utc_microseconds = numpy.concatenate(store_utc_microseconds)
+
+            # ====================================================================
+            # Convert timestamps to the local timezone, one lookup per distinct timezone
+            # ====================================================================
+            row_timezones = numpy.asarray(store_timezones, dtype=object)[store_index]
+            local_microseconds = numpy.empty(len(utc_microseconds), dtype=numpy.int64)
+            for store_timezone in set(store_timezones):
+                row_positions = numpy.flatnonzero(row_timezones == store_timezone)
+                if len(row_positions) > 0:
+                    local_microseconds[row_positions] = convert_utc_to_local_microseconds(
+                        utc_microseconds[row_positions], store_timezone)
+
+            store_batch['store_index'] = store_index
+            store_batch['local_microseconds'] = local_microseconds
+            store_batch['store_status_values'] = numpy.concatenate(store_status_values)
+
+        return store_batch
+
+    except Exception:
+        raise
+
+
+@time_it
+def process_store_batch_fleet_wide(store_ids: list,
+                                   store_status_rows: dict = None) -> pandas.DataFrame:
+    try:
+        logger.info(f'Processing batch of {str(len(store_ids))} StoreIds fleet wide')
+        store_batch = load_store_batch(store_ids, store_status_rows)
+
+        if 'store_index' not in store_batch:
+            return pandas.DataFrame(columns=REPORT_COLUMNS)
+
+        # ====================================================================
+        # Calculate the per-day uptime and downtime and the final output of all the stores in one pass
+        # ====================================================================
+        final_output = calculate_uptime_and_downtime_for_stores(store_ids,
+                                                                store_batch['store_index'],
+                                                                store_batch['local_microseconds'],
+                                                                store_batch['store_status_values'],
+                                                                store_batch['is_open_24_7'],
+                                                                store_batch['business_hours'])
+        return pandas.DataFrame(final_output, columns=REPORT_COLUMNS)
+
+    except Exception:
+        raise
@@ -3,35 +3,86 @@ Author: Lav Sharma
 Created on: 29th Oct 2023
 """
 
+import functools
 import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
 
 import pandas
 
 import store_monitoring.configuration as config
-from store_monitoring.CommonEnums import RequestLifeCycle
+from store_monitoring.CommonEnums import RequestLifeCycle, ReportEngine, ReportExecutionMode, ReportType
 from store_monitoring.DASHelper import update_request
 from store_monitoring.Helper import convert_timestamp_utc_to_local_timezone, \
-    identify_day_for_timezone, read_unique_stores_wrapper, read_store_timezone_wrapper, read_store_status_wrapper, \
-    read_store_details_wrapper, time_it
+    identify_day_for_timezone, read_unique_stores_wrapper, read_store_statistics_wrapper, time_it
 from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.ResponseDecoding import count_store_status_rows, convert_store_status_columns_to_rows
+from store_monitoring.processing.DuckDBReport import process_store_batch_with_duckdb
+from store_monitoring.processing.FastPath import process_store_fast_path
+from store_monitoring.processing.FleetReport import split_store_ids_into_batches, process_store_batch_fleet_wide, \
+    create_store_batches_from_export
+from store_monitoring.processing.HourlyReport import HOURLY_REPORT_COLUMNS, process_store_batch_hourly
+from store_monitoring.processing.ReportCheckpoint import ReportCheckpoint, create_report_arguments
+from store_monitoring.processing.ReportPlanner import plan_report, plan_report_on_engine, explain_report_plan
+from store_monitoring.processing.ShardedReport import process_stores_sharded
+from store_monitoring.processing.StatusTimeline import TIMELINE_REPORT_COLUMNS, process_store_timeline
+from store_monitoring.processing.StorePrefetcher import fetch_store_data, prefetch_store_data
+from store_monitoring.processing.StoreResultCache import create_store_fingerprint, store_result_cache
+from store_monitoring.processing.StreamingReportWriter import StreamingReportWriter
 from store_monitoring.processing.TimeNotSpecified import process_store_for_24_7
 from store_monitoring.processing.TimeSpecified import process_store_with_specified_time
+from store_monitoring.processing.UptimeIndex import parse_report_windows, get_report_columns, \
+    process_store_uptime_index
+from store_monitoring.processing.Vectorized import REPORT_COLUMNS, process_store_vectorized
 
 logger = setup_logger()
 
 
 @time_it
-def generate_report(request_id: int):
+def generate_report(request_id: int,
+                    as_of: datetime = None,
+                    windows: list = None,
+                    report_type: str = ReportType.Uptime_And_Downtime.value,
+                    store_ids: list = None) -> str:
+    """
+        Description: This function generates the report of all the stores, or only of the given store_ids,
+        for the request_id.
+        With as_of or windows the report is answered from the cumulative uptime index, the windows end at as_of
+        (or the last poll of the store) and default to DEFAULT_REPORT_WINDOWS.
+        The hourly report_type gives the uptime and downtime per store and local hour of the week ending at as_of.
+        The rows are streamed to the output file as the stores finish, the written stores are checkpointed and
+        a report started again for the same request_id resumes from them.
+        Returns the path of the output CSV.
+    """
+    report_checkpoint, report_writer = None, None
     try:
-        store_uptime_and_downtime = []
+        report_windows = resolve_report_windows(as_of, windows)
 
         # ====================================================================
-        # Read all the unique StoreId's from the database
+        # Read all the unique StoreId's from the database, unless the report is scoped to its own StoreIds
         # ====================================================================
-        store_ids = read_unique_stores_wrapper()
+        is_scoped_report = store_ids is not None
+        if not is_scoped_report:
+            store_ids = read_unique_stores_wrapper()
         logger.info(f'Total StoreIds - {str(len(store_ids))}')
 
+        # ====================================================================
+        # Save the checkpoint right away, so the request is found on startup even if it stops before the first one
+        # ====================================================================
+        report_checkpoint = ReportCheckpoint(request_id, create_report_arguments(
+            as_of, windows, report_type, store_ids if is_scoped_report else None))
+        report_checkpoint.save()
+
+        # ====================================================================
+        # Stream the rows to {request_id}.csv.tmp in the OUTPUT_CSV_PATH
+        # ====================================================================
+        output_path = os.path.join(config.OUTPUT_CSV_PATH, f'{str(request_id)}.csv')
+        report_writer = StreamingReportWriter(get_output_columns(report_windows, report_type), store_ids,
+                                              output_path, report_checkpoint)
+
         # ====================================================================
         # Update RequestStatus in the DB
         # ====================================================================
@@ -41,22 +92,44 @@ def generate_report(request_id: int):
         logger.info(f'Updated RequestStatus as {str(RequestLifeCycle.Processing_Request.value)} '
                     f'for request_id - {str(request_id)}')
 
-        for counter, store_id in enumerate(store_ids, start=1):
-            store_output = process_store(counter, store_id)
-            store_uptime_and_downtime.append(store_output)
+        if len(config.SHARD_WORKER_URLS) > 0:
+            # ====================================================================
+            # Split the StoreIds across the shard workers and merge their partial reports,
+            # the workers get the windows resolved here so they answer from the index whatever their REPORT_ENGINE
+            # ====================================================================
+            shard_windows = (windows if windows else config.DEFAULT_REPORT_WINDOWS) if report_windows is not None \
+                else None
+            process_stores_sharded(request_id, store_ids, as_of, shard_windows, report_type, report_writer,
+                                   functools.partial(compute_report, as_of=as_of, report_windows=report_windows,
+                                                     report_type=report_type))
+
+        else:
+            compute_report(store_ids, report_writer, as_of, report_windows, report_type)
 
         # ====================================================================
-        # Filter out None values from store_uptime_and_downtime
+        # Rename {request_id}.csv.tmp to {request_id}.csv once every store is written
         # ====================================================================
-        filtered_store_uptime_and_downtime = [output for output in store_uptime_and_downtime if output is not None]
-        store_uptime_and_downtime_df = pandas.DataFrame(filtered_store_uptime_and_downtime)
+        report_writer.finalize()
 
         # ====================================================================
-        # Store the output in the OUTPUT_CSV_PATH
+        # Update RequestCompletedTimestamp, RequestStatus and OutputPath in the DB
         # ====================================================================
-        output_path = os.path.join(config.OUTPUT_CSV_PATH, f'{str(request_id)}.csv')
-        store_uptime_and_downtime_df.to_csv(output_path, index=False)
+        complete_request(request_id, output_path)
+        report_checkpoint.remove()
+        return output_path
 
+    except Exception:
+        fail_request(request_id)
+        if report_writer is not None:
+            report_writer.abort()
+        if report_checkpoint is not None:
+            report_checkpoint.remove()
+        raise
+
+
+def complete_request(request_id: int,
+                     output_path: str):
+    try:
         request_completed_timestamp = datetime.utcnow()
         # ====================================================================
         # Update RequestCompletedTimestamp in the DB
@@ -85,6 +158,11 @@ def generate_report(request_id: int):
         logger.info(f'Updated R_OutputFilePath as {str(output_path)} for request_id - {str(request_id)}')
 
     except Exception:
+        raise
+
+
+def fail_request(request_id: int):
+    try:
         # ====================================================================
         # Update RequestStatus in the DB
         # ====================================================================
@@ -93,25 +171,395 @@ def generate_report(request_id: int):
                        update_row_column_value=RequestLifeCycle.Error_In_Processing_Request.value)
         logger.error(f'Updated RequestStatus as {str(RequestLifeCycle.Error_In_Processing_Request.value)} '
                      f'for request_id - {str(request_id)}')
+
+    except Exception:
+        raise
+
+
+def resolve_report_windows(as_of: datetime = None,
+                           windows: list = None) -> list:
+    try:
+        # ====================================================================
+        # With as_of or windows (or the index engine) the report is answered from the uptime index
+        # ====================================================================
+        if as_of is not None or windows is not None or config.REPORT_ENGINE == ReportEngine.Index.value:
+            return parse_report_windows(windows if windows else config.DEFAULT_REPORT_WINDOWS)
+
+        return None
+
+    except Exception:
+        raise
+
+
+def get_output_columns(report_windows: list = None,
+                       report_type: str = ReportType.Uptime_And_Downtime.value) -> list:
+    try:
+        if report_type == ReportType.Hourly.value:
+            return HOURLY_REPORT_COLUMNS
+
+        elif report_windows is not None:
+            return get_report_columns(report_windows)
+
+        elif config.REPORT_ENGINE == ReportEngine.Timeline.value:
+            return TIMELINE_REPORT_COLUMNS
+
+        return REPORT_COLUMNS
+
+    except Exception:
+        raise
+
+
+def resolve_report_engine(report_windows: list = None,
+                          report_type: str = ReportType.Uptime_And_Downtime.value) -> str:
+    try:
+        # ====================================================================
+        # The hourly report and the reports with windows do not depend on REPORT_ENGINE
+        # ====================================================================
+        if report_type == ReportType.Hourly.value:
+            return ReportType.Hourly.value
+
+        elif report_windows is not None:
+            return ReportEngine.Index.value
+
+        return config.REPORT_ENGINE
+
+    except Exception:
+        raise
+
+
+def compute_report(store_ids: list,
+                   report_writer: StreamingReportWriter,
+                   as_of: datetime = None,
+                   report_windows: list = None,
+                   report_type: str = ReportType.Uptime_And_Downtime.value):
+    """
+        Description: This function computes the report of the store_ids on the REPORT_ENGINE of this instance
+        and writes the rows to report_writer. It is used for the whole report and, on a shard worker,
+        for the StoreIds of one shard.
+    """
+    try:
+        report_engine = resolve_report_engine(report_windows, report_type)
+
+        if report_engine == ReportType.Hourly.value:
+            # ====================================================================
+            # Bin the poll intervals of a whole batch of stores by local hour
+            # ====================================================================
+            process_stores_fleet_wide(store_ids, report_writer, functools.partial(process_store_batch_hourly,
+                                                                                  as_of=as_of))
+
+        elif report_engine == ReportEngine.Fleet.value:
+            # ====================================================================
+            # Compute the report table for a whole batch of stores at once
+            # ====================================================================
+            process_stores_fleet_wide(store_ids, report_writer)
+
+        elif report_engine == ReportEngine.DuckDB.value:
+            # ====================================================================
+            # Compute the report table of a whole batch of stores with one DuckDB query
+            # ====================================================================
+            process_stores_fleet_wide(store_ids, report_writer, process_store_batch_with_duckdb)
+
+        elif report_engine == ReportEngine.Auto.value:
+            # ====================================================================
+            # Pick the engine of every store from its statistics, explain the plan before running it
+            # ====================================================================
+            report_plan = plan_report(report_writer.get_pending_store_ids(store_ids), read_store_statistics_wrapper())
+            logger.info(f'Report plan - {str(explain_report_plan(report_plan))}')
+            process_stores_with_plan(report_plan, report_writer)
+
+        else:
+            process_stores(store_ids, report_writer, as_of, report_windows)
+
+    except Exception:
+        raise
+
+
+def compute_shard_report(store_ids: list,
+                         as_of: datetime = None,
+                         windows: list = None,
+                         report_type: str = ReportType.Uptime_And_Downtime.value) -> dict:
+    """
+        Description: This function computes the partial report of the store_ids of one shard for the coordinator.
+        The rows are returned as plain lists, floats are sent in full precision and missing values as None.
+    """
+    try:
+        report_windows = resolve_report_windows(as_of, windows)
+        report_writer = StreamingReportWriter(get_output_columns(report_windows, report_type), store_ids)
+        compute_report(store_ids, report_writer, as_of, report_windows, report_type)
+
+        shard_report_df = report_writer.get_dataframe()
+        shard_report_df = shard_report_df.astype(object).where(shard_report_df.notna(), None)
+        return {'Columns': list(shard_report_df.columns),
+                'Rows': shard_report_df.values.tolist()}
+
+    except Exception:
+        raise
+
+
+def explain_report(store_ids: list = None,
+                   as_of: datetime = None,
+                   windows: list = None,
+                   report_type: str = ReportType.Uptime_And_Downtime.value) -> dict:
+    """
+        Description: This function plans the report of all the StoreIds, or of the given store_ids, without running it.
+        The plan is that of the engine compute_report will run, the cost-based plan only with REPORT_ENGINE = auto.
+    """
+    try:
+        if store_ids is None:
+            store_ids = read_unique_stores_wrapper()
+
+        report_engine = resolve_report_engine(resolve_report_windows(as_of, windows), report_type)
+        if report_engine == ReportEngine.Auto.value:
+            return explain_report_plan(plan_report(store_ids, read_store_statistics_wrapper()))
+
+        return explain_report_plan(plan_report_on_engine(report_engine, store_ids, read_store_statistics_wrapper()))
+
+    except Exception:
         raise
 
 
 @time_it
-def process_store(counter: int,
-                  store_id: str) -> dict:
+def process_stores_with_plan(report_plan: dict,
+                             report_writer: StreamingReportWriter):
     try:
-        logger.info(f'Processing store_id - {str(store_id)}')
         # ====================================================================
-        # Get the Timezone for the StoreId from StoreTimezone table
+        # The writer puts the rows of the steps back in the order of the StoreIds
+        # ====================================================================
+        for plan_step in report_plan['Steps']:
+            logger.info(f'Processing {str(plan_step["Stores"])} StoreIds on the {str(plan_step["Engine"])} engine, '
+                        f'estimated cost - {str(plan_step["Estimated_Cost_In_Seconds"])} seconds')
+
+            if plan_step['Engine'] == ReportEngine.Fleet.value:
+                process_stores_fleet_wide(plan_step['Store_Ids'], report_writer)
+
+            else:
+                process_stores(plan_step['Store_Ids'], report_writer, report_engine=plan_step['Engine'])
+
+    except Exception:
+        raise
+
+
+def process_stores(store_ids: list,
+                   report_writer: StreamingReportWriter,
+                   as_of: datetime = None,
+                   report_windows: list = None,
+                   report_engine: str = None):
+    try:
+        # ====================================================================
+        # Only the stores that are not written yet are computed
+        # ====================================================================
+        pending_store_ids = report_writer.get_pending_store_ids(store_ids)
+
+        if config.REPORT_EXECUTION_MODE == ReportExecutionMode.Parallel.value:
+            cache_hits = process_stores_in_parallel(pending_store_ids, report_writer, as_of, report_windows,
+                                                    report_engine)
+
+        else:
+            # ====================================================================
+            # The next PREFETCH_DEPTH stores are read from the DAS while the current one is computed
+            # ====================================================================
+            cache_hits = 0
+            for counter, (store_id, store_data) in enumerate(prefetch_store_data(pending_store_ids), start=1):
+                store_output, _, is_cache_hit = process_store_with_cache(counter, store_id, as_of, report_windows,
+                                                                         report_engine, store_data)
+                report_writer.write_store_outputs([store_id], [store_output])
+                cache_hits += is_cache_hit
+
+        if store_result_cache.is_enabled():
+            logger.info(f'Store result cache - hits {str(cache_hits)}, '
+                        f'misses {str(len(pending_store_ids) - cache_hits)}')
+            store_result_cache.trim()
+
+    except Exception:
+        raise
+
+
+@time_it
+def process_stores_fleet_wide(store_ids: list,
+                              report_writer: StreamingReportWriter,
+                              process_store_batch=process_store_batch_fleet_wide):
+    try:
+        if config.STORE_STATUS_EXPORT_FORMAT:
+            process_stores_fleet_wide_from_export(store_ids, report_writer, process_store_batch)
+            return
+
+        store_batches = split_store_ids_into_batches(report_writer.get_pending_store_ids(store_ids))
+
+        if config.REPORT_EXECUTION_MODE == ReportExecutionMode.Parallel.value:
+            max_workers = config.REPORT_PROCESS_POOL_WORKERS if config.REPORT_PROCESS_POOL_WORKERS > 0 \
+                else os.cpu_count()
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for store_batch, store_batch_output in zip(store_batches,
+                                                           executor.map(process_store_batch, store_batches)):
+                    report_writer.write_store_outputs(store_batch, store_batch_output)
+
+        else:
+            for store_batch in store_batches:
+                report_writer.write_store_outputs(store_batch, process_store_batch(store_batch))
+
+    except Exception:
+        raise
+
+
+def process_stores_fleet_wide_from_export(store_ids: list,
+                                          report_writer: StreamingReportWriter,
+                                          process_store_batch):
+    """
+        Description: The batches of stores are formed from one streamed export of the StoreStatus rows, in the order
+        of the store_id, the report_writer puts the rows back in the order of the store_ids.
+        On the process pool at most one batch per worker is in flight, so the export is not read ahead of the workers.
+    """
+    try:
+        store_batches = create_store_batches_from_export(report_writer.get_pending_store_ids(store_ids))
+
+        if config.REPORT_EXECUTION_MODE == ReportExecutionMode.Parallel.value:
+            max_workers = config.REPORT_PROCESS_POOL_WORKERS if config.REPORT_PROCESS_POOL_WORKERS > 0 \
+                else os.cpu_count()
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                in_flight = deque()
+                for store_batch, store_status_rows in store_batches:
+                    in_flight.append((store_batch, executor.submit(process_store_batch, store_batch,
+                                                                   store_status_rows=store_status_rows)))
+                    if len(in_flight) >= max_workers:
+                        store_batch, store_batch_future = in_flight.popleft()
+                        report_writer.write_store_outputs(store_batch, store_batch_future.result())
+
+                while len(in_flight) > 0:
+                    store_batch, store_batch_future = in_flight.popleft()
+                    report_writer.write_store_outputs(store_batch, store_batch_future.result())
+
+        else:
+            for store_batch, store_status_rows in store_batches:
+                report_writer.write_store_outputs(store_batch,
+                                                  process_store_batch(store_batch, store_status_rows=store_status_rows))
+
+    except Exception:
+        raise
+
+
+@time_it
+def process_stores_in_parallel(store_ids: list,
+                               report_writer: StreamingReportWriter,
+                               as_of: datetime = None,
+                               report_windows: list = None,
+                               report_engine: str = None) -> int:
+    try:
+        # ====================================================================
+        # REPORT_PROCESS_POOL_WORKERS = 0 uses one worker per CPU
+        # ====================================================================
+        max_workers = config.REPORT_PROCESS_POOL_WORKERS if config.REPORT_PROCESS_POOL_WORKERS > 0 else os.cpu_count()
+        logger.info(f'Processing {str(len(store_ids))} StoreIds on {str(max_workers)} workers, '
+                    f'chunk size - {str(config.REPORT_STORE_CHUNK_SIZE)}')
+
+        # ====================================================================
+        # Send the stores to the workers in chunks, map returns the outputs in store order
         # ====================================================================
-        store_timezone = read_store_timezone_wrapper(store_id)
+        cache_hits = 0
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for store_id, (store_output, store_fingerprint, is_cache_hit) in zip(
+                    store_ids, executor.map(process_store_with_cache,
+                                            range(1, len(store_ids) + 1),
+                                            store_ids,
+                                            repeat(as_of),
+                                            repeat(report_windows),
+                                            repeat(report_engine),
+                                            chunksize=config.REPORT_STORE_CHUNK_SIZE)):
+                report_writer.write_store_outputs([store_id], [store_output])
+
+                # ====================================================================
+                # A worker only fills its own copy of the cache, keep the row for the next report of this process
+                # ====================================================================
+                if store_fingerprint is not None and not is_cache_hit:
+                    store_result_cache.put(store_fingerprint, store_output, is_persisted=True)
+                cache_hits += is_cache_hit
+
+        return cache_hits
+
+    except Exception:
+        raise
+
+
+def process_store_with_cache(counter: int,
+                             store_id: str,
+                             as_of: datetime = None,
+                             report_windows: list = None,
+                             report_engine: str = None,
+                             store_data: dict = None) -> tuple:
+    """
+        Description: This function returns the output row of the store from the store result cache if nothing
+        it depends on changed since it was computed, else it computes the store and caches the row.
+        Returns (output row, fingerprint, whether it was a cache hit).
+    """
+    try:
+        if not store_result_cache.is_enabled():
+            return process_store(counter, store_id, as_of, report_windows, report_engine, store_data), None, False
+
+        if store_data is None:
+            store_data = fetch_store_data(store_id)
+
+        report_engine = report_engine if report_engine is not None else config.REPORT_ENGINE
+        store_fingerprint = create_store_fingerprint(store_id, store_data, as_of, report_windows, report_engine)
+        is_cache_hit, store_output = store_result_cache.get(store_fingerprint)
+
+        if not is_cache_hit:
+            store_output = process_store(counter, store_id, as_of, report_windows, report_engine, store_data)
+            store_result_cache.put(store_fingerprint, store_output)
+
+        return store_output, store_fingerprint, is_cache_hit
+
+    except Exception:
+        raise
+
+
+@time_it
+def process_store(counter: int,
+                  store_id: str,
+                  as_of: datetime = None,
+                  report_windows: list = None,
+                  report_engine: str = None,
+                  store_data: dict = None) -> dict:
+    try:
+        report_engine = report_engine if report_engine is not None else config.REPORT_ENGINE
+        logger.info(f'Processing store_id - {str(store_id)}')
 
         # ====================================================================
-        # Read all the records for StoreId from the StoreStatus table
+        # Read the Timezone, StoreStatus and StoreDetails of the StoreId, unless they were prefetched
         # ====================================================================
-        store_status = read_store_status_wrapper(store_id)
-        if len(store_status) > 0:
-            store_status_df = pandas.DataFrame(store_status)
+        if store_data is None:
+            store_data = fetch_store_data(store_id)
+        store_timezone = store_data['Store_Timezone']
+        store_status = store_data['Store_Status']
+        store_details = store_data['Store_Details']
+        store_status_count = count_store_status_rows(store_status)
+
+        if store_status_count > 0 and report_windows is not None:
+            # ====================================================================
+            # Answer every window with two binary searches on the cumulative uptime index
+            # ====================================================================
+            return process_store_uptime_index(store_details, store_status, store_timezone, store_id, as_of,
+                                              report_windows)
+
+        elif store_status_count > 0 and report_engine == ReportEngine.Python.value:
+            # ====================================================================
+            # A store with a handful of polls is cheaper in plain Python than on arrays
+            # ====================================================================
+            return process_store_fast_path(store_details, convert_store_status_columns_to_rows(store_status),
+                                           store_timezone, store_id)
+
+        elif store_status_count > 0 and report_engine == ReportEngine.Vectorized.value:
+            # ====================================================================
+            # Calculate the uptime and downtime on int64 arrays instead of row-wise DataFrame.apply
+            # ====================================================================
+            return process_store_vectorized(store_details, store_status, store_timezone, store_id)
+
+        elif store_status_count > 0 and report_engine == ReportEngine.Timeline.value:
+            # ====================================================================
+            # Calculate the uptime and downtime as popcounts over the bit-packed minute timeline
+            # ====================================================================
+            return process_store_timeline(store_details, store_status, store_timezone, store_id)
+
+        elif store_status_count > 0:
+            store_status_df = pandas.DataFrame(convert_store_status_columns_to_rows(store_status))
 
             # ====================================================================
             # Convert timestamps to the local timezone
@@ -120,10 +568,8 @@ def process_store(counter: int,
             store_status_df = identify_day_for_timezone(store_status_df)
 
             # ====================================================================
-            # Read the StoreDetails using StoreId, which will give us the StartTime and EndTime of the store
-            # If no rows found consider that the store was open 24*7
+            # If no StoreDetails found consider that the store was open 24*7
             # ====================================================================
-            store_details = read_store_details_wrapper(store_id)
             if len(store_details) > 0:
                 return process_store_with_specified_time(store_details, store_status_df, store_id)
 
@@ -138,4 +584,7 @@ def process_store(counter: int,
 
 
 if __name__ == '__main__':
-    generate_report()
+    # ====================================================================
+    # python -m store_monitoring.processing.GenerateReport <request_id>, the request must exist in the Request table
+    # ====================================================================
+    generate_report(int(sys.argv[1]))
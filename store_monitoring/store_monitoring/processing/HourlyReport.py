@@ -0,0 +1,186 @@
+from datetime import datetime
+
+import numpy
+import pandas
+
+from store_monitoring.Helper import time_it
+from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.TimezoneHelper import get_utc_offsets
+from store_monitoring.processing.BusinessHours import SECONDS_IN_DAY, SECONDS_IN_WEEK, locate_business_hours
+from store_monitoring.processing.FleetReport import load_store_batch
+from store_monitoring.processing.UptimeIndex import convert_datetime_to_utc_seconds
+from store_monitoring.processing.Vectorized import MICROSECONDS_IN_SECOND, split_local_microseconds
+
+HOURS_IN_WEEK = 168
+
+HOURLY_REPORT_COLUMNS = ['store_id', 'local_date', 'local_hour', 'uptime(in minutes)', 'downtime(in minutes)']
+
+logger = setup_logger()
+
+
+def calculate_poll_intervals(store_index: numpy.ndarray,
+                             local_seconds: numpy.ndarray,
+                             store_status_values: numpy.ndarray,
+                             is_open_24_7: numpy.ndarray,
+                             business_hours: tuple) -> tuple:
+    """
+        Description: This function turns the polls within business hours into local time intervals
+        [previous poll, poll), the first poll of a local date and business hours window starts at the window start.
+        Returns store_index, interval start, interval end, is_uptime and is_downtime of every interval.
+    """
+    try:
+        local_date, local_day, time_of_day_microseconds = split_local_microseconds(
+            local_seconds * MICROSECONDS_IN_SECOND)
+        time_of_day_seconds = time_of_day_microseconds // MICROSECONDS_IN_SECOND
+        start_of_day = store_index * SECONDS_IN_WEEK + local_day * SECONDS_IN_DAY
+        within_business_hours, window_index, window_start = locate_business_hours(
+            business_hours, start_of_day + time_of_day_seconds)
+
+        # ====================================================================
+        # Sort the polls within business hours by store and local time
+        # ====================================================================
+        sort_order = numpy.flatnonzero(within_business_hours)
+        sort_order = sort_order[numpy.lexsort((local_seconds[sort_order], store_index[sort_order]))]
+        store_index = store_index[sort_order]
+        local_date = local_date[sort_order]
+        window_index = window_index[sort_order]
+        time_of_day_seconds = time_of_day_seconds[sort_order]
+        window_start_seconds = numpy.maximum(window_start - start_of_day, 0)[sort_order]
+        store_status_values = store_status_values[sort_order]
+
+        is_first_row_of_window = numpy.ones(len(sort_order), dtype=bool)
+        is_first_row_of_window[1:] = (store_index[1:] != store_index[:-1]) | \
+            (local_date[1:] != local_date[:-1]) | (window_index[1:] != window_index[:-1])
+
+        previous_time_seconds = numpy.empty_like(time_of_day_seconds)
+        previous_time_seconds[1:] = time_of_day_seconds[:-1]
+        previous_time_seconds = numpy.where(is_first_row_of_window, window_start_seconds, previous_time_seconds)
+
+        # ====================================================================
+        # A 24*7 store only counts 'inactive' as downtime, else everything that is not 'active'
+        # ====================================================================
+        is_uptime = store_status_values == 'active'
+        is_downtime = numpy.where(is_open_24_7[store_index], store_status_values == 'inactive', ~is_uptime)
+
+        return (store_index,
+                local_date * SECONDS_IN_DAY + previous_time_seconds,
+                local_date * SECONDS_IN_DAY + time_of_day_seconds,
+                is_uptime,
+                is_downtime)
+
+    except Exception:
+        raise
+
+
+def bin_intervals_by_hour(store_index: numpy.ndarray,
+                          interval_starts: numpy.ndarray,
+                          interval_ends: numpy.ndarray,
+                          first_report_hour: numpy.ndarray,
+                          weights: tuple) -> tuple:
+    """
+        Description: This function splits every interval at the local hour boundaries and sums the seconds of
+        every (store, hour) with a weighted bincount, the hours run from first_report_hour of the store for a week.
+    """
+    try:
+        number_of_bins = len(first_report_hour) * HOURS_IN_WEEK
+
+        # ====================================================================
+        # Clip the intervals to the week of the report, drop the empty ones
+        # ====================================================================
+        interval_starts = numpy.maximum(interval_starts, first_report_hour[store_index] * 3600)
+        interval_ends = numpy.minimum(interval_ends, (first_report_hour[store_index] + HOURS_IN_WEEK) * 3600)
+        is_in_report = interval_ends > interval_starts
+        if not is_in_report.any():
+            return tuple(numpy.zeros(number_of_bins) for _ in weights)
+
+        store_index = store_index[is_in_report]
+        interval_starts = interval_starts[is_in_report]
+        interval_ends = interval_ends[is_in_report]
+        weights = tuple(weight[is_in_report] for weight in weights)
+
+        # ====================================================================
+        # One piece per hour an interval touches
+        # ====================================================================
+        first_hour = interval_starts // 3600
+        pieces_per_interval = (interval_ends - 1) // 3600 - first_hour + 1
+        piece_interval = numpy.repeat(numpy.arange(len(first_hour)), pieces_per_interval)
+        piece_offset = numpy.arange(len(piece_interval)) - numpy.repeat(
+            numpy.cumsum(pieces_per_interval) - pieces_per_interval, pieces_per_interval)
+        piece_hour = first_hour[piece_interval] + piece_offset
+
+        piece_seconds = numpy.minimum(interval_ends[piece_interval], (piece_hour + 1) * 3600) - \
+            numpy.maximum(interval_starts[piece_interval], piece_hour * 3600)
+        piece_bin = store_index[piece_interval] * HOURS_IN_WEEK + \
+            (piece_hour - first_report_hour[store_index[piece_interval]])
+
+        return tuple(numpy.bincount(piece_bin, weights=numpy.where(weight[piece_interval], piece_seconds, 0),
+                                    minlength=number_of_bins) for weight in weights)
+
+    except Exception:
+        raise
+
+
+@time_it
+def process_store_batch_hourly(store_ids: list,
+                               as_of: datetime = None,
+                               store_status_rows: dict = None) -> pandas.DataFrame:
+    """
+        Description: This function calculates the uptime and downtime minutes of every store per local hour
+        for the week ending with the hour of as_of, or of the last poll of the store.
+        Only the hours with uptime or downtime are part of the output.
+    """
+    try:
+        logger.info(f'Processing hourly report of {str(len(store_ids))} StoreIds')
+        store_batch = load_store_batch(store_ids, store_status_rows)
+
+        if 'store_index' not in store_batch:
+            return pandas.DataFrame(columns=HOURLY_REPORT_COLUMNS)
+
+        store_index = store_batch['store_index']
+        local_seconds = store_batch['local_microseconds'] // MICROSECONDS_IN_SECOND
+
+        # ====================================================================
+        # The report of a store ends with the hour of as_of (in its timezone) or of its last poll
+        # ====================================================================
+        if as_of is not None:
+            as_of_seconds = convert_datetime_to_utc_seconds(as_of)
+            last_local_seconds = numpy.array([as_of_seconds + int(get_utc_offsets(numpy.array([as_of_seconds]),
+                                                                                  store_timezone)[0])
+                                              for store_timezone in store_batch['store_timezones']],
+                                             dtype=numpy.int64)
+
+        else:
+            last_local_seconds = numpy.full(len(store_ids), numpy.iinfo(numpy.int64).min, dtype=numpy.int64)
+            numpy.maximum.at(last_local_seconds, store_index, local_seconds)
+
+        has_polls = numpy.bincount(store_index, minlength=len(store_ids)) > 0
+        first_report_hour = numpy.where(has_polls, last_local_seconds // 3600 - HOURS_IN_WEEK + 1, 0)
+
+        poll_intervals = calculate_poll_intervals(store_index, local_seconds, store_batch['store_status_values'],
+                                                  store_batch['is_open_24_7'], store_batch['business_hours'])
+        interval_store_index, interval_starts, interval_ends, is_uptime, is_downtime = poll_intervals
+
+        # ====================================================================
+        # Without as_of the intervals end at the last poll, with as_of they are cut at it
+        # ====================================================================
+        interval_ends = numpy.minimum(interval_ends, last_local_seconds[interval_store_index])
+        uptime_in_seconds, downtime_in_seconds = bin_intervals_by_hour(
+            interval_store_index, interval_starts, interval_ends, first_report_hour, (is_uptime, is_downtime))
+
+        # ====================================================================
+        # Long format, one row per store and local hour with uptime or downtime
+        # ====================================================================
+        report_bins = numpy.flatnonzero((uptime_in_seconds > 0) | (downtime_in_seconds > 0))
+        report_hours = first_report_hour[report_bins // HOURS_IN_WEEK] + report_bins % HOURS_IN_WEEK
+
+        hourly_report_df = pandas.DataFrame(columns=HOURLY_REPORT_COLUMNS)
+        hourly_report_df['store_id'] = [store_ids[report_store_index]
+                                        for report_store_index in report_bins // HOURS_IN_WEEK]
+        hourly_report_df['local_date'] = (report_hours // 24).astype('datetime64[D]').astype(str)
+        hourly_report_df['local_hour'] = report_hours % 24
+        hourly_report_df['uptime(in minutes)'] = uptime_in_seconds[report_bins] / 60
+        hourly_report_df['downtime(in minutes)'] = downtime_in_seconds[report_bins] / 60
+        return hourly_report_df
+
+    except Exception:
+        raise
@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+import time
+
+import numpy
+
+import store_monitoring.configuration as config
+from store_monitoring.ModuleLogger import setup_logger
+
+logger = setup_logger()
+
+# ====================================================================
+# The worker of a report and the API handlers attaching requests to it write the same checkpoint
+# ====================================================================
+checkpoint_lock = threading.Lock()
+
+
+def get_checkpoint_path(request_id: int) -> str:
+    return os.path.join(config.CHECKPOINT_PATH, f'{str(request_id)}.json')
+
+
+def convert_to_json_value(value):
+    # ====================================================================
+    # numpy scalars of the report rows are written as plain int and float
+    # ====================================================================
+    if isinstance(value, numpy.generic):
+        return value.item()
+
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def read_checkpoint(request_id: int) -> dict:
+    try:
+        checkpoint_path = get_checkpoint_path(request_id)
+        if not os.path.exists(checkpoint_path):
+            return None
+
+        with open(checkpoint_path, 'r') as checkpoint_file:
+            return json.load(checkpoint_file)
+
+    except Exception:
+        raise
+
+
+def write_checkpoint(request_id: int, checkpoint: dict):
+    try:
+        # ====================================================================
+        # Write a temporary file and rename it, a crash while writing keeps the previous checkpoint
+        # ====================================================================
+        os.makedirs(config.CHECKPOINT_PATH, exist_ok=True)
+        checkpoint_path = get_checkpoint_path(request_id)
+        with open(checkpoint_path + '.tmp', 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file, default=convert_to_json_value)
+        os.replace(checkpoint_path + '.tmp', checkpoint_path)
+
+    except Exception:
+        raise
+
+
+def create_report_arguments(as_of=None,
+                            windows: list = None,
+                            report_type: str = None,
+                            store_ids: list = None) -> dict:
+    return {'As_Of': as_of.isoformat() if as_of is not None else None,
+            'Windows': windows,
+            'Report_Type': report_type,
+            'Store_Ids': store_ids}
+
+
+def save_submitted_report(request_id: int, report_arguments: dict):
+    """
+        Description: Saves the checkpoint of a report when it is queued, so a report still waiting in the queue
+        when the process stops is found on startup like one that was running.
+    """
+    try:
+        ReportCheckpoint(request_id, report_arguments).save()
+
+    except Exception:
+        raise
+
+
+def add_attached_request(request_id: int, attached_request_id: int):
+    """
+        Description: Records in the checkpoint of request_id a request attached to it by the ReportCoalescer,
+        the attached requests are completed with its output file even after a restart.
+    """
+    try:
+        with checkpoint_lock:
+            checkpoint = read_checkpoint(request_id) or {'Request_Id': request_id}
+            checkpoint['Attached_Request_Ids'] = checkpoint.get('Attached_Request_Ids', []) + [attached_request_id]
+            write_checkpoint(request_id, checkpoint)
+
+    except Exception:
+        raise
+
+
+def remove_checkpoint(request_id: int):
+    try:
+        checkpoint_path = get_checkpoint_path(request_id)
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    except Exception:
+        raise
+
+
+def list_checkpoints() -> dict:
+    """
+        Description: This function reads every checkpoint in CHECKPOINT_PATH, keyed by request_id.
+        A checkpoint is removed when its report and the requests attached to it are completed or failed,
+        so these are the reports that were queued or running, or whose attached requests were not completed yet.
+    """
+    try:
+        checkpoints = dict()
+        if not os.path.isdir(config.CHECKPOINT_PATH):
+            return checkpoints
+
+        for checkpoint_file_name in sorted(os.listdir(config.CHECKPOINT_PATH)):
+            request_id, extension = os.path.splitext(checkpoint_file_name)
+            if extension == '.json' and request_id.isdigit():
+                checkpoint = read_checkpoint(int(request_id))
+                if checkpoint is not None:
+                    checkpoints[int(request_id)] = checkpoint
+
+        return checkpoints
+
+    except Exception:
+        raise
+
+
+class ReportCheckpoint:
+    """
+        Description: The StoreIds of a report already written to its output file and the size of that file,
+        saved to CHECKPOINT_PATH. A report that is started again for the same request_id keeps those bytes
+        and only computes the other stores.
+    """
+
+    def __init__(self, request_id: int, report_arguments: dict):
+        try:
+            self.request_id = request_id
+            self.report_arguments = report_arguments
+            self.finished_store_ids = []
+            self.output_offset = 0
+            self.last_saved_timestamp = time.time()
+
+            checkpoint = read_checkpoint(request_id)
+            if checkpoint is not None and len(checkpoint.get('Finished_Store_Ids', [])) > 0:
+                self.finished_store_ids = checkpoint['Finished_Store_Ids']
+                self.output_offset = checkpoint['Output_Offset']
+                logger.info(f'Resuming request_id - {str(request_id)} from the checkpoint, '
+                            f'finished StoreIds - {str(len(self.finished_store_ids))}')
+
+        except Exception:
+            raise
+
+    def is_due(self) -> bool:
+        return time.time() - self.last_saved_timestamp >= config.CHECKPOINT_INTERVAL_IN_SECONDS
+
+    def save(self, finished_store_ids: list = None, output_offset: int = None):
+        try:
+            if finished_store_ids is not None:
+                self.finished_store_ids = finished_store_ids
+                self.output_offset = output_offset
+
+            # ====================================================================
+            # Keep the requests attached to the report since the last save
+            # ====================================================================
+            with checkpoint_lock:
+                checkpoint = read_checkpoint(self.request_id) or dict()
+                write_checkpoint(self.request_id, {'Request_Id': self.request_id,
+                                                   'Arguments': self.report_arguments,
+                                                   'Finished_Store_Ids': self.finished_store_ids,
+                                                   'Output_Offset': self.output_offset,
+                                                   'Attached_Request_Ids': checkpoint.get('Attached_Request_Ids', [])})
+
+            self.last_saved_timestamp = time.time()
+            logger.info(f'Saved checkpoint of request_id - {str(self.request_id)}, '
+                        f'finished StoreIds - {str(len(self.finished_store_ids))}')
+
+        except Exception:
+            raise
+
+    def remove(self):
+        try:
+            # ====================================================================
+            # With attached requests the ReportCoalescer removes the checkpoint once they are completed
+            # ====================================================================
+            with checkpoint_lock:
+                checkpoint = read_checkpoint(self.request_id)
+                if checkpoint is None or len(checkpoint.get('Attached_Request_Ids', [])) == 0:
+                    remove_checkpoint(self.request_id)
+
+        except Exception:
+            raise
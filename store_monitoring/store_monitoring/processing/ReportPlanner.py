@@ -0,0 +1,145 @@
+import store_monitoring.configuration as config
+from store_monitoring.CommonEnums import ReportEngine
+from store_monitoring.processing.FleetReport import split_store_ids_into_batches
+
+
+def estimate_store_costs(store_statistics: dict) -> dict:
+    """
+        Description: This function estimates the compute cost (microseconds) of a store on every engine,
+        using its Poll_Count and Window_Count. The fleet cost of a batch is added by plan_report.
+    """
+    try:
+        poll_count = store_statistics.get('Poll_Count', 0)
+        window_cost = store_statistics.get('Window_Count', 0) * config.PLANNER_COST_PER_WINDOW
+
+        store_costs = dict()
+        store_costs[ReportEngine.Python.value] = config.PLANNER_PYTHON_COST_PER_STORE + \
+            config.PLANNER_PYTHON_COST_PER_POLL * poll_count + window_cost
+        store_costs[ReportEngine.Vectorized.value] = config.PLANNER_VECTORIZED_COST_PER_STORE + \
+            config.PLANNER_VECTORIZED_COST_PER_POLL * poll_count + window_cost
+        store_costs[ReportEngine.Fleet.value] = config.PLANNER_FLEET_COST_PER_STORE + \
+            config.PLANNER_FLEET_COST_PER_POLL * poll_count + window_cost
+        return store_costs
+
+    except Exception:
+        raise
+
+
+def create_plan_step(report_engine: str,
+                     store_ids: list,
+                     poll_count: int,
+                     estimated_cost: float) -> dict:
+    try:
+        plan_step = dict()
+        plan_step['Engine'] = report_engine
+        plan_step['Store_Ids'] = store_ids
+        plan_step['Stores'] = len(store_ids)
+        plan_step['Polls'] = poll_count
+        plan_step['Estimated_Cost_In_Seconds'] = round(estimated_cost / 1000000, 3) if estimated_cost is not None \
+            else None
+        return plan_step
+
+    except Exception:
+        raise
+
+
+def plan_report(store_ids: list,
+                store_statistics: dict) -> dict:
+    """
+        Description: This function picks the cheapest engine for every store of the report.
+        Stores that are cheaper in plain Python than on the arrays take the python fast path, the rest are split
+        into batches of FLEET_REPORT_BATCH_SIZE and every batch runs fleet wide or store by store on the
+        vectorized engine, whichever is estimated cheaper.
+    """
+    try:
+        steps = []
+        python_store_ids, array_store_ids = [], []
+        python_cost, python_poll_count = 0, 0
+        store_costs = dict()
+
+        for store_id in store_ids:
+            store_costs[store_id] = estimate_store_costs(store_statistics.get(store_id, dict()))
+            if store_costs[store_id][ReportEngine.Python.value] <= store_costs[store_id][ReportEngine.Vectorized.value]:
+                python_store_ids.append(store_id)
+                python_cost += store_costs[store_id][ReportEngine.Python.value]
+                python_poll_count += store_statistics.get(store_id, dict()).get('Poll_Count', 0)
+
+            else:
+                array_store_ids.append(store_id)
+
+        if len(python_store_ids) > 0:
+            steps.append(create_plan_step(ReportEngine.Python.value, python_store_ids, python_poll_count,
+                                          python_cost))
+
+        for store_batch in split_store_ids_into_batches(array_store_ids):
+            # ====================================================================
+            # The fleet engine pays a fixed cost per batch, it wins once the batch has enough stores
+            # ====================================================================
+            batch_poll_count = sum(store_statistics.get(store_id, dict()).get('Poll_Count', 0)
+                                   for store_id in store_batch)
+            vectorized_cost = sum(store_costs[store_id][ReportEngine.Vectorized.value] for store_id in store_batch)
+            fleet_cost = config.PLANNER_FLEET_COST_PER_BATCH + \
+                sum(store_costs[store_id][ReportEngine.Fleet.value] for store_id in store_batch)
+
+            if fleet_cost < vectorized_cost:
+                steps.append(create_plan_step(ReportEngine.Fleet.value, store_batch, batch_poll_count, fleet_cost))
+
+            else:
+                steps.append(create_plan_step(ReportEngine.Vectorized.value, store_batch, batch_poll_count,
+                                              vectorized_cost))
+
+        report_plan = dict()
+        report_plan['Stores'] = len(store_ids)
+        report_plan['Polls'] = sum(plan_step['Polls'] for plan_step in steps)
+        report_plan['Estimated_Cost_In_Seconds'] = round(sum(plan_step['Estimated_Cost_In_Seconds']
+                                                             for plan_step in steps), 3)
+        report_plan['Steps'] = steps
+        return report_plan
+
+    except Exception:
+        raise
+
+
+def plan_report_on_engine(report_engine: str,
+                          store_ids: list,
+                          store_statistics: dict) -> dict:
+    """
+        Description: This function plans a report that runs every store on report_engine, the engine of
+        REPORT_ENGINE other than auto. Only the python, vectorized and fleet engines have a cost model,
+        the plan of any other engine has no estimated cost.
+    """
+    try:
+        poll_count = sum(store_statistics.get(store_id, dict()).get('Poll_Count', 0) for store_id in store_ids)
+
+        estimated_cost = None
+        if report_engine in (ReportEngine.Python.value, ReportEngine.Vectorized.value, ReportEngine.Fleet.value):
+            estimated_cost = sum(estimate_store_costs(store_statistics.get(store_id, dict()))[report_engine]
+                                 for store_id in store_ids)
+            if report_engine == ReportEngine.Fleet.value:
+                estimated_cost += config.PLANNER_FLEET_COST_PER_BATCH * len(split_store_ids_into_batches(store_ids))
+
+        plan_step = create_plan_step(report_engine, store_ids, poll_count, estimated_cost)
+
+        report_plan = dict()
+        report_plan['Stores'] = len(store_ids)
+        report_plan['Polls'] = poll_count
+        report_plan['Estimated_Cost_In_Seconds'] = plan_step['Estimated_Cost_In_Seconds']
+        report_plan['Steps'] = [plan_step]
+        return report_plan
+
+    except Exception:
+        raise
+
+
+def explain_report_plan(report_plan: dict) -> dict:
+    try:
+        # ====================================================================
+        # The plan without the StoreIds of every step
+        # ====================================================================
+        report_plan_explanation = {key: value for key, value in report_plan.items() if key != 'Steps'}
+        report_plan_explanation['Steps'] = [{key: value for key, value in plan_step.items() if key != 'Store_Ids'}
+                                            for plan_step in report_plan['Steps']]
+        return report_plan_explanation
+
+    except Exception:
+        raise
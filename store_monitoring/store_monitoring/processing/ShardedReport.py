@@ -0,0 +1,151 @@
+import json
+import math
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas
+from httpx import TransportError
+from retrying import retry
+
+import store_monitoring.configuration as config
+from store_monitoring.CommonEnums import ShardPartitioning, StoreMonitoringShardUrl
+from store_monitoring.DASClient import get_shard_client
+from store_monitoring.DASHelper import update_request
+from store_monitoring.exception import ConnectionError
+from store_monitoring.Helper import time_it
+from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.processing.StreamingReportWriter import StreamingReportWriter
+
+logger = setup_logger()
+
+
+def partition_store_ids(store_ids: list,
+                        number_of_shards: int,
+                        shard_partitioning: str = None) -> list:
+    """
+        Description: This function splits the store_ids into number_of_shards partitions.
+        hash puts a StoreId in the shard crc32(store_id) % number_of_shards, the same StoreId always goes to the same
+        shard on every node. range gives every shard a contiguous slice of the store_ids.
+    """
+    try:
+        shard_partitioning = shard_partitioning if shard_partitioning is not None else config.SHARD_PARTITIONING
+
+        if shard_partitioning == ShardPartitioning.Range.value:
+            shard_size = math.ceil(len(store_ids) / number_of_shards)
+            return [store_ids[shard_index * shard_size:(shard_index + 1) * shard_size]
+                    for shard_index in range(number_of_shards)]
+
+        shards = [[] for _ in range(number_of_shards)]
+        for store_id in store_ids:
+            shards[zlib.crc32(str(store_id).encode()) % number_of_shards].append(store_id)
+        return shards
+
+    except Exception:
+        raise
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DAS_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_FOR_DAS_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_FOR_DAL_IN_MILLISECONDS,
+       retry_on_exception=ConnectionError.retry_if_connection_error)
+def request_shard_report(shard_worker_url: str,
+                         shard_request: dict) -> pandas.DataFrame:
+    compute_shard_url = ''
+    try:
+        compute_shard_url = shard_worker_url + StoreMonitoringShardUrl.Compute_Shard.value
+        shard_response = get_shard_client().post(url=compute_shard_url, json=shard_request)
+        shard_response.raise_for_status()
+        shard_report = shard_response.json()
+        return pandas.DataFrame(shard_report['Rows'], columns=shard_report['Columns'])
+
+    except TransportError as request_connection_error:
+        logger.error(f'Connection error at - {str(compute_shard_url)}', exc_info=True)
+        raise request_connection_error
+
+    except Exception as error:
+        logger.error(f'Exception - {str(error)}' +
+                     f'\nURL - {str(compute_shard_url)}', exc_info=True)
+        raise error
+
+
+def update_shard_progress(request_id: int,
+                          shard_progress: list):
+    try:
+        update_request(request_id=request_id,
+                       update_row_column_name='R_ShardProgress',
+                       update_row_column_value=json.dumps(shard_progress))
+
+    except Exception:
+        raise
+
+
+@time_it
+def process_stores_sharded(request_id: int,
+                           store_ids: list,
+                           as_of: datetime,
+                           windows: list,
+                           report_type: str,
+                           report_writer: StreamingReportWriter,
+                           compute_report_locally):
+    """
+        Description: This function sends every shard of the store_ids to one of the SHARD_WORKER_URLS and writes
+        the partial reports to report_writer, which puts the rows in the order of the store_ids, so the output does
+        not depend on the order the shards finish in. A shard whose worker fails is computed by this instance with
+        compute_report_locally. The status of every shard is kept in R_ShardProgress of the Request row.
+    """
+    try:
+        shards = partition_store_ids(report_writer.get_pending_store_ids(store_ids), len(config.SHARD_WORKER_URLS))
+
+        shard_progress = [{'Shard_Index': shard_index,
+                           'Worker': shard_worker_url,
+                           'Stores': len(shard_store_ids),
+                           'Status': 'Running' if len(shard_store_ids) > 0 else 'Completed'}
+                          for shard_index, (shard_worker_url, shard_store_ids)
+                          in enumerate(zip(config.SHARD_WORKER_URLS, shards))]
+        update_shard_progress(request_id, shard_progress)
+
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            shard_futures = dict()
+            for shard_index, (shard_worker_url, shard_store_ids) in enumerate(zip(config.SHARD_WORKER_URLS, shards)):
+                if len(shard_store_ids) > 0:
+                    shard_request = {'request_id': request_id,
+                                     'shard_index': shard_index,
+                                     'store_ids': shard_store_ids,
+                                     'as_of': as_of.isoformat() if as_of is not None else None,
+                                     'windows': windows,
+                                     'report_type': report_type}
+                    shard_futures[executor.submit(request_shard_report, shard_worker_url, shard_request)] = \
+                        shard_index
+
+            for shard_future in as_completed(shard_futures):
+                shard_index = shard_futures[shard_future]
+                try:
+                    shard_report_df = shard_future.result()
+
+                    # ====================================================================
+                    # A worker on an engine with other columns (trailing windows) must not be merged
+                    # ====================================================================
+                    if list(shard_report_df.columns) != report_writer.report_columns:
+                        raise ValueError(f'Shard columns {str(list(shard_report_df.columns))} do not match '
+                                         f'the report columns')
+                    shard_progress[shard_index]['Status'] = 'Completed'
+
+                except Exception:
+                    shard_report_df = None
+                    # ====================================================================
+                    # The worker is down or failed, compute its shard here
+                    # ====================================================================
+                    logger.warning(f'Shard {str(shard_index)} of request_id - {str(request_id)} failed on '
+                                   f'{str(config.SHARD_WORKER_URLS[shard_index])}, computing it locally')
+                    compute_report_locally(shards[shard_index], report_writer)
+                    shard_progress[shard_index]['Status'] = 'Computed_Locally'
+
+                if shard_report_df is not None:
+                    report_writer.write_store_outputs(shards[shard_index], shard_report_df)
+                update_shard_progress(request_id, shard_progress)
+                logger.info(f'Shard {str(shard_index)} of request_id - {str(request_id)} '
+                            f'{str(shard_progress[shard_index]["Status"])}')
+
+    except Exception:
+        raise
@@ -0,0 +1,159 @@
+import numpy
+
+from store_monitoring.TimezoneHelper import convert_utc_to_local_seconds
+from store_monitoring.processing.BusinessHours import SECONDS_IN_DAY, compile_business_hours, locate_business_hours
+from store_monitoring.processing.Vectorized import MICROSECONDS_IN_SECOND, convert_store_status_to_arrays
+
+MINUTES_IN_HOUR = 60
+MINUTES_IN_DAY = 1440
+MINUTES_IN_WEEK = 10080
+
+# ====================================================================
+# The hour, day and week end at the last poll, the columns are those of the 1h, 1d and 7d windows of the index
+# ====================================================================
+TIMELINE_REPORT_COLUMNS = ['store_id',
+                           'uptime_trailing_hour(in minutes)', 'uptime_trailing_day(in hours)',
+                           'uptime_trailing_week(in hours)',
+                           'downtime_trailing_hour(in minutes)', 'downtime_trailing_day(in hours)',
+                           'downtime_trailing_week(in hours)']
+
+# ====================================================================
+# Number of bits set in every byte value
+# ====================================================================
+POPCOUNT_TABLE = numpy.array([bin(byte_value).count('1') for byte_value in range(256)], dtype=numpy.uint8)
+
+
+def locate_local_time(utc_seconds: numpy.ndarray,
+                      store_timezone: str,
+                      business_hours: tuple) -> tuple:
+    try:
+        # ====================================================================
+        # Local date, and the business hours window of every timestamp
+        # ====================================================================
+        local_seconds = convert_utc_to_local_seconds(utc_seconds, store_timezone)
+        local_date = local_seconds // SECONDS_IN_DAY
+        seconds_of_week = ((local_date + 3) % 7) * SECONDS_IN_DAY + (local_seconds - local_date * SECONDS_IN_DAY)
+        within_business_hours, window_index, _ = locate_business_hours(business_hours, seconds_of_week)
+        return local_date, within_business_hours, window_index
+
+    except Exception:
+        raise
+
+
+def build_status_timeline(store_details: list,
+                          store_status,
+                          store_timezone: str) -> dict:
+    """
+        Description: This function builds the bit-packed minute timeline of the week ending with the last poll.
+        Bit i of every bitmap is the UTC minute End_Minute - 10079 + i.
+            Business_Hours - the minute is within the business hours of the store
+            Observed - a poll counts the minute as uptime or downtime
+            Active - a poll counts the minute as uptime
+        A minute takes the status of the next poll of the same local date and business hours window,
+        the same way an interval between two polls takes the status of the later poll.
+    """
+    try:
+        utc_microseconds, store_status_values = convert_store_status_to_arrays(store_status)
+        poll_seconds = utc_microseconds // MICROSECONDS_IN_SECOND
+
+        # ====================================================================
+        # If no StoreDetails found consider that the store was open 24*7
+        # ====================================================================
+        business_hours = compile_business_hours(store_details)
+        is_active = store_status_values == 'active'
+        is_downtime = store_status_values == 'inactive' if len(store_details) == 0 else ~is_active
+
+        # ====================================================================
+        # Only the polls within business hours, sorted by time, are carried over the minutes
+        # ====================================================================
+        poll_date, within_business_hours, poll_window = locate_local_time(poll_seconds, store_timezone,
+                                                                          business_hours)
+        sort_order = numpy.argsort(poll_seconds[within_business_hours], kind='stable')
+        within_poll_seconds = poll_seconds[within_business_hours][sort_order]
+        poll_date = poll_date[within_business_hours][sort_order]
+        poll_window = poll_window[within_business_hours][sort_order]
+        is_active = is_active[within_business_hours][sort_order]
+        is_downtime = is_downtime[within_business_hours][sort_order]
+
+        end_minute = int((poll_seconds.max() - 1) // 60)
+        timeline_minutes = numpy.arange(end_minute - MINUTES_IN_WEEK + 1, end_minute + 1, dtype=numpy.int64)
+        minute_date, minute_within_business_hours, minute_window = locate_local_time(
+            timeline_minutes * 60, store_timezone, business_hours)
+
+        # ====================================================================
+        # Find the first poll after the start of every minute, it must be in the same date and window
+        # ====================================================================
+        next_poll = numpy.searchsorted(within_poll_seconds, timeline_minutes * 60, side='right')
+        has_next_poll = next_poll < len(within_poll_seconds)
+        next_poll = numpy.minimum(next_poll, max(len(within_poll_seconds) - 1, 0))
+
+        if len(within_poll_seconds) > 0:
+            is_covered = minute_within_business_hours & has_next_poll & \
+                (poll_date[next_poll] == minute_date) & (poll_window[next_poll] == minute_window)
+            is_observed = is_covered & (is_active[next_poll] | is_downtime[next_poll])
+            is_minute_active = is_covered & is_active[next_poll]
+
+        else:
+            is_observed = numpy.zeros(MINUTES_IN_WEEK, dtype=bool)
+            is_minute_active = numpy.zeros(MINUTES_IN_WEEK, dtype=bool)
+
+        status_timeline = dict()
+        status_timeline['End_Minute'] = end_minute
+        status_timeline['Has_Polls_Within_Business_Hours'] = len(within_poll_seconds) > 0
+        status_timeline['Business_Hours'] = numpy.packbits(minute_within_business_hours)
+        status_timeline['Observed'] = numpy.packbits(is_observed)
+        status_timeline['Active'] = numpy.packbits(is_minute_active)
+        return status_timeline
+
+    except Exception:
+        raise
+
+
+def count_last_bits(bitmap: numpy.ndarray,
+                    number_of_bits: int) -> int:
+    try:
+        # ====================================================================
+        # Whole bytes from the end, then the low bits of the byte before them
+        # ====================================================================
+        full_bytes, remaining_bits = divmod(number_of_bits, 8)
+        bit_count = int(POPCOUNT_TABLE[bitmap[len(bitmap) - full_bytes:]].sum())
+
+        if remaining_bits > 0:
+            partial_byte = bitmap[len(bitmap) - full_bytes - 1] & ((1 << remaining_bits) - 1)
+            bit_count += int(POPCOUNT_TABLE[partial_byte])
+
+        return bit_count
+
+    except Exception:
+        raise
+
+
+def process_store_timeline(store_details: list,
+                           store_status,
+                           store_timezone: str,
+                           store_id: str) -> dict:
+    try:
+        status_timeline = build_status_timeline(store_details, store_status, store_timezone)
+
+        if status_timeline['Has_Polls_Within_Business_Hours']:
+            # ====================================================================
+            # Uptime = Business_Hours AND Active, Downtime = Business_Hours AND Observed AND NOT Active
+            # ====================================================================
+            uptime_bitmap = status_timeline['Business_Hours'] & status_timeline['Active']
+            downtime_bitmap = status_timeline['Business_Hours'] & status_timeline['Observed'] & \
+                ~status_timeline['Active']
+
+            final_output = dict()
+            final_output['store_id'] = store_id
+            final_output['uptime_trailing_hour(in minutes)'] = float(count_last_bits(uptime_bitmap, MINUTES_IN_HOUR))
+            final_output['uptime_trailing_day(in hours)'] = count_last_bits(uptime_bitmap, MINUTES_IN_DAY) / 60
+            final_output['uptime_trailing_week(in hours)'] = count_last_bits(uptime_bitmap, MINUTES_IN_WEEK) / 60
+            final_output['downtime_trailing_hour(in minutes)'] = float(count_last_bits(downtime_bitmap,
+                                                                                       MINUTES_IN_HOUR))
+            final_output['downtime_trailing_day(in hours)'] = count_last_bits(downtime_bitmap, MINUTES_IN_DAY) / 60
+            final_output['downtime_trailing_week(in hours)'] = count_last_bits(downtime_bitmap,
+                                                                               MINUTES_IN_WEEK) / 60
+            return final_output
+
+    except Exception:
+        raise
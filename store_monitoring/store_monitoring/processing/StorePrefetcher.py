@@ -0,0 +1,129 @@
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import store_monitoring.configuration as config
+from store_monitoring.CommonEnums import DASFetchMode
+from store_monitoring.Helper import read_store_timezone_wrapper, read_store_status_wrapper, \
+    read_store_details_wrapper, read_store_status_batch_wrapper, read_store_bundle_wrapper
+from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.ResponseDecoding import count_store_status_rows
+
+logger = setup_logger()
+
+
+def fetch_store_data(store_id,
+                     store_status=None) -> dict:
+    """
+        Description: This function reads the Timezone, the StoreStatus rows and, for a store with polls,
+        the StoreDetails rows of the store_id from the DAS. StoreStatus rows already read in a batch are passed
+        as store_status. With DAS_FETCH_MODE = bundle the three are read with one call to the DAS.
+    """
+    try:
+        if store_status is None and config.DAS_FETCH_MODE == DASFetchMode.Bundle.value:
+            store_data = read_store_bundle_wrapper(store_id)
+            if store_data is not None:
+                return store_data
+
+        store_data = dict()
+
+        # ====================================================================
+        # Get the Timezone for the StoreId from StoreTimezone table
+        # ====================================================================
+        store_data['Store_Timezone'] = read_store_timezone_wrapper(store_id)
+
+        # ====================================================================
+        # Read all the records for StoreId from the StoreStatus table
+        # ====================================================================
+        store_data['Store_Status'] = store_status if store_status is not None else read_store_status_wrapper(store_id)
+
+        # ====================================================================
+        # Read the StoreDetails using StoreId, which will give us the StartTime and EndTime of the store
+        # ====================================================================
+        store_data['Store_Details'] = read_store_details_wrapper(store_id) \
+            if count_store_status_rows(store_data['Store_Status']) > 0 else []
+
+        return store_data
+
+    except Exception:
+        raise
+
+
+def prefetch_in_order(items: list,
+                      fetch_function,
+                      prefetch_depth: int):
+    """
+        Description: This generator yields (item, fetch_function(item)) in the order of the items, while up to
+        prefetch_depth of the next items are fetched on a thread pool. prefetch_depth = 0 fetches every item
+        when it is needed.
+    """
+    if prefetch_depth <= 0:
+        for item in items:
+            yield item, fetch_function(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=prefetch_depth, thread_name_prefix='StorePrefetcher') as executor:
+        item_iterator = iter(items)
+        in_flight = deque()
+
+        for item in item_iterator:
+            in_flight.append((item, executor.submit(fetch_function, item)))
+            if len(in_flight) >= prefetch_depth:
+                break
+
+        while len(in_flight) > 0:
+            item, item_future = in_flight.popleft()
+
+            # ====================================================================
+            # Keep the window full, the next item is requested before this one is handed over
+            # ====================================================================
+            next_item = next(item_iterator, None)
+            if next_item is not None:
+                in_flight.append((next_item, executor.submit(fetch_function, next_item)))
+
+            yield item, item_future.result()
+
+
+def prefetch_store_data(store_ids: list,
+                        prefetch_depth: int = None,
+                        store_status_rows: dict = None):
+    """
+        Description: This generator yields (store_id, store_data) in the order of the store_ids, while up to
+        prefetch_depth of the next stores are read from the DAS on a thread pool.
+        The caller computes a store while the following ones are in flight, at most prefetch_depth stores
+        are held in memory. PREFETCH_DEPTH = 0 reads every store when it is needed.
+        With DAS_FETCH_MODE = bundle every store is read with one call to the bundle endpoint. Otherwise, with
+        STORE_STATUS_BATCH_SIZE > 0 the StoreStatus rows are read STORE_STATUS_BATCH_SIZE stores per call,
+        the rows of the next batch are read while the stores of the current one are handed over.
+        StoreStatus rows that were already read, keyed by str(store_id), are passed as store_status_rows.
+    """
+    prefetch_depth = prefetch_depth if prefetch_depth is not None else config.PREFETCH_DEPTH
+
+    if store_status_rows is not None:
+        yield from prefetch_in_order(store_ids, functools.partial(fetch_store_data_with_rows, store_status_rows),
+                                     prefetch_depth)
+        return
+
+    # ====================================================================
+    # A bundle is one call per store, a batch still needs the Timezone and StoreDetails calls of every store
+    # ====================================================================
+    if config.DAS_FETCH_MODE == DASFetchMode.Bundle.value or config.STORE_STATUS_BATCH_SIZE <= 0:
+        yield from prefetch_in_order(store_ids, fetch_store_data, prefetch_depth)
+        return
+
+    store_id_batches = [list(store_ids[batch_start:batch_start + config.STORE_STATUS_BATCH_SIZE])
+                        for batch_start in range(0, len(store_ids), config.STORE_STATUS_BATCH_SIZE)]
+
+    for store_id_batch, store_status_rows in prefetch_in_order(store_id_batches, read_store_status_batch_wrapper,
+                                                               min(prefetch_depth, 1)):
+        # ====================================================================
+        # Timezone and StoreDetails are still read per store, with the rows of the batch
+        # ====================================================================
+        yield from prefetch_in_order(store_id_batch,
+                                     functools.partial(fetch_store_data_with_rows, store_status_rows),
+                                     prefetch_depth)
+
+
+def fetch_store_data_with_rows(store_status_rows: dict,
+                               store_id) -> dict:
+    return fetch_store_data(store_id, store_status_rows.get(str(store_id), []))
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import store_monitoring.configuration as config
+from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.ResponseDecoding import count_store_status_rows
+from store_monitoring.processing.ReportCheckpoint import convert_to_json_value
+
+logger = setup_logger()
+
+
+def create_store_fingerprint(store_id,
+                             store_data: dict,
+                             as_of=None,
+                             report_windows: list = None,
+                             report_engine: str = None) -> str:
+    """
+        Description: This function builds the fingerprint of everything the output of a store depends on,
+        the last poll (SS_Id, or SS_TimestampUtc) and number of polls, the business hours, the timezone,
+        as_of and the windows of the report (or the engine of a report without windows).
+        Two stores with the same fingerprint have the same output row.
+    """
+    try:
+        store_status = store_data['Store_Status']
+        if isinstance(store_status, dict):
+            last_poll = int(store_status['SS_Id'].max()) if count_store_status_rows(store_status) > 0 else None
+        elif len(store_status) > 0 and 'SS_Id' in store_status[0]:
+            last_poll = max(row['SS_Id'] for row in store_status)
+        else:
+            last_poll = max((row['SS_TimestampUtc'] for row in store_status), default=None)
+
+        store_details = sorted((row['SD_Day'], str(row['SD_StartTimeLocal']), str(row['SD_EndTimeLocal']))
+                               for row in store_data['Store_Details'])
+
+        fingerprint_parts = (str(store_id), last_poll, count_store_status_rows(store_status), store_details,
+                             store_data['Store_Timezone'],
+                             as_of.isoformat() if as_of is not None else None,
+                             [report_window['Window'] for report_window in report_windows]
+                             if report_windows is not None else report_engine)
+        return hashlib.sha1(repr(fingerprint_parts).encode()).hexdigest()
+
+    except Exception:
+        raise
+
+
+class StoreResultCache:
+    """
+        Description: Output rows of stores keyed by their fingerprint, the maximum_size most recently used in memory.
+        With a cache_path every row is also written to {fingerprint}.json in it, so the rows survive a restart and
+        are shared with the process pool workers, trim() keeps the maximum_disk_size most recently used files.
+        maximum_size = 0 and no cache_path turns the cache off.
+    """
+
+    def __init__(self, maximum_size: int, cache_path: str = None, maximum_disk_size: int = 0):
+        try:
+            self.maximum_size = maximum_size
+            self.cache_path = cache_path if cache_path else None
+            self.maximum_disk_size = maximum_disk_size
+            self.store_outputs = OrderedDict()
+            self.cache_lock = threading.Lock()
+
+            if self.cache_path is not None:
+                os.makedirs(self.cache_path, exist_ok=True)
+
+        except Exception:
+            raise
+
+    def is_enabled(self) -> bool:
+        return self.maximum_size > 0 or self.cache_path is not None
+
+    def get_cache_file_path(self, store_fingerprint: str) -> str:
+        return os.path.join(self.cache_path, f'{store_fingerprint}.json')
+
+    def get(self, store_fingerprint: str) -> tuple:
+        """
+            Description: Returns (True, output row) for a cached fingerprint, else (False, None).
+        """
+        try:
+            with self.cache_lock:
+                if store_fingerprint in self.store_outputs:
+                    self.store_outputs.move_to_end(store_fingerprint)
+                    return True, self.store_outputs[store_fingerprint]
+
+            if self.cache_path is not None and os.path.exists(self.get_cache_file_path(store_fingerprint)):
+                try:
+                    with open(self.get_cache_file_path(store_fingerprint), 'r') as cache_file:
+                        store_output = json.load(cache_file)
+                    os.utime(self.get_cache_file_path(store_fingerprint))
+
+                except (OSError, ValueError):
+                    # ====================================================================
+                    # Trimmed by another process in the meantime, compute the store again
+                    # ====================================================================
+                    return False, None
+
+                self.put(store_fingerprint, store_output, is_persisted=True)
+                return True, store_output
+
+            return False, None
+
+        except Exception:
+            raise
+
+    def put(self, store_fingerprint: str, store_output, is_persisted: bool = False):
+        try:
+            if self.maximum_size > 0:
+                with self.cache_lock:
+                    self.store_outputs[store_fingerprint] = store_output
+                    self.store_outputs.move_to_end(store_fingerprint)
+                    while len(self.store_outputs) > self.maximum_size:
+                        self.store_outputs.popitem(last=False)
+
+            if self.cache_path is not None and not is_persisted:
+                # ====================================================================
+                # Write to a temporary file and rename, a reader never sees half a row
+                # ====================================================================
+                cache_file_path = self.get_cache_file_path(store_fingerprint)
+                temporary_cache_file_path = f'{cache_file_path}.{str(os.getpid())}.tmp'
+                with open(temporary_cache_file_path, 'w') as cache_file:
+                    json.dump(store_output, cache_file, default=convert_to_json_value)
+                os.replace(temporary_cache_file_path, cache_file_path)
+
+        except Exception:
+            raise
+
+    def trim(self):
+        try:
+            if self.cache_path is None or self.maximum_disk_size <= 0:
+                return
+
+            cache_file_names = [cache_file_name for cache_file_name in os.listdir(self.cache_path)
+                                if cache_file_name.endswith('.json')]
+            if len(cache_file_names) <= self.maximum_disk_size:
+                return
+
+            # ====================================================================
+            # Remove the least recently used files, a hit touches its file
+            # ====================================================================
+            cache_file_times = []
+            for cache_file_name in cache_file_names:
+                try:
+                    cache_file_times.append((os.path.getmtime(os.path.join(self.cache_path, cache_file_name)),
+                                             cache_file_name))
+                except OSError:
+                    continue
+
+            cache_file_times.sort()
+            for _, cache_file_name in cache_file_times[:len(cache_file_times) - self.maximum_disk_size]:
+                try:
+                    os.remove(os.path.join(self.cache_path, cache_file_name))
+                except OSError:
+                    continue
+
+        except Exception:
+            raise
+
+
+store_result_cache = StoreResultCache(config.STORE_RESULT_CACHE_SIZE,
+                                      config.STORE_RESULT_CACHE_PATH,
+                                      config.STORE_RESULT_CACHE_DISK_SIZE)
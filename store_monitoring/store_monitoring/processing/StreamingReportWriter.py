@@ -0,0 +1,210 @@
+import os
+
+import pandas
+
+import store_monitoring.configuration as config
+from store_monitoring.ModuleLogger import setup_logger
+from store_monitoring.processing.ReportCheckpoint import ReportCheckpoint
+
+logger = setup_logger()
+
+
+class StreamingReportWriter:
+    """
+        Description: Writes the rows of a report in the order of its store_ids while the stores finish.
+        The rows of a store are buffered until every store before it is written, then appended to
+        output_path.tmp in chunks of STREAMING_WRITER_BUFFER_ROWS rows, finalize() renames the file to output_path.
+        Without an output_path the rows are kept in memory for get_dataframe(), e.g. for the partial report of a shard.
+        With a report_checkpoint the written StoreIds and the size of output_path.tmp are checkpointed,
+        a writer for the same checkpoint truncates the file to that size and only asks for the other stores.
+    """
+
+    def __init__(self, report_columns: list, store_ids: list, output_path: str = None,
+                 report_checkpoint: ReportCheckpoint = None):
+        try:
+            self.report_columns = report_columns
+            self.output_path = output_path
+            self.report_checkpoint = report_checkpoint
+
+            self.written_store_ids = []
+            self.buffered_store_ids = []
+            self.buffered_outputs = []
+            self.buffered_row_count = 0
+            self.output_dataframes = []
+            self.output_file = None
+
+            if output_path is not None:
+                self.open_output_file()
+
+            # ====================================================================
+            # The position of every store that still has to be written, rows of a later store wait for the earlier
+            # ====================================================================
+            written_store_ids = set(self.written_store_ids)
+            self.store_positions = {store_id: position for position, store_id
+                                    in enumerate(store_id for store_id in store_ids
+                                                 if store_id not in written_store_ids)}
+            self.next_position = 0
+            self.waiting_outputs = dict()
+
+        except Exception:
+            raise
+
+    def open_output_file(self):
+        try:
+            temporary_output_path = self.output_path + '.tmp'
+
+            if self.report_checkpoint is not None and self.report_checkpoint.output_offset > 0 and \
+                    os.path.exists(temporary_output_path) and \
+                    os.path.getsize(temporary_output_path) >= self.report_checkpoint.output_offset:
+                # ====================================================================
+                # Drop whatever was written after the last checkpoint and append from there
+                # ====================================================================
+                self.output_file = open(temporary_output_path, 'r+b')
+                self.output_file.truncate(self.report_checkpoint.output_offset)
+                self.output_file.seek(self.report_checkpoint.output_offset)
+                self.written_store_ids = list(self.report_checkpoint.finished_store_ids)
+                logger.info(f'Resuming {str(temporary_output_path)} at byte {str(self.output_file.tell())}, '
+                            f'written StoreIds - {str(len(self.written_store_ids))}')
+
+            else:
+                self.output_file = open(temporary_output_path, 'wb')
+                self.output_file.write(pandas.DataFrame(columns=self.report_columns).to_csv(index=False).encode())
+
+        except Exception:
+            raise
+
+    def get_pending_store_ids(self, store_ids: list) -> list:
+        return [store_id for store_id in store_ids if store_id in self.store_positions]
+
+    def write_store_outputs(self, store_ids: list, store_outputs):
+        """
+            Description: Adds the output of finished stores, store_outputs is a list of row dicts (None for a store
+            without output) or a DataFrame with a store_id column.
+        """
+        try:
+            store_ids = self.get_pending_store_ids(store_ids)
+            if len(store_ids) == 0:
+                return
+
+            if isinstance(store_outputs, pandas.DataFrame) and len(self.waiting_outputs) == 0 and \
+                    [self.store_positions[store_id] for store_id in store_ids] == \
+                    list(range(self.next_position, self.next_position + len(store_ids))):
+                # ====================================================================
+                # A batch that comes in order is written as it is
+                # ====================================================================
+                self.buffer_output(store_ids, store_outputs)
+                self.next_position += len(store_ids)
+
+            else:
+                if isinstance(store_outputs, pandas.DataFrame):
+                    store_outputs = store_outputs.to_dict('records')
+
+                for store_id in store_ids:
+                    self.waiting_outputs[self.store_positions[store_id]] = (store_id, [])
+                for row in store_outputs:
+                    if row is not None and row['store_id'] in self.store_positions and \
+                            self.store_positions[row['store_id']] in self.waiting_outputs:
+                        self.waiting_outputs[self.store_positions[row['store_id']]][1].append(row)
+
+                while self.next_position in self.waiting_outputs:
+                    store_id, rows = self.waiting_outputs.pop(self.next_position)
+                    self.buffer_output([store_id], rows)
+                    self.next_position += 1
+
+            if self.buffered_row_count >= config.STREAMING_WRITER_BUFFER_ROWS or \
+                    (self.report_checkpoint is not None and self.report_checkpoint.is_due()):
+                self.flush()
+
+        except Exception:
+            raise
+
+    def buffer_output(self, store_ids: list, store_output):
+        self.buffered_store_ids.extend(store_ids)
+        self.buffered_outputs.append(store_output)
+        self.buffered_row_count += len(store_output)
+
+    def flush(self):
+        try:
+            if len(self.buffered_store_ids) == 0:
+                return
+
+            # ====================================================================
+            # Format the buffered rows with pandas, so the file is the same as DataFrame.to_csv of the whole report
+            # ====================================================================
+            buffered_dataframes = [buffered_output.reindex(columns=self.report_columns)
+                                   if isinstance(buffered_output, pandas.DataFrame)
+                                   else pandas.DataFrame(buffered_output, columns=self.report_columns)
+                                   for buffered_output in self.buffered_outputs if len(buffered_output) > 0]
+
+            if len(buffered_dataframes) > 0:
+                buffered_df = pandas.concat(buffered_dataframes, ignore_index=True) \
+                    if len(buffered_dataframes) > 1 else buffered_dataframes[0]
+
+                if self.output_file is not None:
+                    self.output_file.write(buffered_df.to_csv(header=False, index=False).encode())
+
+                else:
+                    self.output_dataframes.append(buffered_df)
+
+            self.written_store_ids.extend(self.buffered_store_ids)
+            self.buffered_store_ids = []
+            self.buffered_outputs = []
+            self.buffered_row_count = 0
+
+            if self.output_file is not None and self.report_checkpoint is not None:
+                # ====================================================================
+                # The checkpoint only points at bytes that are on disk
+                # ====================================================================
+                self.output_file.flush()
+                os.fsync(self.output_file.fileno())
+                self.report_checkpoint.save(self.written_store_ids, self.output_file.tell())
+
+        except Exception:
+            raise
+
+    def flush_waiting_outputs(self):
+        try:
+            # ====================================================================
+            # Stores that never got an output, e.g. not part of any plan step, do not hold the later ones back
+            # ====================================================================
+            for position in sorted(self.waiting_outputs):
+                store_id, rows = self.waiting_outputs.pop(position)
+                self.buffer_output([store_id], rows)
+            self.flush()
+
+        except Exception:
+            raise
+
+    def get_dataframe(self) -> pandas.DataFrame:
+        try:
+            self.flush_waiting_outputs()
+            if len(self.output_dataframes) > 0:
+                return pandas.concat(self.output_dataframes, ignore_index=True)
+
+            return pandas.DataFrame(columns=self.report_columns)
+
+        except Exception:
+            raise
+
+    def finalize(self) -> str:
+        try:
+            # ====================================================================
+            # The output appears under its name only once it is complete
+            # ====================================================================
+            self.flush_waiting_outputs()
+            self.output_file.close()
+            os.replace(self.output_path + '.tmp', self.output_path)
+            return self.output_path
+
+        except Exception:
+            raise
+
+    def abort(self):
+        try:
+            if self.output_file is not None:
+                self.output_file.close()
+                if os.path.exists(self.output_path + '.tmp'):
+                    os.remove(self.output_path + '.tmp')
+
+        except Exception:
+            raise
@@ -1,24 +1,40 @@
-from datetime import datetime
-
+import numpy
 import pandas
 
 from store_monitoring.Helper import calculate_time_difference, calculate_uptime_last_hour_in_minutes, \
     calculate_uptime_last_day_in_hours, calculate_uptime_last_week_in_hours, calculate_downtime_last_hour_in_minutes, \
     calculate_downtime_last_day_in_hours, calculate_downtime_last_week_in_hours
+from store_monitoring.processing.BusinessHours import SECONDS_IN_DAY, compile_business_hours, locate_business_hours
 
 
 def process_store_with_specified_time(store_details: list,
                                       store_status_df: pandas.DataFrame,
                                       store_id: str) -> dict:
     try:
-        store_details_df = pandas.DataFrame(store_details)
+        # ====================================================================
+        # Compile the business hours of the store once and locate every row in them
+        # ====================================================================
+        business_hours = compile_business_hours(store_details)
+
+        local_timestamp = store_status_df['SS_LocalTimestamp']
+        start_of_day = store_status_df['SS_Day'].to_numpy(dtype=numpy.int64) * SECONDS_IN_DAY
+        seconds_of_week = start_of_day + (local_timestamp.dt.hour * 3600 + local_timestamp.dt.minute * 60 +
+                                          local_timestamp.dt.second).to_numpy(dtype=numpy.int64)
+        within_business_hours, window_index, window_start = locate_business_hours(business_hours, seconds_of_week)
+
+        # ====================================================================
+        # A window that started the day before is measured from midnight
+        # ====================================================================
+        store_status_df['Within_Business_Hours'] = within_business_hours
+        store_status_df['Window_Index'] = window_index
+        store_status_df['Window_Start_Time'] = (pandas.Timestamp(0) + pandas.to_timedelta(
+            numpy.maximum(window_start - start_of_day, 0), unit='s')).time
 
         # ====================================================================
         # Group by on the basis of same date
         # ====================================================================
         grouped_on_date = store_status_df.groupby(store_status_df['SS_LocalTimestamp'].dt.date)
         uptime_and_downtime = grouped_on_date.apply(calculate_final_uptime_and_downtime_for_time_specified,
-                                                    store_details_df=store_details_df,
                                                     store_id=store_id)
 
         if len(uptime_and_downtime) > 0:
@@ -44,75 +60,62 @@ def process_store_with_specified_time(store_details: list,
 
 
 def calculate_final_uptime_and_downtime_for_time_specified(current_group: pandas.DataFrame,
-                                                           store_details_df: pandas.DataFrame,
                                                            store_id: str) -> dict:
     try:
         # ====================================================================
-        # Get the row from store_details_df['SD_Day'] SD_Day = group['SS_Day']
-        # This will help us understand the StartTime and EndTime of the store on the given Day
+        # Filter the rows that fall within the business hours of the store
         # ====================================================================
-        store_day_details = store_details_df[store_details_df['SD_Day'] == int(current_group['SS_Day'].iloc[0])]
+        filtered_df = current_group[current_group['Within_Business_Hours']].copy()
 
-        if len(store_day_details) > 0:
-            current_day = int(store_day_details['SD_Day'].iloc[0])
-            store_start_time = datetime.strptime(store_day_details['SD_StartTimeLocal'].iloc[0],
-                                                 '%H:%M:%S').time()
-            store_end_time = datetime.strptime(store_day_details['SD_EndTimeLocal'].iloc[0],
-                                               '%H:%M:%S').time()
+        if len(filtered_df) > 0:
+            current_day = int(filtered_df['SS_Day'].iloc[0])
 
             # ====================================================================
             # Extract time from the Timestamp from group
             # ====================================================================
-            current_group['Time'] = current_group['SS_LocalTimestamp'].dt.time
-            current_date = current_group['SS_LocalTimestamp'].dt.date.iloc[0]
-
-            # ====================================================================
-            # Filter the rows that fall within the StartTime and EndTime of the store
-            # ====================================================================
-            filtered_df = current_group[(current_group['Time'] >= store_start_time) &
-                                        (current_group['Time'] <= store_end_time)]
-
-            if len(filtered_df) > 0:
-                # ====================================================================
-                # Add a new column 'Previous_Time' with the time of the previous row
-                # ====================================================================
-                filtered_df['Previous_Time'] = filtered_df['Time'].shift(1)
-
-                # ====================================================================
-                # Calculate the uptime and downtime for the store
-                # ====================================================================
-                result_df = filtered_df.apply(calculate_uptime_and_down_for_time_specified,
-                                              store_start_time=store_start_time,
-                                              axis=1,
-                                              result_type='expand')
-
-                # ====================================================================
-                # Rename the columns of the result DataFrame
-                # ====================================================================
-                result_df.columns = ['Uptime_In_Seconds', 'Downtime_In_Seconds',
-                                     'Uptime_Last_Hour_In_Seconds', 'Downtime_Last_Hour_In_Seconds']
-
-                # ====================================================================
-                # Combine the original DataFrame and the result DataFrame
-                # ====================================================================
-                final_df = pandas.concat([filtered_df, result_df], axis=1)
-
-                output_dict = dict()
-                output_dict['Store_Id'] = store_id
-                output_dict['Day'] = current_day
-                output_dict['Date'] = current_date
-                output_dict['Uptime_In_Seconds'] = int(final_df['Uptime_In_Seconds'].sum())
-                output_dict['Downtime_In_Seconds'] = int(final_df['Downtime_In_Seconds'].sum())
-                output_dict['Uptime_Last_Hour_In_Seconds'] = int(final_df['Uptime_Last_Hour_In_Seconds'].iloc[-1])
-                output_dict['Downtime_Last_Hour_In_Seconds'] = int(final_df['Downtime_Last_Hour_In_Seconds'].iloc[-1])
-                return output_dict
+            filtered_df['Time'] = filtered_df['SS_LocalTimestamp'].dt.time
+            current_date = filtered_df['SS_LocalTimestamp'].dt.date.iloc[0]
+
+            # ====================================================================
+            # Add a new column 'Previous_Time' with the time of the previous row of the same window
+            # ====================================================================
+            filtered_df['Previous_Time'] = filtered_df['Time'].shift(1)
+            is_first_row_of_window = filtered_df['Window_Index'] != filtered_df['Window_Index'].shift(1)
+            filtered_df.loc[is_first_row_of_window, 'Previous_Time'] = None
+
+            # ====================================================================
+            # Calculate the uptime and downtime for the store
+            # ====================================================================
+            result_df = filtered_df.apply(calculate_uptime_and_down_for_time_specified,
+                                          axis=1,
+                                          result_type='expand')
+
+            # ====================================================================
+            # Rename the columns of the result DataFrame
+            # ====================================================================
+            result_df.columns = ['Uptime_In_Seconds', 'Downtime_In_Seconds',
+                                 'Uptime_Last_Hour_In_Seconds', 'Downtime_Last_Hour_In_Seconds']
+
+            # ====================================================================
+            # Combine the original DataFrame and the result DataFrame
+            # ====================================================================
+            final_df = pandas.concat([filtered_df, result_df], axis=1)
+
+            output_dict = dict()
+            output_dict['Store_Id'] = store_id
+            output_dict['Day'] = current_day
+            output_dict['Date'] = current_date
+            output_dict['Uptime_In_Seconds'] = int(final_df['Uptime_In_Seconds'].sum())
+            output_dict['Downtime_In_Seconds'] = int(final_df['Downtime_In_Seconds'].sum())
+            output_dict['Uptime_Last_Hour_In_Seconds'] = int(final_df['Uptime_Last_Hour_In_Seconds'].iloc[-1])
+            output_dict['Downtime_Last_Hour_In_Seconds'] = int(final_df['Downtime_Last_Hour_In_Seconds'].iloc[-1])
+            return output_dict
 
     except Exception:
         raise
 
 
-def calculate_uptime_and_down_for_time_specified(current_row: pandas.Series,
-                                                 store_start_time: str):
+def calculate_uptime_and_down_for_time_specified(current_row: pandas.Series):
     try:
         uptime_in_seconds = 0
         downtime_in_seconds = 0
@@ -125,7 +128,7 @@ def calculate_uptime_and_down_for_time_specified(current_row: pandas.Series,
             # ====================================================================
             # Calculate the difference
             # ====================================================================
-            difference_in_time = calculate_time_difference(store_start_time, current_time)
+            difference_in_time = calculate_time_difference(current_row['Window_Start_Time'], current_time)
 
         else:
             difference_in_time = calculate_time_difference(previous_time, current_time)
@@ -0,0 +1,262 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+import numpy
+
+from store_monitoring.TimezoneHelper import EPOCH, get_utc_offsets, convert_utc_to_local_microseconds
+from store_monitoring.processing.BusinessHours import SECONDS_IN_DAY, compile_business_hours, locate_business_hours
+from store_monitoring.processing.Vectorized import MICROSECONDS_IN_SECOND, convert_store_status_to_arrays, \
+    split_local_microseconds
+
+MONTH_TO_DATE_WINDOW = 'mtd'
+
+# ====================================================================
+# Seconds in every window unit, a window is written as <count><unit>, e.g. 30d
+# ====================================================================
+WINDOW_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': SECONDS_IN_DAY, 'w': 7 * SECONDS_IN_DAY}
+WINDOW_PATTERN = re.compile(r'^([1-9][0-9]*)([mhdw])$')
+
+# ====================================================================
+# Windows with a column name of their own, e.g. uptime_trailing_hour(in minutes) for 1h
+# ====================================================================
+WINDOW_COLUMN_NAMES = {'1h': 'hour', '1d': 'day', '7d': 'week', MONTH_TO_DATE_WINDOW: 'month_to_date'}
+
+
+def parse_report_windows(windows: list) -> list:
+    """
+        Description: This function parses window lengths like 1h, 1d, 30d or mtd (month-to-date).
+        Windows of up to an hour are reported in minutes, the rest in hours.
+        Raises ValueError for an unknown window.
+    """
+    try:
+        report_windows = []
+        for window in windows:
+            window = window.strip().lower()
+
+            if window == MONTH_TO_DATE_WINDOW:
+                duration_in_seconds = None
+
+            else:
+                window_match = WINDOW_PATTERN.match(window)
+                if window_match is None:
+                    raise ValueError(f'Invalid report window - {str(window)}')
+                duration_in_seconds = int(window_match.group(1)) * WINDOW_UNIT_SECONDS[window_match.group(2)]
+
+            report_window = dict()
+            report_window['Window'] = window
+            report_window['Column_Name'] = WINDOW_COLUMN_NAMES.get(window, window)
+            report_window['Duration_In_Seconds'] = duration_in_seconds
+            report_window['Unit'] = 'minutes' if duration_in_seconds is not None and duration_in_seconds <= 3600 \
+                else 'hours'
+            report_windows.append(report_window)
+
+        return report_windows
+
+    except Exception:
+        raise
+
+
+def get_window_column(measure: str,
+                      report_window: dict) -> str:
+    """
+        Description: The column of the uptime or downtime of a window. The windows end at as_of or the last poll,
+        not at the end of the last local date like the uptime_last_* columns of the other engines, so their columns
+        are named uptime_trailing_* and downtime_trailing_*.
+    """
+    return f'{measure}_trailing_{report_window["Column_Name"]}(in {report_window["Unit"]})'
+
+
+def get_report_columns(report_windows: list) -> list:
+    try:
+        return ['store_id'] + \
+            [get_window_column('uptime', report_window) for report_window in report_windows] + \
+            [get_window_column('downtime', report_window) for report_window in report_windows]
+
+    except Exception:
+        raise
+
+
+def convert_datetime_to_utc_seconds(timestamp: datetime) -> int:
+    try:
+        # ====================================================================
+        # A timestamp without timezone is taken as UTC
+        # ====================================================================
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+        return int((timestamp - EPOCH).total_seconds())
+
+    except Exception:
+        raise
+
+
+def build_uptime_index(store_details: list,
+                       store_status,
+                       store_timezone: str) -> dict:
+    """
+        Description: This function builds the cumulative uptime and downtime index of a store.
+        Every poll within business hours closes the interval [previous poll, poll) in UTC seconds, the first poll
+        of a local date and business hours window is measured from the start of the window (or midnight).
+        The intervals never overlap, Cumulative_Uptime[i] is the uptime of the first i intervals.
+    """
+    try:
+        utc_microseconds, store_status_values = convert_store_status_to_arrays(store_status)
+
+        # ====================================================================
+        # The index is searched by time, sort the polls by their timestamp
+        # ====================================================================
+        sort_order = numpy.argsort(utc_microseconds, kind='stable')
+        utc_microseconds = utc_microseconds[sort_order]
+        store_status_values = store_status_values[sort_order]
+
+        local_date, local_day, time_of_day_microseconds = split_local_microseconds(
+            convert_utc_to_local_microseconds(utc_microseconds, store_timezone))
+        time_of_day_seconds = time_of_day_microseconds // MICROSECONDS_IN_SECOND
+
+        # ====================================================================
+        # Keep the polls within the business hours of the store
+        # ====================================================================
+        start_of_day = local_day * SECONDS_IN_DAY
+        within_business_hours, window_index, window_start = locate_business_hours(
+            compile_business_hours(store_details), start_of_day + time_of_day_seconds)
+
+        utc_seconds = utc_microseconds[within_business_hours] // MICROSECONDS_IN_SECOND
+        local_date = local_date[within_business_hours]
+        window_index = window_index[within_business_hours]
+        time_of_day_seconds = time_of_day_seconds[within_business_hours]
+        window_start_seconds = numpy.maximum(window_start - start_of_day, 0)[within_business_hours]
+        store_status_values = store_status_values[within_business_hours]
+
+        is_first_row_of_window = numpy.ones(len(utc_seconds), dtype=bool)
+        is_first_row_of_window[1:] = (local_date[1:] != local_date[:-1]) | (window_index[1:] != window_index[:-1])
+
+        # ====================================================================
+        # A 24*7 store only counts 'inactive' as downtime, else everything that is not 'active'
+        # ====================================================================
+        is_uptime = store_status_values == 'active'
+        is_downtime = store_status_values == 'inactive' if len(store_details) == 0 else ~is_uptime
+
+        # ====================================================================
+        # Consecutive polls are measured in UTC, local time goes backwards when the clocks fall back,
+        # the first poll of a window from the start of the window in local time
+        # ====================================================================
+        interval_lengths = numpy.empty_like(utc_seconds)
+        interval_lengths[1:] = utc_seconds[1:] - utc_seconds[:-1]
+        interval_lengths = numpy.where(is_first_row_of_window,
+                                       numpy.maximum(time_of_day_seconds - window_start_seconds, 0),
+                                       interval_lengths)
+
+        uptime_index = dict()
+        uptime_index['Last_Poll'] = int(utc_microseconds[-1] // MICROSECONDS_IN_SECOND)
+        uptime_index['Interval_Starts'] = utc_seconds - interval_lengths
+        uptime_index['Interval_Ends'] = utc_seconds
+        uptime_index['Is_Uptime'] = is_uptime
+        uptime_index['Is_Downtime'] = is_downtime
+        uptime_index['Cumulative_Uptime'] = numpy.concatenate(
+            ([0], numpy.cumsum(numpy.where(is_uptime, interval_lengths, 0))))
+        uptime_index['Cumulative_Downtime'] = numpy.concatenate(
+            ([0], numpy.cumsum(numpy.where(is_downtime, interval_lengths, 0))))
+        return uptime_index
+
+    except Exception:
+        raise
+
+
+def calculate_covered_seconds(uptime_index: dict,
+                              utc_seconds: numpy.ndarray) -> tuple:
+    try:
+        # ====================================================================
+        # All the intervals ending at or before the timestamp, plus the part of the interval it falls in
+        # ====================================================================
+        interval_starts = uptime_index['Interval_Starts']
+        ended_intervals = numpy.searchsorted(uptime_index['Interval_Ends'], utc_seconds, side='right')
+        uptime_in_seconds = uptime_index['Cumulative_Uptime'][ended_intervals]
+        downtime_in_seconds = uptime_index['Cumulative_Downtime'][ended_intervals]
+
+        if len(interval_starts) > 0:
+            open_interval = numpy.minimum(ended_intervals, len(interval_starts) - 1)
+            partial_seconds = numpy.where(ended_intervals < len(interval_starts),
+                                          numpy.maximum(utc_seconds - interval_starts[open_interval], 0), 0)
+            uptime_in_seconds = uptime_in_seconds + numpy.where(uptime_index['Is_Uptime'][open_interval],
+                                                                partial_seconds, 0)
+            downtime_in_seconds = downtime_in_seconds + numpy.where(uptime_index['Is_Downtime'][open_interval],
+                                                                    partial_seconds, 0)
+
+        return uptime_in_seconds, downtime_in_seconds
+
+    except Exception:
+        raise
+
+
+def calculate_uptime_and_downtime_in_window(uptime_index: dict,
+                                            window_start: numpy.ndarray,
+                                            window_end: numpy.ndarray) -> tuple:
+    """
+        Description: This function returns the uptime and downtime in seconds within [window_start, window_end)
+        using two binary searches per window.
+    """
+    try:
+        uptime_at_start, downtime_at_start = calculate_covered_seconds(uptime_index, window_start)
+        uptime_at_end, downtime_at_end = calculate_covered_seconds(uptime_index, window_end)
+        return uptime_at_end - uptime_at_start, downtime_at_end - downtime_at_start
+
+    except Exception:
+        raise
+
+
+def calculate_month_start(as_of_seconds: int,
+                          store_timezone: str) -> int:
+    try:
+        # ====================================================================
+        # Midnight of the 1st of the month in the store's timezone, as UTC seconds
+        # ====================================================================
+        utc_offset = int(get_utc_offsets(numpy.array([as_of_seconds]), store_timezone)[0])
+        local_as_of = EPOCH + timedelta(seconds=as_of_seconds + utc_offset)
+        local_month_start = int((local_as_of.replace(day=1, hour=0, minute=0, second=0, microsecond=0) -
+                                 EPOCH).total_seconds())
+
+        utc_offset = int(get_utc_offsets(numpy.array([local_month_start - utc_offset]), store_timezone)[0])
+        return local_month_start - utc_offset
+
+    except Exception:
+        raise
+
+
+def process_store_uptime_index(store_details: list,
+                               store_status,
+                               store_timezone: str,
+                               store_id: str,
+                               as_of: datetime,
+                               report_windows: list) -> dict:
+    try:
+        uptime_index = build_uptime_index(store_details, store_status, store_timezone)
+
+        if len(uptime_index['Interval_Ends']) > 0:
+            # ====================================================================
+            # Without as_of the windows end at the last poll of the store
+            # ====================================================================
+            as_of_seconds = convert_datetime_to_utc_seconds(as_of) if as_of is not None \
+                else uptime_index['Last_Poll']
+
+            window_starts = numpy.array([as_of_seconds - report_window['Duration_In_Seconds']
+                                         if report_window['Duration_In_Seconds'] is not None
+                                         else calculate_month_start(as_of_seconds, store_timezone)
+                                         for report_window in report_windows], dtype=numpy.int64)
+            window_ends = numpy.full(len(report_windows), as_of_seconds, dtype=numpy.int64)
+            uptime_in_seconds, downtime_in_seconds = calculate_uptime_and_downtime_in_window(
+                uptime_index, window_starts, window_ends)
+
+            final_output = dict()
+            final_output['store_id'] = store_id
+            for report_window, window_uptime in zip(report_windows, uptime_in_seconds):
+                divisor = 60 if report_window['Unit'] == 'minutes' else 3600
+                final_output[get_window_column('uptime', report_window)] = float(window_uptime) / divisor
+
+            for report_window, window_downtime in zip(report_windows, downtime_in_seconds):
+                divisor = 60 if report_window['Unit'] == 'minutes' else 3600
+                final_output[get_window_column('downtime', report_window)] = float(window_downtime) / divisor
+
+            return final_output
+
+    except Exception:
+        raise
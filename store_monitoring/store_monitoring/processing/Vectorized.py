@@ -0,0 +1,226 @@
+import numpy
+import pandas
+
+from store_monitoring.TimezoneHelper import convert_utc_to_local_microseconds
+from store_monitoring.processing.BusinessHours import SECONDS_IN_DAY, SECONDS_IN_WEEK, compile_business_hours, \
+    locate_business_hours
+
+MICROSECONDS_IN_SECOND = 1000000
+MICROSECONDS_IN_DAY = SECONDS_IN_DAY * MICROSECONDS_IN_SECOND
+
+REPORT_COLUMNS = ['store_id',
+                  'uptime_last_hour(in minutes)', 'uptime_last_day(in hours)', 'uptime_last_week(in hours)',
+                  'downtime_last_hour(in minutes)', 'downtime_last_day(in hours)', 'downtime_last_week(in hours)']
+
+
+def convert_timestamp_utc_to_microseconds(timestamp_utc: pandas.Series) -> numpy.ndarray:
+    try:
+        # ====================================================================
+        # Parse the TimestampUTC column into int64 epoch microseconds
+        # ====================================================================
+        timestamp_utc = pandas.to_datetime(timestamp_utc, utc=True, format='ISO8601').dt.tz_localize(None)
+        return timestamp_utc.to_numpy(dtype='datetime64[us]').view(numpy.int64)
+
+    except Exception:
+        raise
+
+
+def convert_store_status_to_arrays(store_status) -> tuple:
+    """
+        Description: Returns the SS_TimestampUtc (int64 epoch microseconds) and SS_StoreStatus arrays of the StoreStatus
+        rows of a store, the columns of a msgpack or Arrow response are already in this form.
+    """
+    try:
+        if isinstance(store_status, dict):
+            return store_status['SS_TimestampUtc'], store_status['SS_StoreStatus']
+
+        store_status_df = pandas.DataFrame(store_status, columns=['SS_TimestampUtc', 'SS_StoreStatus'])
+        return convert_timestamp_utc_to_microseconds(store_status_df['SS_TimestampUtc']), \
+            store_status_df['SS_StoreStatus'].to_numpy()
+
+    except Exception:
+        raise
+
+
+def split_local_microseconds(local_microseconds: numpy.ndarray) -> tuple:
+    try:
+        # ====================================================================
+        # Split the local timestamp into the local date and the time of the day
+        # ====================================================================
+        local_date = local_microseconds // MICROSECONDS_IN_DAY
+        time_of_day_microseconds = local_microseconds - local_date * MICROSECONDS_IN_DAY
+
+        # ====================================================================
+        # 1st Jan 1970 was a Thursday, use it to identify the Day (0=Monday, 6=Sunday)
+        # ====================================================================
+        local_day = (local_date + 3) % 7
+        return local_date, local_day, time_of_day_microseconds
+
+    except Exception:
+        raise
+
+
+def calculate_daily_uptime_and_downtime(store_index: numpy.ndarray,
+                                        local_date: numpy.ndarray,
+                                        window_index: numpy.ndarray,
+                                        time_of_day_seconds: numpy.ndarray,
+                                        start_time_seconds: numpy.ndarray,
+                                        is_uptime: numpy.ndarray,
+                                        is_downtime: numpy.ndarray) -> tuple:
+    try:
+        # ====================================================================
+        # Stable sort on (store, date), the rows of a date keep their original order
+        # ====================================================================
+        sort_order = numpy.lexsort((local_date, store_index))
+        store_index = store_index[sort_order]
+        local_date = local_date[sort_order]
+        window_index = window_index[sort_order]
+        time_of_day_seconds = time_of_day_seconds[sort_order]
+
+        # ====================================================================
+        # The first row of every date and business hours window is measured from the start time of the window,
+        # the rest from the previous row
+        # ====================================================================
+        is_first_row_of_date = numpy.empty(len(local_date), dtype=bool)
+        is_first_row_of_date[0] = True
+        is_first_row_of_date[1:] = (local_date[1:] != local_date[:-1]) | (store_index[1:] != store_index[:-1])
+        is_first_row_of_window = is_first_row_of_date.copy()
+        is_first_row_of_window[1:] |= window_index[1:] != window_index[:-1]
+
+        previous_time_seconds = numpy.empty_like(time_of_day_seconds)
+        previous_time_seconds[1:] = time_of_day_seconds[:-1]
+        previous_time_seconds = numpy.where(is_first_row_of_window, start_time_seconds[sort_order],
+                                            previous_time_seconds)
+        difference_in_time = numpy.abs(time_of_day_seconds - previous_time_seconds)
+
+        uptime_in_seconds = numpy.where(is_uptime[sort_order], difference_in_time, 0)
+        downtime_in_seconds = numpy.where(is_downtime[sort_order], difference_in_time, 0)
+
+        # ====================================================================
+        # Sum the uptime and downtime per date, the last row of a date gives the last hour
+        # ====================================================================
+        date_starts = numpy.flatnonzero(is_first_row_of_date)
+        date_ends = numpy.append(date_starts[1:], len(local_date)) - 1
+
+        return (store_index[date_starts],
+                local_date[date_starts],
+                numpy.add.reduceat(uptime_in_seconds, date_starts),
+                numpy.add.reduceat(downtime_in_seconds, date_starts),
+                uptime_in_seconds[date_ends],
+                downtime_in_seconds[date_ends])
+
+    except Exception:
+        raise
+
+
+def calculate_final_output(store_ids: list,
+                           date_store_index: numpy.ndarray,
+                           dates: numpy.ndarray,
+                           uptime_in_seconds: numpy.ndarray,
+                           downtime_in_seconds: numpy.ndarray,
+                           uptime_last_hour_in_seconds: numpy.ndarray,
+                           downtime_last_hour_in_seconds: numpy.ndarray) -> dict:
+    try:
+        # ====================================================================
+        # The dates are sorted per store, find the first and the last date of every store
+        # ====================================================================
+        is_first_date_of_store = numpy.empty(len(dates), dtype=bool)
+        is_first_date_of_store[0] = True
+        is_first_date_of_store[1:] = date_store_index[1:] != date_store_index[:-1]
+        store_starts = numpy.flatnonzero(is_first_date_of_store)
+        store_ends = numpy.append(store_starts[1:], len(dates)) - 1
+
+        # ====================================================================
+        # Select the dates within the last 7 days of the last date of the store
+        # ====================================================================
+        last_date = numpy.repeat(dates[store_ends], numpy.diff(numpy.append(store_starts, len(dates))))
+        recent_dates = dates >= last_date - 7
+
+        final_output = dict()
+        final_output['store_id'] = [store_ids[store_index] for store_index in date_store_index[store_starts]]
+        final_output['uptime_last_hour(in minutes)'] = uptime_last_hour_in_seconds[store_ends] / 60
+        final_output['uptime_last_day(in hours)'] = uptime_in_seconds[store_ends] / 3600
+        final_output['uptime_last_week(in hours)'] = \
+            numpy.add.reduceat(numpy.where(recent_dates, uptime_in_seconds, 0), store_starts) / 3600
+        final_output['downtime_last_hour(in minutes)'] = downtime_last_hour_in_seconds[store_ends] / 60
+        final_output['downtime_last_day(in hours)'] = downtime_in_seconds[store_ends] / 3600
+        final_output['downtime_last_week(in hours)'] = \
+            numpy.add.reduceat(numpy.where(recent_dates, downtime_in_seconds, 0), store_starts) / 3600
+        return final_output
+
+    except Exception:
+        raise
+
+
+def calculate_uptime_and_downtime_for_stores(store_ids: list,
+                                             store_index: numpy.ndarray,
+                                             local_microseconds: numpy.ndarray,
+                                             store_status_values: numpy.ndarray,
+                                             is_open_24_7: numpy.ndarray,
+                                             business_hours: tuple) -> dict:
+    """
+        Description: This function calculates the report columns for all the stores in one pass.
+        Rows are identified by store_index, business_hours is the combined index of the stores.
+        Stores without any row within their business hours are not part of the output.
+    """
+    try:
+        local_date, local_day, time_of_day_microseconds = split_local_microseconds(local_microseconds)
+        time_of_day_seconds = time_of_day_microseconds // MICROSECONDS_IN_SECOND
+
+        # ====================================================================
+        # Find the rows that fall within the business hours of the store
+        # ====================================================================
+        start_of_day = store_index * SECONDS_IN_WEEK + local_day * SECONDS_IN_DAY
+        within_business_hours, window_index, window_start = locate_business_hours(
+            business_hours, start_of_day + time_of_day_seconds)
+
+        if not within_business_hours.any():
+            return {column: [] for column in REPORT_COLUMNS}
+
+        is_open_24_7 = is_open_24_7[store_index[within_business_hours]]
+        store_status_values = store_status_values[within_business_hours]
+        is_active = store_status_values == 'active'
+
+        # ====================================================================
+        # The first row of a window is measured from the start of the window, or midnight if it started the day
+        # before. A 24*7 store only counts 'inactive' as downtime, else everything that is not 'active'
+        # ====================================================================
+        daily_uptime_and_downtime = calculate_daily_uptime_and_downtime(
+            store_index[within_business_hours],
+            local_date[within_business_hours],
+            window_index[within_business_hours],
+            time_of_day_seconds[within_business_hours],
+            numpy.maximum(window_start - start_of_day, 0)[within_business_hours],
+            is_active,
+            numpy.where(is_open_24_7, store_status_values == 'inactive', ~is_active))
+
+        return calculate_final_output(store_ids, *daily_uptime_and_downtime)
+
+    except Exception:
+        raise
+
+
+def process_store_vectorized(store_details: list,
+                             store_status,
+                             store_timezone: str,
+                             store_id: str) -> dict:
+    try:
+        utc_microseconds, store_status_values = convert_store_status_to_arrays(store_status)
+
+        # ====================================================================
+        # If no StoreDetails found consider that the store was open 24*7
+        # ====================================================================
+        final_output = calculate_uptime_and_downtime_for_stores(
+            [store_id],
+            numpy.zeros(len(utc_microseconds), dtype=numpy.int64),
+            convert_utc_to_local_microseconds(utc_microseconds, store_timezone),
+            store_status_values,
+            numpy.array([len(store_details) == 0]),
+            compile_business_hours(store_details))
+
+        if len(final_output['store_id']) > 0:
+            return {column: (final_output[column][0] if column == 'store_id' else float(final_output[column][0]))
+                    for column in REPORT_COLUMNS}
+
+    except Exception:
+        raise
@@ -19,5 +19,6 @@ setuptools.setup(
     python_requires='>=3.6',
     include_package_data=True,
     install_requires=['uvicorn>=0.16.0', 'fastapi>=0.83.0', 'sqlalchemy>=1.4.46', 'mysql_connector_python>=8.0.25',
-                      'configparser>=6.0.0', 'retrying>=1.3.4']
+                      'configparser>=6.0.0', 'retrying>=1.3.4'],
+    extras_require={'arrow': ['pyarrow>=12.0.0'], 'msgpack': ['msgpack>=1.0.0']}
 )
@@ -31,6 +31,22 @@ class OrderBy(Enum):
     Descending = 'desc'
 
 
+class ExportFormat(Enum):
+    NDJSON = 'ndjson'
+    Arrow = 'arrow'
+
+
+class MediaType(Enum):
+    JSON = 'application/json'
+    MessagePack = 'application/msgpack'
+    Arrow = 'application/vnd.apache.arrow.stream'
+
+
+class StoreStatusValue(Enum):
+    Active = 'active'
+    Inactive = 'inactive'
+
+
 class RequestLifeCycle(Enum):
     Request_Received = 1
     Request_Sent_For_Processing = 2
@@ -0,0 +1,146 @@
+import json
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from store_monitoring_das.CommonEnums import MediaType, StoreStatusValue
+from store_monitoring_das.ModuleLogger import setup_logger
+
+try:
+    import msgpack
+
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow
+
+except ImportError:
+    pyarrow = None
+
+logger = setup_logger()
+
+EPOCH = datetime(1970, 1, 1)
+
+STORE_STATUS_COLUMNS = ['SS_Id', 'SD_StoreId', 'SS_StoreStatus', 'SS_TimestampUtc']
+
+
+def negotiate_media_type(accept: str = None) -> str:
+    """
+        Description: Picks the format of a read response from the Accept header of the request, msgpack or Arrow
+        when the client asks for it and the package is installed, else JSON.
+    """
+    accept = accept if accept is not None else ''
+
+    if MediaType.MessagePack.value in accept and msgpack is not None:
+        return MediaType.MessagePack.value
+
+    if MediaType.Arrow.value in accept and pyarrow is not None:
+        return MediaType.Arrow.value
+
+    return MediaType.JSON.value
+
+
+def encode_store_status_columns(store_status_rows: list) -> dict:
+    """
+        Description: This function turns the StoreStatus rows into columns. SS_TimestampUtc becomes integer
+        microseconds since the epoch and SS_StoreStatus a code, the index into SS_StoreStatus_Values.
+    """
+    try:
+        store_status_values = [store_status_value.value for store_status_value in StoreStatusValue]
+        store_status_codes = {store_status_value: code for code, store_status_value in enumerate(store_status_values)}
+
+        store_status_columns = {'SS_Id': [row['SS_Id'] for row in store_status_rows],
+                                'SD_StoreId': [row['SD_StoreId'] for row in store_status_rows],
+                                'SS_StoreStatus': [],
+                                'SS_TimestampUtc': [(row['SS_TimestampUtc'] - EPOCH) // timedelta(microseconds=1)
+                                                    for row in store_status_rows]}
+
+        for row in store_status_rows:
+            # ========================================================================
+            # A status outside of StoreStatusValue gets the next code
+            # ========================================================================
+            if row['SS_StoreStatus'] not in store_status_codes:
+                store_status_codes[row['SS_StoreStatus']] = len(store_status_values)
+                store_status_values.append(row['SS_StoreStatus'])
+            store_status_columns['SS_StoreStatus'].append(store_status_codes[row['SS_StoreStatus']])
+
+        store_status_columns['SS_StoreStatus_Values'] = store_status_values
+        return store_status_columns
+
+    except Exception:
+        raise
+
+
+def create_arrow_payload(output_response: dict, columns_key: str) -> bytes:
+    """
+        Description: An Arrow IPC stream of one table with the StoreStatus rows of the response,
+        the rest of the response is sent as JSON in the schema metadata.
+    """
+    try:
+        if columns_key == 'Stores':
+            store_status_rows = [row for store in output_response['Stores'] for row in store['Rows']]
+            output_metadata = dict(output_response, Stores=[{'StoreId': store['StoreId']}
+                                                            for store in output_response['Stores']])
+        else:
+            store_status_rows = output_response.get(columns_key, [])
+            output_metadata = {key: value for key, value in output_response.items() if key != columns_key}
+        output_metadata['Columns_Key'] = columns_key
+
+        store_status_columns = encode_store_status_columns(store_status_rows)
+        store_status_table = pyarrow.table({
+            'SS_Id': pyarrow.array(store_status_columns['SS_Id'], type=pyarrow.int64()),
+            'SD_StoreId': pyarrow.array(store_status_columns['SD_StoreId'], type=pyarrow.int64()),
+            'SS_StoreStatus': pyarrow.DictionaryArray.from_arrays(
+                pyarrow.array(store_status_columns['SS_StoreStatus'], type=pyarrow.int8()),
+                pyarrow.array(store_status_columns['SS_StoreStatus_Values'], type=pyarrow.string())),
+            'SS_TimestampUtc': pyarrow.array(store_status_columns['SS_TimestampUtc'], type=pyarrow.int64())})
+        store_status_table = store_status_table.replace_schema_metadata(
+            {'response': json.dumps(jsonable_encoder(output_metadata))})
+
+        payload_sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(payload_sink, store_status_table.schema) as payload_writer:
+            payload_writer.write_table(store_status_table)
+
+        return payload_sink.getvalue().to_pybytes()
+
+    except Exception:
+        raise
+
+
+def create_negotiated_response(output_response: dict, columns_key: str, accept: str = None):
+    """
+        Description: This function returns a read response in the format the client asked for in the Accept header.
+        JSON keeps the rows as they are. msgpack and Arrow send the StoreStatus rows under columns_key
+        ('Rows', 'Store_Status', or 'Stores' for the rows of every store) as columns, see encode_store_status_columns.
+    """
+    try:
+        media_type = negotiate_media_type(accept)
+        if media_type == MediaType.JSON.value or output_response is None:
+            return output_response
+
+        if media_type == MediaType.Arrow.value:
+            return Response(content=create_arrow_payload(output_response, columns_key), media_type=media_type)
+
+        # ========================================================================
+        # msgpack, the rows of every store become its columns
+        # ========================================================================
+        if columns_key == 'Stores':
+            output_payload = dict(jsonable_encoder({key: value for key, value in output_response.items()
+                                                    if key != 'Stores'}),
+                                  Stores=[{'StoreId': store['StoreId'],
+                                           'Rows': encode_store_status_columns(store['Rows'])}
+                                          for store in output_response.get('Stores', [])])
+        else:
+            output_payload = jsonable_encoder({key: value for key, value in output_response.items()
+                                               if key != columns_key})
+            if columns_key in output_response:
+                output_payload[columns_key] = encode_store_status_columns(output_response[columns_key])
+        output_payload['Columns_Key'] = columns_key
+
+        return Response(content=msgpack.packb(output_payload), media_type=media_type)
+
+    except Exception as error:
+        logger.error(f'Error in encoding the response as {str(accept)}, Exception - {str(error)}', exc_info=True)
+        raise error
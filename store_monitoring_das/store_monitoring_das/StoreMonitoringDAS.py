@@ -4,21 +4,30 @@ Created on: 28th Oct 2023
 """
 
 from datetime import datetime
-from typing import Union
+from typing import Optional, Union
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 
 import store_monitoring_das.configuration as config
 from store_monitoring_das import __appname__, __version__, __description__
-from store_monitoring_das.entity.Models import HeartbeatResult
+from store_monitoring_das.CommonEnums import ResponseCode, HttpResponseCode
+from store_monitoring_das.entity.Models import HeartbeatResult, StoreGroupRequest, StoreStatusBatchRequest
 from store_monitoring_das.ModuleLogger import setup_logger
+from store_monitoring_das.ResponseEncoding import create_negotiated_response
 from store_monitoring_das.operations.Request import create_entry_in_request, read_row_from_the_request, \
     update_row_in_adapter_request
+from store_monitoring_das.operations.StoreBundle import read_store_bundle
 from store_monitoring_das.operations.StoreDetails import read_all_rows_from_store_details
+from store_monitoring_das.operations.StoreGroup import create_rows_in_store_group, read_all_rows_from_store_group
 from store_monitoring_das.operations.StoreStatus import read_unique_rows_from_store_status, \
-    read_all_rows_from_store_status
+    read_all_rows_from_store_status, read_store_statistics_from_store_status, \
+    read_watermark_from_store_status, read_rows_from_store_status_for_stores
+from store_monitoring_das.operations.StoreStatusExport import EXPORT_MEDIA_TYPES, is_export_format_supported, \
+    export_rows_from_store_status
 from store_monitoring_das.operations.StoreTimezone import read_row_from_store_timezone
 
 logger = setup_logger()
@@ -35,6 +44,12 @@ class StoreMonitoringDAS:
                 allow_methods=config.ALLOWED_METHODS,
                 allow_headers=config.ALLOW_HEADERS,
             )
+
+            # ===================================================================
+            # Compress the responses of the clients that accept gzip, GZIP_MINIMUM_SIZE_IN_BYTES = 0 turns it off
+            # ===================================================================
+            if config.GZIP_MINIMUM_SIZE_IN_BYTES > 0:
+                self.app.add_middleware(GZipMiddleware, minimum_size=config.GZIP_MINIMUM_SIZE_IN_BYTES)
             self.add_routes()
 
         except Exception as error:
@@ -88,18 +103,90 @@ class StoreMonitoringDAS:
             except Exception as error:
                 logger.error(f'Exception - {str(error)}', exc_info=True)
 
+        @self.app.get('/statistics/stores', tags=['StoreStatus'])
+        async def read_store_statistics():
+            """
+            This API call is used to read the number of polls and business hours windows of every StoreId.
+            """
+            try:
+                logger.info('Reading store statistics from StoreStatus')
+                return read_store_statistics_from_store_status()
+
+            except Exception as error:
+                logger.error(f'Exception - {str(error)}', exc_info=True)
+
+        @self.app.get('/store_status/watermark', tags=['StoreStatus'])
+        async def read_store_status_watermark():
+            """
+            This API call is used to read the watermark (largest SS_Id and SS_TimestampUtc) of the StoreStatus table.
+            """
+            try:
+                logger.info('Reading watermark from StoreStatus')
+                return read_watermark_from_store_status()
+
+            except Exception as error:
+                logger.error(f'Exception - {str(error)}', exc_info=True)
+
+        @self.app.get('/store_status/export', tags=['StoreStatus'])
+        async def export_store_status(export_format: str = 'ndjson',
+                                      first_store_id: int = None,
+                                      last_store_id: int = None):
+            """
+            This API call is used to stream all the rows of the StoreStatus table ordered by (SD_StoreId, SS_TimestampUtc),
+            or only of the store_ids from first_store_id to last_store_id.
+            export_format is 'ndjson' (one row per line) or 'arrow' (Arrow IPC stream, needs pyarrow on the DAS).
+            """
+            try:
+                if not is_export_format_supported(export_format):
+                    logger.error(f'Export format not supported - {str(export_format)}')
+                    return {'ResponseCode': ResponseCode.Record_Read_Fail.value,
+                            'Input': {'Export_Format': export_format},
+                            'HttpResponseCode': HttpResponseCode.Success.value}
+
+                logger.info(f'Exporting rows from StoreStatus, export_format - {str(export_format)}, '
+                            f'first_store_id - {str(first_store_id)}, last_store_id - {str(last_store_id)}')
+                return StreamingResponse(export_rows_from_store_status(export_format, first_store_id, last_store_id),
+                                         media_type=EXPORT_MEDIA_TYPES[export_format])
+
+            except Exception as error:
+                logger.error(f'Exception - {str(error)}', exc_info=True)
+
+        @self.app.post('/store_status/batch', tags=['StoreStatus'])
+        async def read_store_status_batch(store_status_batch_request: StoreStatusBatchRequest,
+                                          order_by: str = None,
+                                          accept: Optional[str] = Header(None)):
+            """
+            This API call is used to read the rows of many stores from the StoreStatus table with one query.
+            Give either store_ids or first_store_id and last_store_id (a range), the rows are grouped by store_id.
+            order_by is optional, accepted values are 'asc' and 'desc' on the SS_TimestampUtc column.
+            With Accept: application/msgpack or application/vnd.apache.arrow.stream the rows are sent as columns.
+            """
+            try:
+                logger.info(f'Reading rows from StoreStatus for a batch of stores, order_by - {str(order_by)}')
+                return create_negotiated_response(
+                    read_rows_from_store_status_for_stores(store_status_batch_request.store_ids,
+                                                           store_status_batch_request.first_store_id,
+                                                           store_status_batch_request.last_store_id,
+                                                           order_by),
+                    'Stores', accept)
+
+            except Exception as error:
+                logger.error(f'Exception - {str(error)}', exc_info=True)
+
         @self.app.post('/store_status/{store_id}', tags=['StoreStatus'])
         async def read_store_status(store_id: str,
-                                    order_by: str = None):
+                                    order_by: str = None,
+                                    accept: Optional[str] = Header(None)):
             """
             This API call is used read all the rows from the StoreStatus table given a store_id.
             order_by is optional. Accepted values are given below. The rows are order by on SS_TimestampUtc column.
             1. If you want the rows in ascending specify 'asc'.
             2. If you want the rows in descending specify 'desc'.
+            With Accept: application/msgpack or application/vnd.apache.arrow.stream the rows are sent as columns.
             """
             try:
                 logger.info(f'Reading rows from StoreStatus for store_id - {str(store_id)}, order_by - {str(order_by)}')
-                return read_all_rows_from_store_status(store_id, order_by)
+                return create_negotiated_response(read_all_rows_from_store_status(store_id, order_by), 'Rows', accept)
 
             except Exception as error:
                 logger.error(f'Exception - {str(error)}' +
@@ -118,6 +205,55 @@ class StoreMonitoringDAS:
                 logger.error(f'Exception - {str(error)}' +
                              f'Inputs - store_id - {str(store_id)}', exc_info=True)
 
+        @self.app.get('/store/{store_id}/bundle', tags=['StoreBundle'])
+        async def read_store_bundle_of_store(store_id: str,
+                                             store_status_order_by: str = None,
+                                             store_details_order_by: str = None,
+                                             accept: Optional[str] = Header(None)):
+            """
+            This API call is used to read the timezone, the StoreStatus rows and the StoreDetails rows of a store_id
+            in one call. A store without a StoreTimezone row gets the default timezone.
+            store_status_order_by and store_details_order_by are optional, accepted values are 'asc' and 'desc'.
+            With Accept: application/msgpack or application/vnd.apache.arrow.stream the StoreStatus rows are sent
+            as columns.
+            """
+            try:
+                logger.info(f'Reading store bundle store_id - {str(store_id)}')
+                return create_negotiated_response(
+                    read_store_bundle(store_id, store_status_order_by, store_details_order_by), 'Store_Status', accept)
+
+            except Exception as error:
+                logger.error(f'Exception - {str(error)}' +
+                             f'Inputs - store_id - {str(store_id)}', exc_info=True)
+
+        @self.app.post('/store_group/{store_group_name}/create', tags=['StoreGroup'])
+        async def create_store_group(store_group_name: str,
+                                     store_group_request: StoreGroupRequest):
+            """
+            This API call is used to save the StoreId's of a named store group, an existing group is replaced.
+            """
+            try:
+                logger.info(f'Saving store group - {str(store_group_name)}, '
+                            f'StoreIds - {str(len(store_group_request.store_ids))}')
+                return create_rows_in_store_group(store_group_name, store_group_request.store_ids)
+
+            except Exception as error:
+                logger.error(f'Exception - {str(error)}' +
+                             f'Inputs - store_group_name - {str(store_group_name)}', exc_info=True)
+
+        @self.app.get('/store_group/{store_group_name}', tags=['StoreGroup'])
+        async def read_store_group(store_group_name: str):
+            """
+            This API call is used to read the StoreId's of a named store group.
+            """
+            try:
+                logger.info(f'Reading store group - {str(store_group_name)}')
+                return read_all_rows_from_store_group(store_group_name)
+
+            except Exception as error:
+                logger.error(f'Exception - {str(error)}' +
+                             f'Inputs - store_group_name - {str(store_group_name)}', exc_info=True)
+
         @self.app.post('/request/create', tags=['Request'])
         async def create_request():
             """
@@ -72,4 +72,8 @@ if 'ENVIRONMENT' in config_sections:
     MAXIMUM_WAITING_TIME_FOR_RETRY_IN_MILLISECONDS = int(lobj_config['ENVIRONMENT'][
                                                              'MAXIMUM_WAITING_TIME_FOR_RETRY_IN_MILLISECONDS'])
 
+    DEFAULT_STORE_TIMEZONE = str(lobj_config['ENVIRONMENT']['DEFAULT_STORE_TIMEZONE'])
+    STORE_STATUS_EXPORT_CHUNK_ROWS = int(lobj_config['ENVIRONMENT']['STORE_STATUS_EXPORT_CHUNK_ROWS'])
+    GZIP_MINIMUM_SIZE_IN_BYTES = int(lobj_config['ENVIRONMENT']['GZIP_MINIMUM_SIZE_IN_BYTES'])
+
     LOGGING_LEVEL = str(lobj_config['ENVIRONMENT']['LOGGING_LEVEL'])
@@ -3,7 +3,7 @@ Author: Lav Sharma
 Created on: 29th Oct 2023
 """
 
-from sqlalchemy import Column, BIGINT, SMALLINT, TIME, VARCHAR, DATETIME, TEXT
+from sqlalchemy import Column, Index, BIGINT, SMALLINT, TIME, VARCHAR, DATETIME, TEXT
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -16,6 +16,9 @@ class StoreStatus(Base):
     SS_StoreStatus = Column(VARCHAR(10), nullable=False)
     SS_TimestampUtc = Column(DATETIME, nullable=False)
 
+    __table_args__ = (Index('IX_StoreStatus_Export', 'SD_StoreId', 'SS_TimestampUtc', 'SS_Id'),
+                      Index('IX_StoreStatus_TimestampUtc', 'SS_TimestampUtc'))
+
 
 class StoreTimezone(Base):
     __tablename__ = 'StoreTimezone'
@@ -33,6 +36,13 @@ class StoreDetails(Base):
     SD_EndTimeLocal = Column(TIME, nullable=False)
 
 
+class StoreGroup(Base):
+    __tablename__ = 'StoreGroup'
+    SG_Id = Column(BIGINT, primary_key=True)
+    SG_Name = Column(VARCHAR(45), nullable=False, index=True)
+    SD_StoreId = Column(BIGINT, nullable=False)
+
+
 class Request(Base):
     __tablename__ = 'Request'
     R_Id = Column(BIGINT, primary_key=True)
@@ -40,6 +50,10 @@ class Request(Base):
     R_RequestCompletedTimestamp = Column(DATETIME, nullable=True)
     RS_Id = Column(SMALLINT, nullable=False)
     R_OutputFilePath = Column(TEXT, nullable=True)
+    R_Lane = Column(VARCHAR(10), nullable=True)
+    R_QueueWaitInMilliseconds = Column(BIGINT, nullable=True)
+    R_CoalescedWithRequestId = Column(BIGINT, nullable=True)
+    R_ShardProgress = Column(TEXT, nullable=True)
 
 
 class RequestStatus(Base):
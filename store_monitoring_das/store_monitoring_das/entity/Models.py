@@ -1,5 +1,17 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
 class HeartbeatResult(BaseModel):
     is_alive: bool
+
+
+class StoreGroupRequest(BaseModel):
+    store_ids: List[int]
+
+
+class StoreStatusBatchRequest(BaseModel):
+    store_ids: Optional[List[int]] = None
+    first_store_id: Optional[int] = None
+    last_store_id: Optional[int] = None
@@ -0,0 +1,105 @@
+from retrying import retry
+from sqlalchemy.exc import ProgrammingError, DatabaseError
+
+import store_monitoring_das.configuration as config
+from store_monitoring_das.CommonEnums import ResponseCode, HttpResponseCode, OrderBy
+from store_monitoring_das.database.Session import get_db
+from store_monitoring_das.entity.DatabaseModels import StoreTimezone, StoreDetails, StoreStatus
+from store_monitoring_das.exception import SQLException
+from store_monitoring_das.ModuleLogger import setup_logger
+
+logger = setup_logger()
+
+
+def get_row_order(column, order_by: str):
+    if order_by == OrderBy.Ascending.value:
+        return column.asc()
+
+    elif order_by == OrderBy.Descending.value:
+        return column.desc()
+
+    return None
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DATABASE_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_IN_MILLISECONDS,
+       retry_on_exception=SQLException.retry_if_mysql_error)
+def read_store_bundle(store_id: str,
+                      store_status_order_by: str = None,
+                      store_details_order_by: str = None) -> dict:
+    """
+        Description: This function is used to read everything a report needs for a store_id in one session,
+        the timezone (DEFAULT_STORE_TIMEZONE if the store has none), the StoreStatus rows and, for a store with polls,
+        the StoreDetails rows. store_status_order_by sorts the StoreStatus rows on SS_TimestampUtc and
+        store_details_order_by the StoreDetails rows on SD_Day.
+    """
+    try:
+        output_response = dict()
+
+        for order_by in (store_status_order_by, store_details_order_by):
+            if order_by is not None and order_by not in (OrderBy.Ascending.value, OrderBy.Descending.value):
+                # ========================================================================
+                # Invalid order_by specified
+                # ========================================================================
+                output_response['ResponseCode'] = ResponseCode.Invalid_Order_By_Choice.value
+                output_response['StoreId'] = store_id
+                output_response['HttpResponseCode'] = HttpResponseCode.Success.value
+                return output_response
+
+        with get_db() as session_object:
+            # ========================================================================
+            # Timezone of the store, a missing row is not an error
+            # ========================================================================
+            store_timezone = session_object.query(StoreTimezone.ST_Timezone).filter(
+                StoreTimezone.SD_StoreId == store_id).first()
+
+            store_status_query = session_object.query(StoreStatus).filter(StoreStatus.SD_StoreId == store_id)
+            if get_row_order(StoreStatus.SS_TimestampUtc, store_status_order_by) is not None:
+                store_status_query = store_status_query.order_by(
+                    get_row_order(StoreStatus.SS_TimestampUtc, store_status_order_by))
+            store_status_rows = [vars(row) for row in store_status_query.all()]
+
+            # ========================================================================
+            # The business hours are only needed for a store with polls
+            # ========================================================================
+            store_details_rows = []
+            if len(store_status_rows) > 0:
+                store_details_query = session_object.query(StoreDetails).filter(StoreDetails.SD_StoreId == store_id)
+                if get_row_order(StoreDetails.SD_Day, store_details_order_by) is not None:
+                    store_details_query = store_details_query.order_by(
+                        get_row_order(StoreDetails.SD_Day, store_details_order_by))
+                store_details_rows = [vars(row) for row in store_details_query.all()]
+
+        output_response['Store_Timezone'] = store_timezone[0] if store_timezone is not None \
+            else config.DEFAULT_STORE_TIMEZONE
+        output_response['Is_Default_Timezone'] = store_timezone is None
+        output_response['Store_Status'] = store_status_rows
+        output_response['Store_Details'] = store_details_rows
+
+        if len(store_status_rows) > 0 or store_timezone is not None:
+            output_response['ResponseCode'] = ResponseCode.Record_Read_Success.value
+
+        else:
+            # ========================================================================
+            # No polls and no timezone, the store is unknown
+            # ========================================================================
+            output_response['ResponseCode'] = ResponseCode.Record_Not_Found.value
+
+        output_response['StoreId'] = store_id
+        output_response['HttpResponseCode'] = HttpResponseCode.Success.value
+        return output_response
+
+    except ProgrammingError as mysql_programming_error:
+        logger.error('Wrong/Invalid/Unknown database name provided' +
+                     f'\nError-{str(mysql_programming_error)}', exc_info=True)
+        raise mysql_programming_error
+
+    except DatabaseError as mysql_database_error:
+        logger.error('Error connecting to the MYSQL Server.Invalid database IP or Port provided' +
+                     f'\nError-{str(mysql_database_error)}', exc_info=True)
+        raise mysql_database_error
+
+    except Exception as error:
+        logger.error(f'Error in retrieving the bundle of StoreId - {str(store_id)}'
+                     + f'\nException - {str(error)}', exc_info=True)
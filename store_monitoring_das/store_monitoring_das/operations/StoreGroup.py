@@ -0,0 +1,116 @@
+from retrying import retry
+from sqlalchemy.exc import ProgrammingError, DatabaseError, OperationalError
+
+import store_monitoring_das.configuration as config
+from store_monitoring_das.CommonEnums import ResponseCode, HttpResponseCode
+from store_monitoring_das.database.Session import get_db
+from store_monitoring_das.entity.DatabaseModels import StoreGroup
+from store_monitoring_das.exception import SQLException
+from store_monitoring_das.ModuleLogger import setup_logger
+
+logger = setup_logger()
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DATABASE_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_IN_MILLISECONDS,
+       retry_on_exception=SQLException.retry_if_mysql_error)
+def create_rows_in_store_group(store_group_name: str,
+                               store_ids: list) -> dict:
+    """
+        Description: This function is used to save the StoreId's of a store group in the StoreGroup table,
+        one row per StoreId. The rows of an existing group with the same name are replaced.
+    """
+    try:
+        create_response = dict()
+
+        with get_db() as session_object:
+            try:
+                # ========================================================================
+                # Replace the StoreId's of the group in one transaction
+                # ========================================================================
+                session_object.query(StoreGroup).filter(StoreGroup.SG_Name == store_group_name).delete()
+                session_object.add_all([StoreGroup(SG_Name=store_group_name, SD_StoreId=store_id)
+                                        for store_id in store_ids])
+                session_object.commit()
+
+                logger.info(f'Saved {str(len(store_ids))} StoreIds in StoreGroup - {str(store_group_name)}')
+                create_response['Entry_Created'] = True
+                create_response['ResponseCode'] = ResponseCode.Record_Create_Success.value
+
+            except OperationalError as operational_error:
+                logger.error('Error connecting to the MYSQL Server.Invalid database IP or Port provided' +
+                             f'\nError-{str(operational_error)}', exc_info=True)
+                raise operational_error
+
+            except ProgrammingError as programming_error:
+                logger.error('Wrong/Invalid/Unknown database name provided' +
+                             f'\nError-{str(programming_error)}', exc_info=True)
+                raise programming_error
+
+            except Exception as error:
+                # ========================================================================
+                # Handle the exception and rollback the session_object
+                # ========================================================================
+                session_object.rollback()
+                logger.error(f'Error in creating entries in StoreGroup - {str(store_group_name)}' +
+                             f'\nError - {str(error)}', exc_info=True)
+
+                create_response['Entry_Created'] = False
+                create_response['ResponseCode'] = ResponseCode.Record_Create_Fail.value
+
+        create_response['Input'] = dict()
+        create_response['Input']['Store_Group_Name'] = store_group_name
+        create_response['HttpResponseCode'] = HttpResponseCode.Success.value
+        return create_response
+
+    except Exception as error:
+        logger.error(f'Error in creating entries in StoreGroup, Exception - {str(error)}', exc_info=True)
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DATABASE_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_IN_MILLISECONDS,
+       retry_on_exception=SQLException.retry_if_mysql_error)
+def read_all_rows_from_store_group(store_group_name: str) -> dict:
+    """
+        Description: This function is used to read the StoreId's of a store group from the StoreGroup table,
+        in the order they were saved.
+    """
+    try:
+        output_response = dict()
+
+        with get_db() as session_object:
+            rows = session_object.query(StoreGroup.SD_StoreId).filter(
+                StoreGroup.SG_Name == store_group_name).order_by(StoreGroup.SG_Id).all()
+
+        store_ids = [row[0] for row in rows]
+
+        if len(store_ids) > 0:
+            output_response['ResponseCode'] = ResponseCode.Record_Read_Success.value
+
+        else:
+            # ========================================================================
+            # No rows, the group does not exist
+            # ========================================================================
+            output_response['ResponseCode'] = ResponseCode.Record_Not_Found.value
+
+        output_response['StoreId'] = store_ids
+        output_response['Input'] = dict()
+        output_response['Input']['Store_Group_Name'] = store_group_name
+        output_response['HttpResponseCode'] = HttpResponseCode.Success.value
+        return output_response
+
+    except ProgrammingError as mysql_programming_error:
+        logger.error('Wrong/Invalid/Unknown database name provided' +
+                     f'\nError-{str(mysql_programming_error)}', exc_info=True)
+        raise mysql_programming_error
+
+    except DatabaseError as mysql_database_error:
+        logger.error('Error connecting to the MYSQL Server.Invalid database IP or Port provided' +
+                     f'\nError-{str(mysql_database_error)}', exc_info=True)
+        raise mysql_database_error
+
+    except Exception as error:
+        logger.error(f'Error in retrieving rows from StoreGroup, for Store_Group_Name - {str(store_group_name)}'
+                     + f'\nException - {str(error)}', exc_info=True)
@@ -149,3 +149,210 @@ def read_all_rows_from_store_status(store_id: str,
     except Exception as error:
         logger.error(f'Error in retrieving all rows from StoreStatus, for StoreId - {str(store_id)}'
                      + f'\nException - {str(error)}', exc_info=True)
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DATABASE_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_IN_MILLISECONDS,
+       retry_on_exception=SQLException.retry_if_mysql_error)
+def read_store_statistics_from_store_status() -> dict:
+    """
+        Description: This function is used to read the number of StoreStatus rows (polls) and
+        StoreDetails rows (business hours windows) of every StoreId in the StoreStatus table.
+        A StoreId without StoreDetails rows has a Window_Count of 0, i.e. it is open 24*7.
+    """
+    try:
+        output_response = dict()
+
+        with get_db() as session_object:
+            # ========================================================================
+            # Count the rows of every StoreId in both the tables
+            # ========================================================================
+            sql_query = text("SELECT SS.SD_StoreId, SS.Poll_Count, COALESCE(SD.Window_Count, 0) "
+                             "FROM (SELECT SD_StoreId, COUNT(*) AS Poll_Count FROM StoreStatus "
+                             "GROUP BY SD_StoreId) SS "
+                             "LEFT JOIN (SELECT SD_StoreId, COUNT(*) AS Window_Count FROM StoreDetails "
+                             "GROUP BY SD_StoreId) SD ON SS.SD_StoreId = SD.SD_StoreId;")
+
+            # ========================================================================
+            # Execute the SQL query and fetch the results
+            # ========================================================================
+            results = session_object.execute(sql_query)
+
+        store_statistics_rows = [{'SD_StoreId': row[0], 'Poll_Count': int(row[1]), 'Window_Count': int(row[2])}
+                                 for row in results]
+
+        if len(store_statistics_rows) > 0:
+            # ========================================================================
+            # The list contains more than one rows, hence the read was successful
+            # ========================================================================
+            output_response['ResponseCode'] = ResponseCode.Record_Read_Success.value
+
+        else:
+            # ========================================================================
+            # No output in the list, hence no records found
+            # ========================================================================
+            output_response['ResponseCode'] = ResponseCode.Record_Not_Found.value
+
+        output_response['Rows'] = store_statistics_rows
+        output_response['HttpResponseCode'] = HttpResponseCode.Success.value
+
+        return output_response
+
+    except ProgrammingError as mysql_programming_error:
+        logger.error('Wrong/Invalid/Unknown database name provided' +
+                     f'\nError-{str(mysql_programming_error)}', exc_info=True)
+        raise mysql_programming_error
+
+    except DatabaseError as mysql_database_error:
+        logger.error('Error connecting to the MYSQL Server.Invalid database IP or Port provided' +
+                     f'\nError-{str(mysql_database_error)}', exc_info=True)
+        raise mysql_database_error
+
+    except Exception as error:
+        logger.error('Error in retrieving store statistics from StoreStatus -'
+                     + f'\nException - {str(error)}', exc_info=True)
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DATABASE_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_IN_MILLISECONDS,
+       retry_on_exception=SQLException.retry_if_mysql_error)
+def read_rows_from_store_status_for_stores(store_ids: list = None,
+                                           first_store_id: int = None,
+                                           last_store_id: int = None,
+                                           order_by: str = None) -> dict:
+    """
+        Description: This function is used to read the rows of many stores from the StoreStatus table with one
+        query, either the given store_ids (IN) or every store_id from first_store_id to last_store_id (BETWEEN).
+        The rows are grouped by store_id, in the order of the store_ids (or of the store_id for a range).
+        order_by sorts the rows of every store on the SS_TimestampUtc column.
+    """
+    try:
+        output_response = dict()
+        stores = []
+
+        if store_ids is None and (first_store_id is None or last_store_id is None):
+            # ========================================================================
+            # Neither the store_ids nor a complete range specified
+            # ========================================================================
+            output_response['ResponseCode'] = ResponseCode.Record_Read_Fail.value
+            output_response['Stores'] = stores
+            output_response['HttpResponseCode'] = HttpResponseCode.Success.value
+            return output_response
+
+        if order_by is not None and order_by not in (OrderBy.Ascending.value, OrderBy.Descending.value):
+            # ========================================================================
+            # Invalid order_by specified
+            # ========================================================================
+            output_response['ResponseCode'] = ResponseCode.Invalid_Order_By_Choice.value
+            output_response['Stores'] = stores
+            output_response['HttpResponseCode'] = HttpResponseCode.Success.value
+            return output_response
+
+        if order_by == OrderBy.Ascending.value:
+            row_order = [StoreStatus.SD_StoreId, StoreStatus.SS_TimestampUtc.asc()]
+        elif order_by == OrderBy.Descending.value:
+            row_order = [StoreStatus.SD_StoreId, StoreStatus.SS_TimestampUtc.desc()]
+        else:
+            row_order = [StoreStatus.SD_StoreId, StoreStatus.SS_Id]
+
+        with get_db() as session_object:
+            # ========================================================================
+            # One query for all the stores, an IN list or a range of the store_id
+            # ========================================================================
+            if store_ids is not None:
+                store_filter = StoreStatus.SD_StoreId.in_(store_ids)
+            else:
+                store_filter = StoreStatus.SD_StoreId.between(first_store_id, last_store_id)
+
+            row_entry = session_object.query(StoreStatus).filter(store_filter).order_by(*row_order).all()
+
+        store_status_rows = dict()
+        for row in row_entry:
+            store_status_rows.setdefault(row.SD_StoreId, []).append(vars(row))
+
+        # ========================================================================
+        # A requested store without polls is returned with no rows
+        # ========================================================================
+        for store_id in (store_ids if store_ids is not None else store_status_rows):
+            stores.append({'StoreId': store_id, 'Rows': store_status_rows.get(int(store_id), [])})
+
+        if len(row_entry) > 0:
+            output_response['ResponseCode'] = ResponseCode.Record_Read_Success.value
+
+        else:
+            output_response['ResponseCode'] = ResponseCode.Record_Not_Found.value
+
+        output_response['Stores'] = stores
+        output_response['HttpResponseCode'] = HttpResponseCode.Success.value
+        return output_response
+
+    except ProgrammingError as mysql_programming_error:
+        logger.error('Wrong/Invalid/Unknown database name provided' +
+                     f'\nError-{str(mysql_programming_error)}', exc_info=True)
+        raise mysql_programming_error
+
+    except DatabaseError as mysql_database_error:
+        logger.error('Error connecting to the MYSQL Server.Invalid database IP or Port provided' +
+                     f'\nError-{str(mysql_database_error)}', exc_info=True)
+        raise mysql_database_error
+
+    except Exception as error:
+        logger.error('Error in retrieving the rows of many stores from StoreStatus'
+                     + f'\nException - {str(error)}', exc_info=True)
+
+
+@retry(stop_max_attempt_number=config.RETRY_ATTEMPT_FOR_DATABASE_CONNECTION,
+       wait_exponential_multiplier=config.WAITING_TIME_BETWEEN_RETRY_IN_MILLISECONDS,
+       wait_exponential_max=config.MAXIMUM_WAITING_TIME_FOR_RETRY_IN_MILLISECONDS,
+       retry_on_exception=SQLException.retry_if_mysql_error)
+def read_watermark_from_store_status() -> dict:
+    """
+        Description: This function is used to read the watermark of the StoreStatus table,
+        the largest SS_Id and SS_TimestampUtc. Every insert moves SS_Id, two reads with the same watermark see the
+        same polls.
+    """
+    try:
+        output_response = dict()
+
+        with get_db() as session_object:
+            # ========================================================================
+            # Each maximum is read from the end of an index, the primary key and IX_StoreStatus_TimestampUtc
+            # ========================================================================
+            sql_query = text("SELECT MAX(SS_Id), MAX(SS_TimestampUtc) FROM StoreStatus;")
+
+            # ========================================================================
+            # Execute the SQL query and fetch the results
+            # ========================================================================
+            watermark_row = session_object.execute(sql_query).fetchone()
+
+        if watermark_row is not None and watermark_row[0] is not None:
+            output_response['ResponseCode'] = ResponseCode.Record_Read_Success.value
+            output_response['Row'] = {'SS_Id': int(watermark_row[0]),
+                                      'SS_TimestampUtc': watermark_row[1]}
+
+        else:
+            # ========================================================================
+            # The StoreStatus table is empty
+            # ========================================================================
+            output_response['ResponseCode'] = ResponseCode.Record_Not_Found.value
+            output_response['Row'] = dict()
+
+        output_response['HttpResponseCode'] = HttpResponseCode.Success.value
+
+        return output_response
+
+    except ProgrammingError as mysql_programming_error:
+        logger.error('Wrong/Invalid/Unknown database name provided' +
+                     f'\nError-{str(mysql_programming_error)}', exc_info=True)
+        raise mysql_programming_error
+
+    except DatabaseError as mysql_database_error:
+        logger.error('Error connecting to the MYSQL Server.Invalid database IP or Port provided' +
+                     f'\nError-{str(mysql_database_error)}', exc_info=True)
+        raise mysql_database_error
+
+    except Exception as error:
+        logger.error('Error in retrieving the watermark of StoreStatus -'
+                     + f'\nException - {str(error)}', exc_info=True)
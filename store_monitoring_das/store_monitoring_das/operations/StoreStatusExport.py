@@ -0,0 +1,129 @@
+import io
+import json
+
+from sqlalchemy import select, and_, or_
+
+import store_monitoring_das.configuration as config
+from store_monitoring_das.CommonEnums import ExportFormat
+from store_monitoring_das.database.Session import get_db
+from store_monitoring_das.entity.DatabaseModels import StoreStatus
+from store_monitoring_das.ModuleLogger import setup_logger
+
+try:
+    import pyarrow
+
+except ImportError:
+    pyarrow = None
+
+logger = setup_logger()
+
+EXPORT_COLUMNS = ['SS_Id', 'SD_StoreId', 'SS_StoreStatus', 'SS_TimestampUtc']
+
+EXPORT_MEDIA_TYPES = {ExportFormat.NDJSON.value: 'application/x-ndjson',
+                      ExportFormat.Arrow.value: 'application/vnd.apache.arrow.stream'}
+
+
+def is_export_format_supported(export_format: str) -> bool:
+    # ====================================================================
+    # Arrow IPC needs the pyarrow package
+    # ====================================================================
+    if export_format == ExportFormat.Arrow.value:
+        return pyarrow is not None
+
+    return export_format == ExportFormat.NDJSON.value
+
+
+def read_row_partitions_from_store_status(first_store_id: int = None,
+                                          last_store_id: int = None):
+    """
+        Description: This generator reads the StoreStatus rows ordered by (SD_StoreId, SS_TimestampUtc, SS_Id) with
+        keyset pagination and yields them STORE_STATUS_EXPORT_CHUNK_ROWS rows at a time. Every page is one query
+        in its own session that starts after the last row of the previous page, so only one page is ever held.
+    """
+    try:
+        export_query = select(*[getattr(StoreStatus, column) for column in EXPORT_COLUMNS])
+        if first_store_id is not None:
+            export_query = export_query.where(StoreStatus.SD_StoreId >= first_store_id)
+        if last_store_id is not None:
+            export_query = export_query.where(StoreStatus.SD_StoreId <= last_store_id)
+        export_query = export_query.order_by(StoreStatus.SD_StoreId, StoreStatus.SS_TimestampUtc, StoreStatus.SS_Id)
+
+        last_row = None
+        while True:
+            page_query = export_query
+            if last_row is not None:
+                # ========================================================================
+                # Continue after the last row read, served by IX_StoreStatus_Export
+                # ========================================================================
+                ss_id, store_id, _, timestamp_utc = last_row
+                page_query = page_query.where(or_(
+                    StoreStatus.SD_StoreId > store_id,
+                    and_(StoreStatus.SD_StoreId == store_id, StoreStatus.SS_TimestampUtc > timestamp_utc),
+                    and_(StoreStatus.SD_StoreId == store_id, StoreStatus.SS_TimestampUtc == timestamp_utc,
+                         StoreStatus.SS_Id > ss_id)))
+
+            with get_db() as session_object:
+                row_partition = session_object.execute(
+                    page_query.limit(config.STORE_STATUS_EXPORT_CHUNK_ROWS)).all()
+
+            if len(row_partition) > 0:
+                yield row_partition
+
+            if len(row_partition) < config.STORE_STATUS_EXPORT_CHUNK_ROWS:
+                break
+            last_row = row_partition[-1]
+
+    except Exception as error:
+        logger.error(f'Error in exporting rows from StoreStatus, Exception - {str(error)}', exc_info=True)
+        raise error
+
+
+def export_rows_from_store_status(export_format: str,
+                                  first_store_id: int = None,
+                                  last_store_id: int = None):
+    """
+        Description: This generator yields the StoreStatus rows (of the store_ids from first_store_id to last_store_id
+        when given) ordered by (SD_StoreId, SS_TimestampUtc), encoded as NDJSON lines or as Arrow IPC record batches.
+        Only one partition of rows is held in memory at a time. An NDJSON export ends with an End_Of_Export line.
+    """
+    try:
+        row_partitions = read_row_partitions_from_store_status(first_store_id, last_store_id)
+
+        if export_format == ExportFormat.Arrow.value:
+            export_schema = pyarrow.schema([('SS_Id', pyarrow.int64()),
+                                            ('SD_StoreId', pyarrow.int64()),
+                                            ('SS_StoreStatus', pyarrow.string()),
+                                            ('SS_TimestampUtc', pyarrow.timestamp('us'))])
+            export_sink = io.BytesIO()
+            with pyarrow.ipc.new_stream(export_sink, export_schema) as export_writer:
+                for row_partition in row_partitions:
+                    export_writer.write_batch(pyarrow.RecordBatch.from_arrays(
+                        [pyarrow.array([row[column_index] for row in row_partition], type=column_type.type)
+                         for column_index, column_type in enumerate(export_schema)], schema=export_schema))
+
+                    # ========================================================================
+                    # Hand over the bytes of every record batch as soon as it is written
+                    # ========================================================================
+                    yield export_sink.getvalue()
+                    export_sink.seek(0)
+                    export_sink.truncate()
+
+            yield export_sink.getvalue()
+
+        else:
+            row_count = 0
+            for row_partition in row_partitions:
+                row_count += len(row_partition)
+                yield ''.join(json.dumps({'SS_Id': row[0],
+                                          'SD_StoreId': row[1],
+                                          'SS_StoreStatus': row[2],
+                                          'SS_TimestampUtc': row[3].isoformat()}) + '\n'
+                              for row in row_partition).encode()
+
+            # ========================================================================
+            # The last line tells the client the export is complete, a broken stream has no End_Of_Export line
+            # ========================================================================
+            yield (json.dumps({'End_Of_Export': True, 'Row_Count': row_count}) + '\n').encode()
+
+    except Exception:
+        raise
@@ -24,45 +24,30 @@ logger = setup_logger()
 def read_row_from_store_timezone(store_id: str):
     """
         Description: This function is used to read a row from the StoreTimezone table,
-        given a store_id. It will first check whether a row for the given store_id
-        exists or not in the database.
-        If Yes --> it will retrieve the row from the database
+        given a store_id, with one query.
+        If the row exists --> it will return the row
         If no --> it will return a ResponseCode of Record_Not_Found
     """
     try:
         read_row_output = dict()
 
         # ========================================================================
-        # Check if the row exists in the StoreTimezone table or not
+        # Retrieve the row, no row means the store has no timezone
         # ========================================================================
-        record = check_if_row_exists_in_store_timezone(store_id)
-
-        if 'RecordExists' in record:
-            if record['RecordExists']:
-                # ========================================================================
-                # If the entry exists in the database, then retrieve the row
-                # ========================================================================
-                with get_db() as session_object:
-                    row_entry = session_object.query(StoreTimezone).filter(StoreTimezone.SD_StoreId == store_id).first()
-
-                read_row_output['Row'] = vars(row_entry)
-                read_row_output['ResponseCode'] = ResponseCode.Record_Read_Success.value
-
-            else:
-                # ========================================================================
-                # Row does not exist in the database
-                # ========================================================================
-                read_row_output['ResponseCode'] = ResponseCode.Record_Not_Found.value
+        with get_db() as session_object:
+            row_entry = session_object.query(StoreTimezone).filter(StoreTimezone.SD_StoreId == store_id).first()
 
-            read_row_output['RecordExists'] = record['RecordExists']
+        if row_entry is not None:
+            read_row_output['Row'] = vars(row_entry)
+            read_row_output['ResponseCode'] = ResponseCode.Record_Read_Success.value
 
         else:
             # ========================================================================
-            # Internal DB Error
+            # Row does not exist in the database
             # ========================================================================
-            logger.error('Error in check_if_row_exists_in_adapter_request',
-                         f'\nInput - {str(store_id)}', exc_info=True)
-            read_row_output['ResponseCode'] = ResponseCode.Database_Error.value
+            read_row_output['ResponseCode'] = ResponseCode.Record_Not_Found.value
+
+        read_row_output['RecordExists'] = row_entry is not None
 
         read_row_output['Input'] = dict()
         read_row_output['Input']['StoreId'] = store_id